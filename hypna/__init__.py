@@ -0,0 +1,47 @@
+"""HYPNAGNOSIS prompt engine, importable without Tk."""
+
+from .engine import (
+    SKIP,
+    BOOTLOADER_TEXT,
+    SYSTEM_FILE_TEXT,
+    STYLE_TOKENS,
+    PAINTING_INFLUENCES,
+    HUMANIZER_QUALITIES,
+    CURVES,
+    Humanizer,
+    Painting,
+    Evolve,
+    Mutate,
+    Form,
+    form_from_dict,
+    form_to_dict,
+    expand_style_tokens,
+    SymbolLexicon,
+    MappedLexicon,
+    convert_lexicon,
+    load_symbol_lexicon,
+    sample_symbols,
+    use_default_tables,
+    curve_value,
+    curve_values,
+    hallucination_schedule,
+    MAX_STEPS,
+    LIVE_MAX_STEPS,
+    iter_series,
+    series_state,
+    derive_seed,
+    state_rng,
+    compute_state,
+    compile_prompt,
+    render_prompt,
+    generate_series,
+)
+from .state import State
+from .export import write_full_doc, write_prompts
+from .delta import DeltaSeries, read_delta_series, write_delta_series
+from .columnar import ColumnarFile, ColumnarWriter, read_columnar, write_columnar
+from .sweep import form_grid, style_token_combinations, sweep
+from .cache import SeriesCache, form_hash
+from .coalesce import AsyncSingleFlight, SeriesCoalescer, SingleFlight
+from .presets import PresetInfo, PresetLibrary, dumps_preset, loads_preset
+from .incremental import IncrementalSeries
@@ -0,0 +1,260 @@
+"""
+Engine benchmarks: `python -m hypna.bench [name ...]`
+
+Prints best-of-N timings as JSON. Inputs come from fixed seeds, so runs are
+comparable between versions: `--save-baseline FILE` stores a run, and
+`--baseline FILE` exits 1 when any timing is slower than its baseline by more
+than the allowed ratio (`--threshold`, or per-metric overrides in the
+baseline's "thresholds" map, keyed "bench" or "bench.metric").
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from .engine import CURVES, Form, compile_prompt, compute_state, form_from_dict, generate_series, render_prompt
+from .lexicon import SymbolLexicon, convert_lexicon, load_symbol_lexicon, sample_symbols
+from .sweep import form_grid, sweep
+
+# a Form that turns on every optional block
+FULL_FORM: Dict[str, Any] = {
+    "subject": "salt marsh observatory",
+    "style_tokens": "STYLE.HYPNAGOGIC, STYLE.NEWWEIRD, STYLE.PRINT",
+    "notes": "keep margins wide",
+    "vibe_description": "wet graphite dusk",
+    "vibe_image_list": "a.png, b.png",
+    "print_enabled": True,
+    "plates_enabled": True,
+    "plate_map": "K: keyline\nR: red bleed",
+    "mutate": {"enabled": True},
+    "painting": {"influence": "Goya-like chiaroscuro dread (not imitation)"},
+    "humanizer": {"qualities": {"smudge": True, "redraws": True}},
+    "evolve": {"steps": 20},
+}
+
+SEED = 1234
+DEFAULT_THRESHOLD = 1.25
+
+
+def best_per_call(fn: Callable[[], Any], number: int, repeat: int) -> float:
+    """Best-of-`repeat` seconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def make_lexicon(n: int, seed: int = SEED) -> Dict[str, Any]:
+    """n synthetic weighted entries, identical for a given seed."""
+    rng = random.Random(seed)
+    return {f"sym{i:07d}": {"meaning": f"meaning {i}", "weight": rng.randint(1, 9)} for i in range(n)}
+
+
+def bench_compile_prompt(quick: bool = False) -> Dict[str, float]:
+    """Reference compile_prompt vs the precompiled-template render_prompt."""
+    number, repeat = (500, 3) if quick else (2000, 5)
+    st = compute_state(form_from_dict(FULL_FORM), 3, 20, {})
+    assert render_prompt(st) == compile_prompt(st)
+    ref = best_per_call(lambda: compile_prompt(st), number, repeat)
+    tpl = best_per_call(lambda: render_prompt(st), number, repeat)
+    return {"compile_prompt_us": ref * 1e6, "render_prompt_us": tpl * 1e6, "speedup": ref / tpl}
+
+
+def bench_generate_series(quick: bool = False) -> Dict[str, float]:
+    """Whole series at 1/20/1000 steps, injecting symbols from a 1k lexicon."""
+    lex = SymbolLexicon(make_lexicon(1000))
+    out: Dict[str, float] = {}
+    for steps in (1, 20, 1000):
+        form = form_from_dict(dict(FULL_FORM, inject_symbols=True, evolve={"steps": steps}))
+        number = max(1, (200 if quick else 2000) // steps)
+        run = lambda: generate_series(form, lex, max_steps=steps, seed=SEED)
+        out[f"steps_{steps}_ms"] = best_per_call(run, number, 3 if quick else 5) * 1e3
+    return out
+
+
+def bench_sample_symbols(quick: bool = False) -> Dict[str, float]:
+    """k=3 draws, uniform and weighted, from 1k/100k/1M-entry lexicons."""
+    out: Dict[str, float] = {}
+    for n in (1000, 100_000) if quick else (1000, 100_000, 1_000_000):
+        lex = SymbolLexicon(make_lexicon(n))
+        rng = random.Random(SEED)
+        sample_symbols(lex, 3, weighted=True, rng=rng)  # builds the cumulative weights
+        for weighted in (False, True):
+            run = lambda: sample_symbols(lex, 3, weighted=weighted, rng=rng)
+            out[f"{n}_{'weighted' if weighted else 'uniform'}_us"] = best_per_call(run, 2000, 3 if quick else 5) * 1e6
+    return out
+
+
+def bench_load_lexicon(quick: bool = False) -> Dict[str, float]:
+    """load_symbol_lexicon plus a first draw, on a large JSON file and its .hlex conversion."""
+    n = 20_000 if quick else 500_000
+    out: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "lex.json"), os.path.join(tmp, "lex.hlex")
+        with open(src, "w", encoding="utf-8") as f:
+            json.dump(make_lexicon(n), f)
+        convert_lexicon(src, dst)
+        for label, path in (("json", src), ("hlex", dst)):
+            best = float("inf")
+            for _ in range(3):
+                t = time.perf_counter()
+                lex = load_symbol_lexicon(path, strict=True)
+                sample_symbols(lex, 3, rng=random.Random(SEED))
+                best = min(best, time.perf_counter() - t)
+                close = getattr(lex, "close", None)
+                if close is not None:
+                    close()
+            out[f"{label}_{n}_ms"] = best * 1e3
+    return out
+
+
+def bench_sweep(quick: bool = False) -> Dict[str, float]:
+    """End-to-end sweep of a hallucination x curve grid, in-process and on 2 workers."""
+    base = Form(inject_symbols=True)
+    base.evolve.steps = 20
+    axes = {"hallucination": range(0, 101, 20 if quick else 4), "evolve.curve": CURVES}
+    lex = SymbolLexicon(make_lexicon(1000))
+    out: Dict[str, float] = {"forms": float(len(list(form_grid(base, axes))))}
+    for workers in (1, 2):
+        best = float("inf")
+        for _ in range(2 if quick else 3):
+            t = time.perf_counter()
+            for _series in sweep(form_grid(base, axes), lex, workers=workers, chunk_size=16, seed=SEED):
+                pass
+            best = min(best, time.perf_counter() - t)
+        out[f"workers_{workers}_ms"] = best * 1e3
+    return out
+
+
+def bench_state_memory(quick: bool = False) -> Dict[str, float]:
+    """Traced memory of a 10k-state series held as dicts vs slotted State records."""
+    n = 2000 if quick else 10_000
+    form = form_from_dict(dict(FULL_FORM, evolve={"steps": n}))
+    out: Dict[str, float] = {}
+    for label, compact in (("dict", False), ("state", True)):
+        gc.collect()
+        tracemalloc.start()
+        series = generate_series(form, {}, max_steps=n, seed=SEED, compact=compact)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        prompts = sum(sys.getsizeof(st["prompt"]) for st in series)
+        out[f"{label}_mib_per_10k"] = size * 10_000 / n / 2**20
+        out[f"{label}_no_prompt_mib_per_10k"] = (size - prompts) * 10_000 / n / 2**20
+        del series
+    return out
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules whose cold import time is tracked; the GUI module imports tkinter
+# but opens no window, so this runs headless
+IMPORT_MODULES = ("hypna", "hypna_prompt_gui_v3")
+
+
+def import_time(module: str) -> float:
+    """Seconds to import `module` in a fresh interpreter (startup excluded)."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def bench_import(quick: bool = False) -> Dict[str, float]:
+    """Best-of-N cold import time per module."""
+    repeat = 3 if quick else 5
+    return {f"{m}_ms": min(import_time(m) for _ in range(repeat)) * 1e3 for m in IMPORT_MODULES}
+
+
+BENCHMARKS: Dict[str, Callable[..., Dict[str, float]]] = {
+    "compile_prompt": bench_compile_prompt,
+    "generate_series": bench_generate_series,
+    "sample_symbols": bench_sample_symbols,
+    "load_lexicon": bench_load_lexicon,
+    "sweep": bench_sweep,
+    "state_memory": bench_state_memory,
+    "import": bench_import,
+}
+
+
+def is_timing(metric: str) -> bool:
+    # only durations are compared; ratios and counts are informational
+    return metric.endswith(("_us", "_ms", "_s"))
+
+
+def compare(
+    results: Mapping[str, Mapping[str, float]],
+    baseline: Mapping[str, Mapping[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> List[str]:
+    """One line per timing slower than its baseline times the allowed ratio."""
+    thresholds = thresholds or {}
+    regressions: List[str] = []
+    for name, metrics in results.items():
+        base = baseline.get(name, {})
+        for metric, value in metrics.items():
+            old = base.get(metric)
+            if not is_timing(metric) or not old or old <= 0:
+                continue
+            limit = thresholds.get(f"{name}.{metric}", thresholds.get(name, threshold))
+            if value > old * limit:
+                regressions.append(f"{name}.{metric}: {value:.3f} vs {old:.3f} ({value / old:.2f}x > {limit:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m hypna.bench", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    ap.add_argument("--quick", action="store_true", help="smaller inputs and fewer repeats (CI smoke run)")
+    ap.add_argument("--save-baseline", metavar="FILE", help="write this run as a baseline")
+    ap.add_argument("--baseline", metavar="FILE", help="compare against a saved baseline; exit 1 on slowdowns")
+    ap.add_argument("--threshold", type=float,
+                    help=f"allowed slowdown ratio (default: the baseline's, else {DEFAULT_THRESHOLD})")
+    args = ap.parse_args(argv)
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        ap.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("quick", False) != args.quick:
+            ap.error(f"{args.baseline} was recorded {'with' if baseline.get('quick') else 'without'} --quick")
+
+    results = {name: BENCHMARKS[name](quick=args.quick) for name in (args.names or BENCHMARKS)}
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+    if args.save_baseline:
+        doc = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "threshold": args.threshold or DEFAULT_THRESHOLD,
+            "thresholds": {},
+            "results": results,
+        }
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+            f.write("\n")
+    if args.baseline:
+        threshold = args.threshold or baseline.get("threshold", DEFAULT_THRESHOLD)
+        regressions = compare(results, baseline.get("results", {}), threshold, baseline.get("thresholds"))
+        for r in regressions:
+            print(f"hypna.bench: slower than baseline: {r}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import json
+
+from hypna import bench
+
+
+def test_compare_flags_only_slow_timings():
+    baseline = {"series": {"steps_20_ms": 1.0, "speedup": 2.0, "forms": 30.0}, "load": {"json_ms": 10.0}}
+    results = {"series": {"steps_20_ms": 1.2, "speedup": 0.5, "forms": 90.0}, "load": {"json_ms": 20.0},
+               "new": {"x_ms": 5.0}}
+    assert bench.compare(results, baseline) == ["load.json_ms: 20.000 vs 10.000 (2.00x > 1.25x)"]
+    assert len(bench.compare(results, baseline, threshold=1.1)) == 2
+    assert bench.compare(results, baseline, thresholds={"load": 3.0}) == []
+    assert bench.compare(results, baseline, thresholds={"load.json_ms": 1.5, "load": 3.0}) != []
+
+
+def test_saved_baseline_gates_the_next_run(tmp_path, monkeypatch, capsys):
+    timings = {"t_ms": 1.0}
+    monkeypatch.setattr(bench, "BENCHMARKS", {"fake": lambda quick=False: dict(timings)})
+    path = str(tmp_path / "baseline.json")
+    assert bench.main(["--save-baseline", path]) == 0
+    doc = json.loads(open(path).read())
+    assert doc["results"] == {"fake": {"t_ms": 1.0}} and doc["threshold"] == 1.25
+
+    timings["t_ms"] = 1.2
+    assert bench.main(["--baseline", path]) == 0
+    timings["t_ms"] = 2.0
+    assert bench.main(["--baseline", path]) == 1
+    assert "fake.t_ms" in capsys.readouterr().err
+    assert bench.main(["--baseline", path, "--threshold", "3"]) == 0
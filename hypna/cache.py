@@ -0,0 +1,232 @@
+"""
+Persistent cache of compiled series, keyed by a canonical Form hash.
+
+The key covers every Form field (nested models included, with SKIP, None and
+"" kept distinct), the step cap and, when the Form injects symbols, the
+lexicon fingerprint and seed. Entries live in a local SQLite file shared
+between processes, with a small in-memory LRU in front for repeat hits and
+least-recently-used eviction once the file exceeds its size budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .engine import MAX_STEPS, SKIP, Form, generate_series
+from .lexicon import SymbolLexicon
+
+# bump whenever engine output changes for an unchanged Form
+CACHE_VERSION = 4
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_path() -> str:
+    base = os.environ.get("HYPNA_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "hypna"
+    )
+    return os.path.join(base, "series.sqlite")
+
+
+_SCALARS = (str, int, float, bool, type(None))
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+def canonical_form(v: Any) -> Any:
+    """JSON-safe canonical structure of a Form (or any nested value)."""
+    if v is SKIP:
+        return {"$skip": True}
+    cls = type(v)
+    if cls in _SCALARS:
+        return v
+    names = _FIELD_NAMES.get(cls)
+    if names is None and is_dataclass(v):
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(v))
+    if names is not None:
+        return {n: canonical_form(getattr(v, n)) for n in names}
+    if isinstance(v, dict):
+        return {str(k): canonical_form(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [canonical_form(x) for x in v]
+    return v
+
+
+def lexicon_fingerprint(lex: Mapping[str, Any]) -> str:
+    fp = getattr(lex, "fingerprint", None)
+    if callable(fp):
+        return fp()
+    return SymbolLexicon(lex).fingerprint()
+
+
+def form_hash(
+    form: Form,
+    lex: Optional[Mapping[str, Any]] = None,
+    seed: Optional[int] = None,
+    max_steps: int = MAX_STEPS,
+    lex_fingerprint: Optional[str] = None,
+) -> str:
+    """Stable hex digest identifying the series `form` compiles to.
+
+    Lexicon and seed only count when the Form actually samples symbols.
+    Callers hashing many Forms against one lexicon can pass its
+    `lexicon_fingerprint` precomputed.
+    """
+    payload: Dict[str, Any] = {"v": CACHE_VERSION, "form": canonical_form(form), "max_steps": max_steps}
+    if form.inject_symbols and lex:
+        payload["lexicon"] = lex_fingerprint or lexicon_fingerprint(lex)
+        payload["seed"] = seed
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _encode(series: List[Dict[str, Any]]) -> bytes:
+    return zlib.compress(json.dumps(series, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def _decode(data: bytes) -> List[Dict[str, Any]]:
+    series = json.loads(zlib.decompress(data))
+    for st in series:
+        # restore SKIP's identity so compile_prompt(st) still omits those lines
+        for k, v in st.items():
+            if v == SKIP:
+                st[k] = SKIP
+    return series
+
+
+class SeriesCache:
+    """Size-bounded LRU cache of compiled series.
+
+    Returned series are shared with the in-memory tier: treat them as
+    read-only.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES, memory_items: int = 1024):
+        self.path = path or default_cache_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._mem: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS series ("
+            "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, atime REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS series_atime ON series(atime)")
+        self._bytes = self._total_bytes()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _total_bytes(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM series").fetchone()[0]
+
+    def key(self, form: Form, lex: Optional[Mapping[str, Any]] = None, seed: Optional[int] = None,
+            max_steps: int = MAX_STEPS, lex_fingerprint: Optional[str] = None) -> str:
+        return form_hash(form, lex, seed, max_steps, lex_fingerprint=lex_fingerprint)
+
+    def _remember(self, key: str, series: List[Dict[str, Any]]) -> None:
+        self._mem[key] = series
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_items:
+            self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+                self.memory_hits += 1
+                return hit
+            row = self._db.execute("SELECT data FROM series WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE series SET atime = ? WHERE key = ?", (time.time(), key))
+            series = _decode(row[0])
+            self._remember(key, series)
+            self.disk_hits += 1
+            return series
+
+    def put(self, key: str, series: List[Dict[str, Any]]) -> None:
+        data = _encode(series)
+        with self._lock:
+            self._remember(key, series)
+            if len(data) > self.max_bytes:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO series (key, data, size, atime) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # other processes share the file, so re-read the real total first
+        self._bytes = self._total_bytes()
+        while self._bytes > self.max_bytes:
+            rows = self._db.execute("SELECT key, size FROM series ORDER BY atime LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM series WHERE key = ?", (key,))
+                self._mem.pop(key, None)
+                self._bytes -= size
+                self.evictions += 1
+
+    def get_or_compute(self, form: Form, lex: Optional[Mapping[str, Any]] = None, seed: Optional[int] = None,
+                       max_steps: int = MAX_STEPS, lex_fingerprint: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Cached generate_series. Unseeded Forms that sample symbols are
+        not reproducible, so they are computed and never stored."""
+        seed = seed if seed is not None else form.seed
+        if seed is None and form.inject_symbols and lex:
+            return generate_series(form, lex, max_steps)
+        key = self.key(form, lex, seed, max_steps, lex_fingerprint)
+        series = self.get(key)
+        if series is None:
+            series = generate_series(form, lex or {}, max_steps, seed=seed)
+            self.put(key, series)
+        return series
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+            return dict(
+                hits=self.memory_hits + self.disk_hits,
+                memory_hits=self.memory_hits,
+                disk_hits=self.disk_hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=entries,
+                bytes=self._total_bytes(),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._db.execute("DELETE FROM series")
+            self._bytes = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "SeriesCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,94 @@
+from hypna.cache import SeriesCache, form_hash
+from hypna.engine import SKIP, Evolve, Form, compile_prompt, form_from_dict
+from hypna.lexicon import SymbolLexicon
+from hypna.sweep import sweep
+
+LEX = SymbolLexicon({f"s{i}": f"m{i}" for i in range(100)})
+
+
+def test_form_hash_is_stable_and_tells_sentinels_apart():
+    assert form_hash(Form()) == form_hash(form_from_dict({}))
+    variants = [Form(temporal=v) for v in ("", SKIP, None, "__SKIP_", 0, "0")]
+    assert len({form_hash(f) for f in variants}) == len(variants)
+    nested = Form(evolve=Evolve(curve="pulse"))
+    assert form_hash(nested) != form_hash(Form())
+    assert form_hash(Form(), max_steps=40) != form_hash(Form())
+
+
+def test_lexicon_and_seed_only_count_when_injecting():
+    plain = Form()
+    assert form_hash(plain, LEX, 1) == form_hash(plain, None, 2)
+    inj = Form(inject_symbols=True)
+    assert form_hash(inj, LEX, 1) != form_hash(inj, LEX, 2)
+    assert form_hash(inj, LEX, 1) != form_hash(inj, SymbolLexicon({"x": "y"}), 1)
+
+
+def test_hits_misses_and_persistence(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    f = Form(inject_symbols=True, evolve=Evolve(steps=3), temporal=SKIP)
+    with SeriesCache(path) as cache:
+        first = cache.get_or_compute(f, LEX, seed=5)
+        assert cache.get_or_compute(f, LEX, seed=5) is first
+        assert cache.stats()["misses"] == 1 and cache.stats()["memory_hits"] == 1
+    with SeriesCache(path) as cache:
+        again = cache.get_or_compute(f, LEX, seed=5)
+        assert cache.stats()["disk_hits"] == 1
+        assert [st["prompt"] for st in again] == [st["prompt"] for st in first]
+        assert again[0]["temporal"] is SKIP
+        assert compile_prompt(again[0]) == first[0]["prompt"]
+
+
+def test_lru_eviction_respects_size_budget(tmp_path):
+    cache = SeriesCache(str(tmp_path / "c.sqlite"), max_bytes=6000, memory_items=0)
+    for h in range(20):
+        cache.get_or_compute(Form(hallucination=h), seed=0)
+    stats = cache.stats()
+    assert stats["evictions"] > 0 and stats["bytes"] <= 6000
+    cache.get_or_compute(Form(hallucination=19), seed=0)
+    assert cache.stats()["disk_hits"] == 1  # most recent entry survived
+    cache.close()
+
+
+def test_sweep_with_cache_matches_uncached(tmp_path):
+    forms = [Form(inject_symbols=True, hallucination=h) for h in (10, 50, 90, 10)]
+    plain = [[st["prompt"] for st in s] for s in sweep(forms, LEX, workers=1, seed=3)]
+    with SeriesCache(str(tmp_path / "c.sqlite")) as cache:
+        pooled = [[st["prompt"] for st in s] for s in sweep(forms, LEX, workers=2, chunk_size=2, seed=3, cache=cache)]
+        again = [[st["prompt"] for st in s] for s in sweep(forms, LEX, workers=1, seed=3, cache=cache)]
+        assert cache.stats()["hits"] == 4
+    assert plain == pooled == again
+
+
+def test_sweep_fingerprints_a_plain_dict_lexicon_once(tmp_path, monkeypatch):
+    import hypna.lexicon as lexicon
+
+    calls = []
+    real = lexicon._fingerprint_items
+    monkeypatch.setattr(lexicon, "_fingerprint_items", lambda items: calls.append(1) or real(items))
+    forms = [Form(inject_symbols=True, hallucination=h) for h in (10, 50, 90, 10, 30)]
+    with SeriesCache(str(tmp_path / "c.sqlite")) as cache:
+        for workers in (1, 2):
+            calls.clear()
+            assert len(list(sweep(forms, dict(LEX), workers=workers, chunk_size=2, seed=3, cache=cache))) == 5
+            assert len(calls) == 1, workers
+
+
+def test_json_and_binary_lexicons_share_keys_and_series(tmp_path):
+    import json
+
+    from hypna.engine import generate_series
+    from hypna.lexicon import convert_lexicon, load_symbol_lexicon
+
+    data = {f"{(i * 7919) % 1000}k": f"v{i}" for i in range(300)}  # insertion order != key order
+    src, dst = tmp_path / "lex.json", tmp_path / "lex.hlex"
+    src.write_text(json.dumps(data), encoding="utf-8")
+    convert_lexicon(str(src), str(dst))
+    mem, mapped = load_symbol_lexicon(str(src)), load_symbol_lexicon(str(dst))
+    f = Form(inject_symbols=True, evolve=Evolve(steps=4))
+    assert form_hash(f, mem, 5) == form_hash(f, mapped, 5) == form_hash(f, data, 5)
+    want = generate_series(f, mem, seed=5)
+    assert generate_series(f, mapped, seed=5) == want
+    with SeriesCache(str(tmp_path / "c.sqlite")) as cache:
+        cache.get_or_compute(f, mem, seed=5)
+        assert cache.get_or_compute(f, mapped, seed=5) == want
+    mapped.close()
@@ -0,0 +1,160 @@
+"""
+Headless batch compiler: `python -m hypna [FILE ...]`
+
+Reads Forms as JSON objects, JSON arrays of objects or JSONL from the given
+files (or stdin when none / "-" is given) and streams one compiled series per
+Form to stdout, flushing after each so downstream consumers can pipe it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from contextlib import ExitStack
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+
+from . import profiling
+from .cache import SeriesCache
+from .columnar import ColumnarWriter
+from .delta import write_delta_series
+from .engine import MAX_STEPS, Form, form_from_dict, load_symbol_lexicon
+from .export import DEFAULT_BUFFER_SIZE, open_export, write_prompts
+from .sweep import sweep
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_values(stream: IO[str]) -> Iterator[Any]:
+    """Yield top-level JSON values from a stream.
+
+    Handles JSONL, pretty-printed objects and concatenated documents without
+    reading the whole stream up front.
+    """
+    buf = ""
+    for line in stream:
+        buf += line
+        while True:
+            buf = buf.lstrip()
+            if not buf:
+                break
+            try:
+                val, end = _decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                break  # incomplete value: read more
+            yield val
+            buf = buf[end:]
+    buf = buf.strip()
+    if buf:
+        _decoder.raw_decode(buf)  # raises with a useful position
+        raise ValueError("trailing data after JSON value")
+
+
+def iter_forms(stream: IO[str]) -> Iterator[Form]:
+    for val in iter_json_values(stream):
+        items: List[Dict[str, Any]] = val if isinstance(val, list) else [val]
+        for item in items:
+            yield form_from_dict(item)
+
+
+def _open_inputs(paths: List[str]) -> Iterator[IO[str]]:
+    if not paths:
+        paths = ["-"]
+    for p in paths:
+        if p == "-":
+            yield sys.stdin
+        else:
+            with open(p, "r", encoding="utf-8") as f:
+                yield f
+
+
+def _write_jsonl(out: IO[str], name: str, items: Iterable[Any]) -> None:
+    # same bytes as json.dumps({name: list(items)}), without holding the list
+    out.write("{" + json.dumps(name) + ": [")
+    for i, item in enumerate(items):
+        out.write((", " if i else "") + json.dumps(item, ensure_ascii=False))
+    out.write("]}\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="python -m hypna",
+        description="Compile HYPNAGNOSIS Forms (JSON/JSONL) into prompt series without the GUI.",
+    )
+    ap.add_argument("inputs", nargs="*", help="Form files (JSON, JSON array or JSONL); '-' or none reads stdin")
+    ap.add_argument("--lexicon", help="symbol lexicon (JSON or binary .hlex) used when a Form sets inject_symbols")
+    ap.add_argument("--format", choices=("jsonl", "text", "delta"), default="jsonl",
+                    help="jsonl: one {'states': [...]} object per Form (default); text: prompt sheets; "
+                         "delta: delta-encoded series (see hypna.delta)")
+    ap.add_argument("--prompts-only", action="store_true", help="jsonl: emit {'prompts': [...]} instead of full states")
+    ap.add_argument("-o", "--output", metavar="PATH",
+                    help="write to PATH instead of stdout, atomically; .gz/.bz2/.xz suffixes compress")
+    ap.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE, metavar="BYTES",
+                    help=f"--output write buffer (default {DEFAULT_BUFFER_SIZE})")
+    ap.add_argument("--columnar", metavar="PATH",
+                    help="write every state to one columnar binary file at PATH instead of stdout "
+                         "(see hypna.columnar)")
+    ap.add_argument("--max-steps", type=int, default=MAX_STEPS,
+                    help=f"cap on evolve.steps per series (default {MAX_STEPS})")
+    ap.add_argument("--workers", type=int, default=1, help="compile across N processes (default 1: in-process)")
+    ap.add_argument("--chunk-size", type=int, default=64, help="Forms per worker task (default 64)")
+    ap.add_argument("--seed", type=int, default=0, help="seed for symbol lexicon sampling (default 0)")
+    ap.add_argument("--cache", nargs="?", const="", metavar="PATH",
+                    help="serve repeat Forms from a persistent series cache (default location if PATH omitted)")
+    ap.add_argument("--cache-stats", action="store_true", help="print cache hit/miss counters to stderr on exit")
+    ap.add_argument("--profile", nargs="?", const="-", metavar="PATH",
+                    help="time engine hot paths and dump JSON stats on exit (stderr, or PATH); "
+                         "covers in-process work only, so use with --workers 1")
+    return ap
+
+
+def main(argv: Optional[List[str]] = None, out: Optional[IO[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    count = 0
+    cache = None
+    writer = None
+    if args.profile:
+        profiling.reset()
+        profiling.enable()
+    try:
+        with ExitStack() as stack:
+            if args.output:
+                out = stack.enter_context(open_export(args.output, buffer_size=args.buffer_size))
+            lex = load_symbol_lexicon(args.lexicon, strict=True) if args.lexicon else {}
+            if args.cache is not None:
+                cache = SeriesCache(args.cache or None)
+            if args.columnar:
+                writer = ColumnarWriter(args.columnar)
+            forms = (f for stream in _open_inputs(args.inputs) for f in iter_forms(stream))
+            for series in sweep(forms, lex, workers=args.workers, chunk_size=args.chunk_size,
+                                seed=args.seed, max_steps=args.max_steps, cache=cache, lazy=True):
+                if writer is not None:
+                    writer.add_series(series)
+                elif args.format == "text":
+                    if write_prompts(out, series) == 1:
+                        out.write("\n")
+                elif args.format == "delta":
+                    write_delta_series(out, series)
+                elif args.prompts_only:
+                    _write_jsonl(out, "prompts", (st["prompt"] for st in series))
+                else:
+                    _write_jsonl(out, "states", series)
+                if not args.output:
+                    out.flush()
+                count += 1
+            if writer is not None:
+                writer.close()
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"hypna: error after {count} form(s): {e}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            if args.cache_stats:
+                print("hypna: cache " + json.dumps(cache.stats()), file=sys.stderr)
+            cache.close()
+        if args.profile:
+            profiling.disable()
+            profiling.dump(args.profile)
+    return 0
@@ -0,0 +1,63 @@
+import gzip
+import io
+import json
+import sys
+
+from hypna.cli import iter_json_values, main
+
+
+def _run(stdin_text, *argv):
+    out = io.StringIO()
+    old = sys.stdin
+    sys.stdin = io.StringIO(stdin_text)
+    try:
+        code = main(list(argv), out=out)
+    finally:
+        sys.stdin = old
+    return code, out.getvalue()
+
+
+def test_iter_json_values_handles_jsonl_pretty_and_arrays():
+    text = '{"a": 1}\n{"a":\n  2}\n[{"a": 3}]\n'
+    assert list(iter_json_values(io.StringIO(text))) == [{"a": 1}, {"a": 2}, [{"a": 3}]]
+
+
+def test_jsonl_in_jsonl_out():
+    code, out = _run('{"evolve": {"steps": 2}}\n{"evolve": {"enabled": false}}\n', "--prompts-only")
+    assert code == 0
+    rows = [json.loads(ln) for ln in out.splitlines()]
+    assert [len(r["prompts"]) for r in rows] == [2, 1]
+
+
+def test_text_format_matches_gui_save_layout():
+    code, out = _run('{"evolve": {"steps": 2}}', "--format", "text")
+    assert code == 0
+    assert out.startswith("=== STATE 1 ===\nHANDRAW-HUMAN")
+    assert "=== STATE 2 ===" in out
+
+
+def test_bad_form_reports_error():
+    code, _ = _run('{"nope": 1}')
+    assert code == 1
+
+
+def test_output_file_is_compressed_by_suffix(tmp_path):
+    path = str(tmp_path / "out.jsonl.gz")
+    code, out = _run('{"evolve": {"steps": 2}}', "--prompts-only", "-o", path)
+    assert code == 0 and out == ""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert len(json.loads(f.read())["prompts"]) == 2
+
+
+def test_long_series_streams_state_by_state_with_unchanged_output():
+    from hypna.engine import form_from_dict, generate_series
+    from hypna.sweep import sweep
+
+    form = {"mode": "LIVE", "evolve": {"steps": 300}}
+    (series,) = sweep([form_from_dict(form)], workers=1, max_steps=300, lazy=True)
+    assert not isinstance(series, list)  # a generator, not the whole series
+    want = generate_series(form_from_dict(form), {}, max_steps=300, seed=0)
+    code, out = _run(json.dumps(form), "--max-steps", "300")
+    assert code == 0 and out == json.dumps({"states": want}, ensure_ascii=False) + "\n"
+    code, out = _run(json.dumps(form), "--max-steps", "300", "--prompts-only")
+    assert out == json.dumps({"prompts": [st["prompt"] for st in want]}, ensure_ascii=False) + "\n"
@@ -0,0 +1,158 @@
+"""
+Single-flight request coalescing.
+
+When many callers ask for the same thing at once, the first one computes and
+the rest wait for its result instead of recomputing. Optionally a finished
+result is also handed out for `ttl` seconds to calls that arrive just after.
+`SeriesCoalescer` keys `generate_series` calls by `form_hash` (canonical
+Form, lexicon, seed and step cap); `AsyncSingleFlight` is the event-loop
+flavour the HTTP server uses.
+
+Results are shared between callers: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Mapping, Optional, Tuple, TypeVar
+
+from .cache import form_hash, lexicon_fingerprint
+from .engine import MAX_STEPS, Form, generate_series
+
+T = TypeVar("T")
+
+
+class _Flights(Generic[T]):
+    # counters and the TTL window shared by both flavours
+
+    def __init__(self, ttl: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.computed = 0
+        self.coalesced = 0
+        self.reused = 0
+        self._recent: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        # key -> the computation callers are waiting on (a _Call or a Task)
+        self._pending: Dict[str, Any] = {}
+
+    def _recent_result(self, key: str) -> Optional[Tuple[float, T]]:
+        now = self.clock()
+        while self._recent:
+            k, (expires, _) = next(iter(self._recent.items()))
+            if expires > now:
+                break
+            del self._recent[k]
+        return self._recent.get(key)
+
+    def _remember(self, key: str, result: T) -> None:
+        if self.ttl > 0:
+            self._recent.pop(key, None)
+            self._recent[key] = (self.clock() + self.ttl, result)
+
+    def stats(self) -> Dict[str, int]:
+        return {"computed": self.computed, "coalesced": self.coalesced, "reused": self.reused,
+                "in_flight": len(self._pending)}
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(_Flights[T]):
+    """Thread-safe: concurrent `do(key, fn)` calls with one key run `fn` once."""
+
+    def __init__(self, ttl: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        super().__init__(ttl, clock)
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            recent = self._recent_result(key)
+            if recent is not None:
+                self.reused += 1
+                return recent[1]
+            call = self._pending.get(key)
+            leader = call is None
+            if leader:
+                call = self._pending[key] = _Call()
+                self.computed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()  # type: ignore[union-attr]
+            if call.error is not None:  # type: ignore[union-attr]
+                raise call.error  # type: ignore[union-attr]
+            return call.result  # type: ignore[union-attr,return-value]
+        try:
+            call.result = fn()  # type: ignore[union-attr]
+        except BaseException as e:
+            call.error = e  # type: ignore[union-attr]
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if call.error is None:  # type: ignore[union-attr]
+                    self._remember(key, call.result)  # type: ignore[union-attr,arg-type]
+            call.done.set()  # type: ignore[union-attr]
+        return call.result  # type: ignore[union-attr,return-value]
+
+
+class AsyncSingleFlight(_Flights[T]):
+    """Event-loop flavour: concurrent `await do(key, fn)` calls share one `fn()`.
+
+    The shared computation runs as its own task, so a caller that gets
+    cancelled doesn't cancel it for the others.
+    """
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        recent = self._recent_result(key)
+        if recent is not None:
+            self.reused += 1
+            return recent[1]
+        task = self._pending.get(key)
+        if task is None:
+            self.computed += 1
+            task = self._pending[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: "asyncio.Task[T]") -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled() and task.exception() is None:
+            self._remember(key, task.result())
+
+
+class SeriesCoalescer:
+    """`generate_series` behind a `SingleFlight`, keyed by `form_hash`.
+
+    Unseeded Forms that sample symbols are not reproducible, so (as with
+    SeriesCache) every such call computes its own series.
+    """
+
+    def __init__(self, lex: Optional[Mapping[str, Any]] = None, max_steps: int = MAX_STEPS, ttl: float = 0.0):
+        self.lex = lex if lex is not None else {}
+        self.max_steps = max_steps
+        self.flight: SingleFlight[List[Dict[str, Any]]] = SingleFlight(ttl)
+        # one full pass over the lexicon here instead of one per key
+        self._lex_fp = lexicon_fingerprint(self.lex) if self.lex else None
+
+    def generate(self, form: Form, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        seed = seed if seed is not None else form.seed
+        if seed is None and form.inject_symbols and self.lex:
+            return generate_series(form, self.lex, self.max_steps)
+        key = form_hash(form, self.lex, seed, self.max_steps, lex_fingerprint=self._lex_fp)
+        return self.flight.do(key, lambda: generate_series(form, self.lex, self.max_steps, seed=seed))
+
+    def stats(self) -> Dict[str, int]:
+        return self.flight.stats()
@@ -0,0 +1,388 @@
+"""
+Columnar binary export of series and sweeps, for analysis without
+re-parsing prompt sheets.
+
+Every state becomes a row: a `series` column (position in the sweep) plus
+one column per state field, prompt included. Columns get the narrowest kind
+that holds all their values:
+
+    bool   u8 per row
+    i64    int64 per row
+    f64    float64 per row
+    cat    u32 code per row into a category list kept in the index
+           (strings with at most CATEGORY_LIMIT distinct values)
+    str    u64 offsets (rows + 1) then the UTF-8 text
+    json   like str, one JSON value per row (mixed types, lists, dicts,
+           ints outside int64)
+
+File layout (little-endian), every column region 8-byte aligned:
+
+    header   magic b"HCOLv1\\0\\0", u64 rows, u64 index_pos, u64 index_len
+    columns  ...
+    index    JSON {"columns": [{"name", "kind", "pos", "size", ...}]}
+
+`ColumnarFile` memory-maps the file: numeric columns are memoryviews over the
+mapping (no copy; `numpy.frombuffer` wraps them as-is) and text columns
+decode a row only when it is read, so one column of a multi-million-row
+sweep loads without touching the rest.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from .engine import SKIP
+
+MAGIC = b"HCOLv1\0\0"
+_HEADER = struct.Struct("<8sQQQ")
+
+# a string column switches from codes to plain text past this many distinct values
+CATEGORY_LIMIT = 4096
+
+_TYPED = {bool: ("bool", "B"), int: ("i64", "q"), float: ("f64", "d")}
+_VIEW_FORMAT = {"bool": "?", "i64": "q", "f64": "d", "cat": "I"}
+_LITTLE = sys.byteorder == "little"
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _skip(v: Any) -> Any:
+    # restore SKIP's identity for values read back
+    return SKIP if v == SKIP else v
+
+
+def _le_bytes(a: array) -> bytes:
+    if not _LITTLE:
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+class _ColumnBuilder:
+    """Accumulates one column, widening its kind when a value doesn't fit."""
+
+    def __init__(self) -> None:
+        self.kind: Optional[str] = None
+        self.type: Optional[type] = None
+        self.data: Optional[array] = None
+        self.categories: Dict[str, int] = {}
+        self.spool: Optional[IO[bytes]] = None
+        self.offsets: Optional[array] = None
+
+    def add(self, v: Any) -> None:
+        kind = self.kind
+        if kind == "cat":
+            if type(v) is str:
+                code = self.categories.get(v)
+                if code is None:
+                    if len(self.categories) >= CATEGORY_LIMIT:
+                        self._widen("str")
+                        self._add_text(v)
+                        return
+                    code = self.categories[v] = len(self.categories)
+                self.data.append(code)  # type: ignore[union-attr]
+                return
+        elif kind == "json":
+            self._add_text(_dumps(v))
+            return
+        elif kind == "str":
+            if type(v) is str:
+                self._add_text(v)
+                return
+        elif kind is None:
+            self._start(v)
+            return self.add(v)
+        elif type(v) is self.type:
+            try:
+                self.data.append(v)  # type: ignore[union-attr]
+                return
+            except OverflowError:
+                pass  # an int outside int64: kept exact as JSON
+        self._widen("json")
+        self.add(v)
+
+    def _start(self, v: Any) -> None:
+        t = type(v)
+        if t in _TYPED:
+            self.kind, code = _TYPED[t]
+            self.type, self.data = t, array(code)
+        elif t is str:
+            self.kind, self.data = "cat", array("I")
+        else:
+            self._start_text("json")
+
+    def _start_text(self, kind: str) -> None:
+        self.kind = kind
+        self.data = None
+        self.spool = tempfile.TemporaryFile()
+        self.offsets = array("Q", [0])
+
+    def _add_text(self, s: str) -> None:
+        b = s.encode("utf-8")
+        self.spool.write(b)  # type: ignore[union-attr]
+        self.offsets.append(self.offsets[-1] + len(b))  # type: ignore[union-attr]
+
+    def values(self) -> Iterator[Any]:
+        if self.kind == "cat":
+            cats = list(self.categories)
+            return (cats[c] for c in self.data)  # type: ignore[union-attr]
+        if self.kind in ("str", "json"):
+            self.spool.seek(0)  # type: ignore[union-attr]
+            blob = self.spool.read()  # type: ignore[union-attr]
+            offs = self.offsets
+            texts = (blob[offs[i]:offs[i + 1]].decode("utf-8") for i in range(len(offs) - 1))  # type: ignore[arg-type]
+            return (json.loads(t) for t in texts) if self.kind == "json" else texts
+        if self.kind == "bool":
+            return (bool(x) for x in self.data)  # type: ignore[union-attr]
+        return iter(self.data or ())
+
+    def _widen(self, kind: str) -> None:
+        old = list(self.values())
+        if self.spool is not None:
+            self.spool.close()
+        self._start_text(kind)
+        self.categories = {}
+        for v in old:
+            self._add_text(_dumps(v) if kind == "json" else v)
+
+    def write(self, out: IO[bytes], pos: int) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"kind": self.kind, "pos": pos}
+        if self.kind in ("str", "json"):
+            offsets = _le_bytes(self.offsets)  # type: ignore[arg-type]
+            out.write(offsets)
+            self.spool.seek(0)  # type: ignore[union-attr]
+            shutil.copyfileobj(self.spool, out)  # type: ignore[arg-type]
+            self.spool.close()  # type: ignore[union-attr]
+            entry["size"] = len(offsets) + self.offsets[-1]  # type: ignore[index]
+        else:
+            data = _le_bytes(self.data)  # type: ignore[arg-type]
+            out.write(data)
+            entry["size"] = len(data)
+            if self.kind == "cat":
+                entry["categories"] = list(self.categories)
+        return entry
+
+
+class ColumnarWriter:
+    """Streams series into a columnar file at `path`.
+
+    Rows are accumulated (numbers in arrays, text spooled to temp files) and
+    the file is assembled on `close()` next to `path`, then renamed into place.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self.series = 0
+        self._columns: Dict[str, _ColumnBuilder] = {"series": _ColumnBuilder()}
+        self._keys: Set[str] = set()
+        self._adders: List[Tuple[str, Callable[[Any], None]]] = []
+
+    def _add_columns(self, st: Mapping[str, Any]) -> None:
+        for k in st:
+            if k not in self._columns:
+                col = self._columns[k] = _ColumnBuilder()
+                for _ in range(self.rows):
+                    col.add(None)
+                self._keys.add(k)
+                self._adders.append((k, col.add))
+
+    def add_series(self, states: Iterable[Mapping[str, Any]]) -> int:
+        """Append one series' states; returns how many were added."""
+        add_series_no = self._columns["series"].add
+        n = 0
+        for st in states:
+            if st.keys() != self._keys:
+                self._add_columns(st)
+            add_series_no(self.series)
+            get = st.get
+            for k, add in self._adders:
+                add(get(k))
+            self.rows += 1
+            n += 1
+        self.series += 1
+        return n
+
+    def close(self) -> None:
+        tmp = self.path + ".tmp"
+        index: List[Dict[str, Any]] = []
+        try:
+            with open(tmp, "wb") as out:
+                out.write(bytes(_HEADER.size))
+                pos = _HEADER.size
+                for name, col in self._columns.items():
+                    if col.kind is None:  # no rows at all
+                        col._start_text("json")
+                    entry = col.write(out, pos)
+                    entry["name"] = name
+                    index.append(entry)
+                    pos += entry["size"]
+                    pad = -pos % 8
+                    out.write(bytes(pad))
+                    pos += pad
+                raw = _dumps({"columns": index}).encode("utf-8")
+                out.write(raw)
+                out.seek(0)
+                out.write(_HEADER.pack(MAGIC, self.rows, pos, len(raw)))
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            for col in self._columns.values():
+                if col.spool is not None:
+                    col.spool.close()
+
+
+def write_columnar(path: str, series: Iterable[Iterable[Mapping[str, Any]]]) -> int:
+    """Write a sweep (an iterable of series, e.g. `sweep(...)`); returns the row count."""
+    with ColumnarWriter(path) as w:
+        for states in series:
+            w.add_series(states)
+    return w.rows
+
+
+class _TextColumn(Sequence):
+    # str/json column over the mapping; rows are decoded on access
+    def __init__(self, mm: mmap.mmap, pos: int, n: int, as_json: bool):
+        self._mm, self._n, self._json = mm, n, as_json
+        self._offsets = memoryview(mm)[pos:pos + 8 * (n + 1)].cast("Q") if _LITTLE else None
+        self._pos = pos
+        self._blob = pos + 8 * (n + 1)
+
+    def _offset(self, i: int) -> int:
+        if self._offsets is not None:
+            return self._offsets[i]
+        return struct.unpack_from("<Q", self._mm, self._pos + 8 * i)[0]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        s = self._mm[self._blob + self._offset(i):self._blob + self._offset(i + 1)].decode("utf-8")
+        return _skip(json.loads(s) if self._json else s)
+
+    def release(self) -> None:
+        if self._offsets is not None:
+            self._offsets.release()
+
+
+class _CategoryColumn(Sequence):
+    def __init__(self, codes: Any, categories: List[str]):
+        self.codes = codes
+        self.categories = [_skip(c) for c in categories]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self.categories[c] for c in self.codes[i]]
+        return self.categories[self.codes[i]]
+
+    def release(self) -> None:
+        if isinstance(self.codes, memoryview):
+            self.codes.release()
+
+
+Column = Union[memoryview, array, _TextColumn, _CategoryColumn]
+
+
+class ColumnarFile:
+    """Read-only, memory-mapped view of a file written by `ColumnarWriter`.
+
+    Views handed out by `column()` point into the mapping: release them
+    (`memoryview.release()`, or `.release()` on text/category columns) or
+    drop them before `close()`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.rows, index_pos, index_len = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not a columnar export (bad magic)")
+            if index_pos + index_len > len(self._mm):
+                raise ValueError(f"{path}: truncated columnar export")
+            index = json.loads(self._mm[index_pos:index_pos + index_len])
+        except (struct.error, ValueError):
+            self._mm.close()
+            raise
+        self._index: Dict[str, Dict[str, Any]] = {e["name"]: e for e in index["columns"]}
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._index)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def kind(self, name: str) -> str:
+        return self._index[name]["kind"]
+
+    def column(self, name: str) -> Column:
+        """One column: a memoryview for bool/i64/f64, a lazy sequence otherwise."""
+        e = self._index[name]
+        kind, pos = e["kind"], e["pos"]
+        if kind in ("str", "json"):
+            return _TextColumn(self._mm, pos, self.rows, kind == "json")
+        fmt = _VIEW_FORMAT[kind]
+        if _LITTLE:
+            view: Any = memoryview(self._mm)[pos:pos + e["size"]].cast(fmt)
+        else:
+            view = array("B" if fmt == "?" else fmt, self._mm[pos:pos + e["size"]])
+            view.byteswap()
+        if kind == "cat":
+            return _CategoryColumn(view, e["categories"])
+        return view
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Row i as a state dict (plus its `series` number); decodes every column."""
+        out: Dict[str, Any] = {}
+        for name in self._index:
+            col = self.column(name)
+            v = col[i]
+            out[name] = bool(v) if self._index[name]["kind"] == "bool" else v
+            if hasattr(col, "release"):
+                col.release()
+        return out
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def read_columnar(path: str) -> ColumnarFile:
+    return ColumnarFile(path)
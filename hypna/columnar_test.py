@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from hypna import columnar
+from hypna.cli import main
+from hypna.columnar import ColumnarFile, ColumnarWriter, write_columnar
+from hypna.engine import CURVES, SKIP, Form, form_from_dict, generate_series
+from hypna.sweep import form_grid, sweep
+
+LEX = {f"sym{i}": f"meaning {i}" for i in range(20)}
+
+
+def _sweep():
+    base = Form(inject_symbols=True, temporal=SKIP)
+    base.evolve.steps = 4
+    return list(sweep(form_grid(base, {"hallucination": [10, 60, 90], "evolve.curve": CURVES[:2]}), LEX, workers=1))
+
+
+def test_sweep_round_trip(tmp_path):
+    results = _sweep()
+    path = str(tmp_path / "sweep.hcol")
+    assert write_columnar(path, results) == 24
+    flat = [dict(st, series=i) for i, series in enumerate(results) for st in series]
+    with ColumnarFile(path) as f:
+        assert len(f) == 24 and f.names[:3] == ["series", "index", "mode"]
+        assert [f.row(i) for i in range(24)] == flat
+        assert f.kind("hallucination") == "i64" and f.kind("state_name") == "cat"
+        assert f.kind("injected_symbols") == "json"
+        h = f.column("hallucination")
+        assert isinstance(h, memoryview) and h.tolist() == [st["hallucination"] for st in flat]
+        h.release()
+        temporal = f.column("temporal")
+        assert temporal[5] is SKIP
+        temporal.release()
+
+
+def test_columns_widen_when_values_do_not_fit(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "CATEGORY_LIMIT", 2)
+    path = str(tmp_path / "mixed.hcol")
+    with ColumnarWriter(path) as w:
+        w.add_series([{"a": 1, "b": "x", "c": True}, {"a": "7", "b": "y", "c": False}])
+        w.add_series([{"a": None, "b": "z", "c": True}, {"b": "w", "d": 1.5}])
+    with ColumnarFile(path) as f:
+        assert [f.kind(n) for n in ("a", "b", "c", "d")] == ["json", "str", "json", "json"]
+        assert [f.row(i) for i in range(4)] == [
+            {"series": 0, "a": 1, "b": "x", "c": True, "d": None},
+            {"series": 0, "a": "7", "b": "y", "c": False, "d": None},
+            {"series": 1, "a": None, "b": "z", "c": True, "d": None},
+            {"series": 1, "a": None, "b": "w", "c": None, "d": 1.5},
+        ]
+
+
+def test_ints_outside_int64_fall_back_to_json(tmp_path):
+    path = str(tmp_path / "big.hcol")
+    rows = [{"a": 1, "b": 2**70}, {"a": -2**64, "b": 3}]
+    assert write_columnar(path, [rows]) == 2
+    with ColumnarFile(path) as f:
+        assert f.kind("a") == f.kind("b") == "json"
+        assert [f.row(i) for i in range(2)] == [dict(r, series=0) for r in rows]
+
+
+def test_failed_close_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail(*a):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(columnar.os, "replace", fail)
+    w = ColumnarWriter(str(tmp_path / "out.hcol"))
+    w.add_series([{"a": 1}])
+    with pytest.raises(OSError, match="disk full"):
+        w.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cli_and_bad_files(tmp_path, monkeypatch):
+    path = str(tmp_path / "cli.hcol")
+    monkeypatch.setattr("sys.stdin", io.StringIO('{"evolve": {"steps": 3}}\n{"evolve": {"enabled": false}}\n'))
+    out = io.StringIO()
+    assert main(["--columnar", path], out=out) == 0 and out.getvalue() == ""
+    with ColumnarFile(path) as f:
+        assert f.column("series").tolist() == [0, 0, 0, 1]
+        prompts = f.column("prompt")
+        assert prompts[3] == generate_series(form_from_dict({"evolve": {"enabled": False}}), {})[0]["prompt"]
+        prompts.release()
+    bad = tmp_path / "bad.hcol"
+    bad.write_bytes(b"not columnar at all, just some bytes")
+    with pytest.raises(ValueError):
+        ColumnarFile(str(bad))
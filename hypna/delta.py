@@ -0,0 +1,196 @@
+"""
+Delta-encoded series: the first state in full, then only the fields each
+state changes relative to the one before it.
+
+Neighbouring states share nearly every resolved field (only some
+hallucination-driven values and the state_defaults labels move, and `index`
+is implied), and prompts are not stored at all: they are re-rendered from
+the state on access. On disk a series is JSON lines, a header then one delta
+per state:
+
+    {"format": "hypna-delta", "version": 1, "count": 3, "base": {...}}
+    {}
+    {"recursion": "nested", "state_name": "WATCHER"}
+    ...
+
+Series can be concatenated in one file (`iter_delta_series`). Reading keeps
+each delta line undecoded until a state that needs it is asked for.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from typing import Any, Dict, IO, Iterable, Iterator, List, Mapping, Optional, Union
+
+from .engine import SKIP, render_prompt
+
+FORMAT = "hypna-delta"
+VERSION = 1
+
+# random access replays at most this many deltas from a cached full state
+CHECKPOINT_EVERY = 64
+
+_MISSING = object()
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _restore_skip(d: Dict[str, Any]) -> Dict[str, Any]:
+    # restore SKIP's identity so render_prompt still omits those lines
+    for k, v in d.items():
+        if v == SKIP:
+            d[k] = SKIP
+    return d
+
+
+def state_delta(prev: Mapping[str, Any], st: Mapping[str, Any]) -> Dict[str, Any]:
+    """Fields of `st` that differ from the previous state (the prompt is never
+    kept, nor an `index` that just counts up)."""
+    get = prev.get
+    d = {k: v for k, v in st.items() if get(k, _MISSING) is not v and k != "prompt" and get(k, _MISSING) != v}
+    if d.get("index") == prev.get("index", 0) + 1:
+        del d["index"]
+    return d
+
+
+def _apply(st: Dict[str, Any], d: Mapping[str, Any]) -> None:
+    index = st.get("index", 0)
+    st.update(d)
+    if "index" not in d:
+        st["index"] = index + 1
+
+
+class DeltaSeries(Sequence):
+    """A series as base state + per-state deltas; items are full state dicts.
+
+    `deltas` may hold dicts or their undecoded JSON text; either way a state
+    (and its prompt) is only rebuilt when indexed. Rebuilt states share
+    list/dict values with each other: treat them as read-only.
+    """
+
+    def __init__(self, base: Dict[str, Any], deltas: List[Union[str, Dict[str, Any]]]):
+        self.base = base
+        self.deltas = deltas
+        self._checkpoints: Dict[int, Dict[str, Any]] = {0: base}
+
+    @classmethod
+    def from_states(cls, states: Iterable[Mapping[str, Any]]) -> "DeltaSeries":
+        """Encode a series (a list or `iter_series`, consumed lazily)."""
+        it = iter(states)
+        first = next(it, None)
+        if first is None:
+            return cls({}, [])
+        prev = base = {k: v for k, v in first.items() if k != "prompt"}
+        deltas: List[Union[str, Dict[str, Any]]] = [{}]
+        for st in it:
+            deltas.append(state_delta(prev, st))
+            prev = st
+        return cls(base, deltas)
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    def delta(self, i: int) -> Dict[str, Any]:
+        d = self.deltas[i]
+        if isinstance(d, str):
+            d = self.deltas[i] = _restore_skip(json.loads(d))
+        return d
+
+    def state(self, i: int, prompt: bool = True) -> Dict[str, Any]:
+        c = i - i % CHECKPOINT_EVERY
+        if c not in self._checkpoints:
+            j = max(k for k in self._checkpoints if k < c)
+            st = dict(self._checkpoints[j])
+            for k in range(j + 1, c + 1):
+                _apply(st, self.delta(k))
+                if k % CHECKPOINT_EVERY == 0:
+                    self._checkpoints[k] = dict(st)
+        st = dict(self._checkpoints[c])
+        for k in range(c + 1, i + 1):
+            _apply(st, self.delta(k))
+        if prompt:
+            st["prompt"] = render_prompt(st)
+        return st
+
+    def prompt(self, i: int) -> str:
+        return render_prompt(self.state(i, prompt=False))
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self.state(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("state index out of range")
+        return self.state(i)
+
+    def iter_states(self, prompt: bool = True) -> Iterator[Dict[str, Any]]:
+        """States in order, one delta applied per step."""
+        st = dict(self.base)
+        for i in range(len(self)):
+            if i:
+                _apply(st, self.delta(i))
+            out = dict(st)
+            if prompt:
+                out["prompt"] = render_prompt(out)
+            yield out
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_states()
+
+    def prompts(self) -> Iterator[str]:
+        for st in self.iter_states(prompt=False):
+            yield render_prompt(st)
+
+    def write(self, f: IO[str]) -> int:
+        return _write(f, self.base, (d if isinstance(d, str) else _dumps(d) for d in self.deltas), len(self))
+
+
+def _write(f: IO[str], base: Mapping[str, Any], lines: Iterable[str], count: int) -> int:
+    f.write(_dumps({"format": FORMAT, "version": VERSION, "count": count, "base": base}))
+    f.write("\n")
+    for line in lines:
+        f.write(line)
+        f.write("\n")
+    return count
+
+
+def write_delta_series(f: IO[str], states: Iterable[Mapping[str, Any]]) -> int:
+    """Delta-encode and write a series; returns the number of states written.
+
+    The header carries the state count, so a generator is encoded in memory
+    (deltas only, no prompts) before anything is written.
+    """
+    series = states if isinstance(states, DeltaSeries) else DeltaSeries.from_states(states)
+    return series.write(f)
+
+
+def read_delta_series(f: IO[str]) -> Optional[DeltaSeries]:
+    """Read the next series from `f`; None at end of file."""
+    line = f.readline()
+    while line and not line.strip():
+        line = f.readline()
+    if not line:
+        return None
+    header = json.loads(line)
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("not a hypna delta series")
+    if header.get("version") != VERSION:
+        raise ValueError(f"unsupported delta series version {header.get('version')!r}")
+    deltas: List[Union[str, Dict[str, Any]]] = []
+    for _ in range(int(header["count"])):
+        line = f.readline()
+        if not line:
+            raise ValueError(f"truncated delta series: {len(deltas)} of {header['count']} states")
+        deltas.append(line.rstrip("\n"))
+    return DeltaSeries(_restore_skip(header["base"]), deltas)
+
+
+def iter_delta_series(f: IO[str]) -> Iterator[DeltaSeries]:
+    """Every series in a stream written by one or more `write_delta_series` calls."""
+    while True:
+        series = read_delta_series(f)
+        if series is None:
+            return
+        yield series
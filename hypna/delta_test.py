@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from hypna.cli import main
+from hypna.delta import CHECKPOINT_EVERY, DeltaSeries, iter_delta_series, read_delta_series, write_delta_series
+from hypna.engine import SKIP, form_from_dict, generate_series, iter_series
+
+LEX = {f"sym{i}": f"meaning {i}" for i in range(30)}
+
+
+def _series(steps=200, **extra):
+    form = form_from_dict(dict({"mode": "LIVE", "inject_symbols": True, "evolve": {"steps": steps}}, **extra))
+    return form, generate_series(form, LEX, max_steps=steps, seed=2)
+
+
+def test_round_trip_and_random_access():
+    form, series = _series()
+    buf = io.StringIO()
+    assert write_delta_series(buf, iter_series(form, LEX, max_steps=200, seed=2)) == 200
+    buf.seek(0)
+    ds = read_delta_series(buf)
+    assert all(isinstance(d, str) for d in ds.deltas)  # nothing decoded yet
+    assert ds[150] == series[150]
+    assert ds[-1] == series[-1] and ds[3:5] == series[3:5]
+    assert ds.prompt(CHECKPOINT_EVERY + 1) == series[CHECKPOINT_EVERY + 1]["prompt"]
+    assert list(ds) == series and list(ds.prompts()) == [st["prompt"] for st in series]
+    with pytest.raises(IndexError):
+        ds[200]
+
+
+def test_skip_survives_and_deltas_stay_small():
+    _, series = _series(steps=200, notes="__SKIP__", temporal=SKIP)
+    assert series[0]["temporal"] is SKIP
+    buf = io.StringIO()
+    write_delta_series(buf, series)
+    buf.seek(0)
+    ds = read_delta_series(buf)
+    assert all(ds[i]["temporal"] is SKIP for i in (0, 199))
+    assert ds[199]["prompt"] == series[199]["prompt"]
+    assert len(buf.getvalue()) * 10 < sum(len(st["prompt"]) for st in series)
+
+
+def test_concatenated_series_and_cli(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO('{"evolve": {"steps": 3}}\n{"evolve": {"enabled": false}}\n'))
+    buf = io.StringIO()
+    assert main(["--format", "delta"], out=buf) == 0
+    buf.seek(0)
+    assert [len(s) for s in iter_delta_series(buf)] == [3, 1]
+
+    _, a = _series(steps=3)
+    _, b = _series(steps=1)
+    buf = io.StringIO()
+    write_delta_series(buf, a)
+    DeltaSeries.from_states(b).write(buf)
+    buf.seek(0)
+    assert [list(s) for s in iter_delta_series(buf)] == [a, b]
+    with pytest.raises(ValueError):
+        read_delta_series(io.StringIO('{"format": "other"}\n'))
+    with pytest.raises(ValueError):
+        read_delta_series(io.StringIO(buf.getvalue().splitlines()[0] + "\n"))
@@ -0,0 +1,1136 @@
+"""
+HYPNAGNOSIS — prompt engine (no Tk dependency)
+
+Form model, state resolution and prompt compilation shared by the GUI
+(`hypna_prompt_gui_v3.py`) and the headless CLI (`python -m hypna`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import math
+import random
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from .lexicon import (
+    MappedLexicon, SymbolLexicon, convert_lexicon, indexed_lexicon, load_symbol_lexicon, sample_symbols,
+)
+from .state import State
+
+try:  # optional: only used by curve_values for large batches
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+SKIP = "__SKIP__"
+
+BOOTLOADER_TEXT = """===============================
+HYPNAGNOSIS SYSTEM — BOOTLOADER
+===============================
+HANDRAW-HUMAN is always enforced:
+- human-made drawing/print; pressure variation; wobble; redraws; imperfect edges; no sterile vector sheen.
+
+Input conventions:
+- blank = AUTOFILL
+- SKIP = omit that parameter line
+- NONE = neutralize / disable that module or parameter
+
+If user did not specify required minimums, ask for:
+1) MODE (FULL/STYLE/GESTURE/PRINT/LIVE)
+2) Subject (unless STYLE/GESTURE/PRINT only)
+3) Hallucination % (0–100)
+
+END BOOTLOADER
+"""
+
+SYSTEM_FILE_TEXT = """=========================================
+HYPNAGNOSIS SYSTEM FILE — v2
+=========================================
+MODES
+- [HYPNA/FULL]     Full stack
+- [HYPNA/STYLE]    Style-only
+- [HYPNA/GESTURE]  Gesture-only
+- [HYPNA/PRINT]    Print/plates-only
+- [HYPNA/LIVE]     Live evolving series
+
+VIBE REFERENCES
+- Provide a vibe description and optionally attached images.
+- Images are vibe-only; never copy composition or elements.
+
+HUMANIZER
+- Humanizer range controls how visibly human/physical the making is.
+- Qualities toggle specific human artifacts (smudge, redraws, hesitation, etc.)
+
+EXPORTS
+- Every module has Copy/Save exports (no export tab).
+
+END SYSTEM FILE
+"""
+
+STYLE_TOKENS: Dict[str, str] = {
+    "STYLE.HYPNAGOGIC": "porous perception, threshold drift, waking/dream seam, sensory instability",
+    "STYLE.OCCULT": "sigil-grammar, ritual diagram logic, correspondence pressure, symbolic recursion",
+    "STYLE.NEWWEIRD": "ontology fracture, non-human logic, liminal infrastructures, wrongness-without-reveal",
+    "STYLE.PRINT": "overprint thinking, misregistration drift, plate logic, physical ink behavior",
+    "STYLE.GRAPHIC_SCORE": "score-as-image, performable reading paths, time/intensity vectors, instructional ambiguity",
+    "STYLE.CONSPIRACY_DIAGRAM": "Lombardi-like map logic: arcs, nodes, annotations, evidence lines, ambiguity without resolution",
+}
+
+PAINTING_INFLUENCES = [
+    "NONE",
+    "Bacon-like corporeal pressure (not imitation)",
+    "Basquiat-like raw mark language (not imitation)",
+    "Brus-like gestural abrasion (not imitation)",
+    "De Kooning-like smears (not imitation)",
+    "Goya-like chiaroscuro dread (not imitation)",
+    "Turner-like atmospheric wash (not imitation)",
+    "Rothko-like fields (not imitation)",
+    "Abstract expressionist scrape (not imitation)",
+]
+
+HUMANIZER_QUALITIES = [
+    ("wobble_lines", "Wobble lines"),
+    ("hesitation", "Hesitation marks"),
+    ("redraws", "Visible redraws"),
+    ("smudge", "Smudge / rub"),
+    ("drybrush", "Drybrush / broken ink"),
+    ("misregistration", "Misregistration drift"),
+    ("paper_tooth", "Paper tooth / grain"),
+    ("ghosting", "Ghosting / plate memory"),
+    ("overpaint", "Overpaint / correction"),
+    ("tape_edges", "Tape edges / masking"),
+    ("stipple_noise", "Stipple / noise fill"),
+    ("bleed", "Ink bleed / feather"),
+]
+
+CURVES = ["linear", "ease-in", "ease-out", "s-curve", "pulse"]
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def parse_cell(s: str) -> Union[str, None, object]:
+    s = (s or "").strip()
+    if s == "":
+        return ""  # autofill
+    sl = s.lower()
+    if sl == "skip":
+        return SKIP
+    if sl == "none":
+        return None
+    return s
+
+def parse_int_cell(s: str) -> Union[int, None, object, str]:
+    v = parse_cell(s)
+    if v in (SKIP, None):
+        return v
+    if v == "":
+        return ""
+    try:
+        return int(str(v))
+    except Exception:
+        return ""
+
+def format_cell(v: Any) -> str:
+    """Entry text that parse_cell/parse_int_cell read back as `v`."""
+    if v is SKIP:
+        return "SKIP"
+    if v is None:
+        return "NONE"
+    return str(v)
+
+def clamp(n: int, lo: int = 0, hi: int = 100) -> int:
+    return max(lo, min(hi, n))
+
+def is_omitted(v: Any) -> bool:
+    return v is None or v is SKIP
+
+def kv(key: str, val: Any) -> Optional[str]:
+    if is_omitted(val) or val == "":
+        return None
+    return f"{key}: {val}"
+
+def block(title: str, lines: List[Optional[str]]) -> str:
+    clean = [ln for ln in lines if ln and str(ln).strip()]
+    if not clean:
+        return ""
+    return "\n".join([title] + clean)
+
+# cached so every state of a series shares one expanded string
+@lru_cache(maxsize=256)
+def expand_style_tokens(token_csv: str) -> str:
+    toks = [t.strip() for t in (token_csv or "").split(",") if t.strip()]
+    if not toks:
+        return ""
+    expanded = [STYLE_TOKENS.get(t, t) for t in toks]
+    return "; ".join(expanded)
+
+def _auto_color_map(h: int) -> Tuple[str, str]:
+    if h < 25:
+        return ("monochrome graphite + faint wash", "mono")
+    if h < 50:
+        return ("limited 2–3 ink palette", "duotone")
+    if h < 75:
+        return ("riso overprint + visible misregistration", "tritone")
+    return ("unstable spectral overprint (still physical ink)", "quad")
+
+_CURVE_ALIASES = {"sigmoid": "s-curve"}
+
+@lru_cache(maxsize=64)
+def curve_name(curve: str) -> str:
+    """Normalize a curve spec to one of CURVES (unknown curves behave as linear)."""
+    c = (curve or "linear").lower().strip()
+    c = _CURVE_ALIASES.get(c, c)
+    return c if c in CURVES else "linear"
+
+def curve_value(curve: str, t: float) -> float:
+    t = max(0.0, min(1.0, t))
+    c = curve_name(curve)
+    if c == "ease-in":
+        return t * t
+    if c == "ease-out":
+        return 1 - (1 - t) * (1 - t)
+    if c == "s-curve":
+        return t * t * (3 - 2 * t)
+    if c == "pulse":
+        return 0.5 - 0.5 * math.cos(2 * math.pi * t)
+    return t
+
+def curve_values(curve: str, ts: Sequence[float], use_numpy: Optional[bool] = None) -> Any:
+    """Evaluate `curve` over a whole sequence of t values in one pass.
+
+    Returns a NumPy array when NumPy is installed (or `use_numpy=True`),
+    otherwise a list matching `curve_value` element for element. The NumPy
+    `pulse` path may differ from `math.cos` in the last ulp, so the engine
+    itself sticks to the list path to keep prompts identical across installs.
+    """
+    c = curve_name(curve)
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        t = np.clip(np.asarray(ts, dtype=float), 0.0, 1.0)
+        if c == "ease-in":
+            return t * t
+        if c == "ease-out":
+            return 1 - (1 - t) * (1 - t)
+        if c == "s-curve":
+            return t * t * (3 - 2 * t)
+        if c == "pulse":
+            return 0.5 - 0.5 * np.cos(2 * math.pi * t)
+        return t
+
+    tl = [max(0.0, min(1.0, t)) for t in ts]
+    if c == "ease-in":
+        return [t * t for t in tl]
+    if c == "ease-out":
+        return [1 - (1 - t) * (1 - t) for t in tl]
+    if c == "s-curve":
+        return [t * t * (3 - 2 * t) for t in tl]
+    if c == "pulse":
+        return [0.5 - 0.5 * math.cos(2 * math.pi * t) for t in tl]
+    return tl
+
+def _default_from_h(h: int) -> Dict[str, Any]:
+    palette_desc, plate_palette = _auto_color_map(h)
+    temporal = clamp(int(30 + 0.60 * h))
+    material = clamp(int(75 - 0.25 * h))
+    space = clamp(int(35 + 0.45 * h))
+    symbol = clamp(int(12 + 0.78 * h))
+    agency = clamp(int(65 - 0.30 * h))
+
+    saturation = "sparse" if h < 25 else "balanced" if h < 50 else "dense" if h < 75 else "overload"
+    motion = "still" if h < 20 else "flowing" if h < 45 else "kinetic" if h < 75 else "explosive"
+    form = "figurative" if h < 30 else "hybrid" if h < 70 else "field"
+    media = "graphite" if h < 25 else "ink" if h < 45 else "mixed" if h < 80 else "print"
+    palette = "mono" if h < 25 else "limited" if h < 50 else "riso" if h < 75 else "unstable"
+    surface = "clean" if h < 20 else "paper" if h < 55 else "aged" if h < 85 else "fractured"
+
+    coherence = clamp(int(90 - 0.70 * h))
+    recursion = clamp(int(5 + 0.85 * h))
+    grain = clamp(int(18 + 0.55 * h))
+    line_wobble = clamp(int(12 + 0.70 * h))
+    erasure = clamp(int(10 + 0.35 * h))
+    annotation = clamp(int(8 + 0.45 * h))
+    contrast = "high" if h >= 60 else "medium"
+    whiteness = "more white" if h < 70 else "white breaks"
+
+    return dict(
+        temporal=temporal, material=material, space=space, symbol=symbol, agency=agency,
+        saturation=saturation, motion=motion, form=form, media=media, palette=palette, surface=surface,
+        palette_desc=palette_desc, plate_palette=plate_palette,
+        coherence=coherence, recursion=recursion, grain=grain, line_wobble=line_wobble,
+        erasure=erasure, annotation=annotation, contrast=contrast, whiteness=whiteness,
+    )
+
+def _state_defaults(i: int, n: int) -> Dict[str, Any]:
+    t = i / max(1, n - 1)
+    if t < 0.17:
+        return dict(label="ANCHOR", comp="centered", flow="stable horizon", transition="slip", time="normal")
+    if t < 0.33:
+        return dict(label="POROUS", comp="radial seep", flow="soft drift", transition="drift", time="slowed")
+    if t < 0.50:
+        return dict(label="WATCHER", comp="top-down pressure", flow="compression", transition="paralysis", time="stretched")
+    if t < 0.67:
+        return dict(label="COLLAPSE", comp="diagonal fall-lines", flow="gravity vectors", transition="collapse", time="fragmented")
+    if t < 0.84:
+        return dict(label="BLOOM", comp="spiral recursion", flow="nested rings", transition="loop", time="suspended")
+    return dict(label="RETURN", comp="evidence grid", flow="partial closure", transition="return", time="normal")
+
+
+# Lookup tables for the pure default ladders above. compute_state hits these
+# once per state; h is always clamped to 0–100 and series rarely exceed 20
+# steps, so both fit in small tables built at import. Entries are read-only
+# views shared between states.
+TABLE_MAX_STEPS = 20
+
+_AUTO_COLOR_TABLE: Dict[int, Tuple[str, str]] = {h: _auto_color_map(h) for h in range(101)}
+_DEFAULT_H_TABLE: Dict[int, Mapping[str, Any]] = {h: MappingProxyType(_default_from_h(h)) for h in range(101)}
+_STATE_DEFAULTS_TABLE: Dict[Tuple[int, int], Mapping[str, Any]] = {
+    (i, n): MappingProxyType(_state_defaults(i, n))
+    for n in range(1, TABLE_MAX_STEPS + 1) for i in range(n)
+}
+_use_tables = True
+
+def use_default_tables(enabled: bool = True) -> bool:
+    """Switch between table lookups and direct computation; returns the previous setting.
+
+    Both paths give equal values; this exists so benchmarks can compare them.
+    """
+    global _use_tables
+    prev = _use_tables
+    _use_tables = bool(enabled)
+    return prev
+
+def auto_color_map(h: int) -> Tuple[str, str]:
+    if _use_tables:
+        hit = _AUTO_COLOR_TABLE.get(h)
+        if hit is not None:
+            return hit
+    return _auto_color_map(h)
+
+def default_from_h(h: int) -> Mapping[str, Any]:
+    if _use_tables:
+        hit = _DEFAULT_H_TABLE.get(h)
+        if hit is not None:
+            return hit
+    return _default_from_h(h)
+
+def state_defaults(i: int, n: int) -> Mapping[str, Any]:
+    if _use_tables:
+        hit = _STATE_DEFAULTS_TABLE.get((i, n))
+        if hit is not None:
+            return hit
+    return _state_defaults(i, n)
+
+def resolve(user_val: Any, default_val: Any) -> Any:
+    if user_val is SKIP:
+        return SKIP
+    if user_val is None:
+        return None
+    if user_val == "":
+        return default_val
+    return user_val
+
+
+# -----------------------------
+# Form Model
+# -----------------------------
+@dataclass
+class Humanizer:
+    level: Union[int, None, object, str] = ""
+    qualities: Dict[str, bool] = field(default_factory=lambda: {k: False for k, _ in HUMANIZER_QUALITIES})
+    notes: Union[str, None, object] = ""
+
+@dataclass
+class Painting:
+    influence: Union[str, None, object] = "NONE"
+    strength: Union[int, None, object, str] = ""
+    notes: Union[str, None, object] = ""
+
+@dataclass
+class Evolve:
+    enabled: bool = True
+    steps: Union[int, None, object, str] = "6"
+    path: Union[str, None, object] = ""
+    output: Union[str, None, object] = "staged"
+    focus: Union[str, None, object] = "total"
+    start_h: Union[int, None, object, str] = ""
+    end_h: Union[int, None, object, str] = ""
+    curve: Union[str, None, object] = "s-curve"
+    lock_anchor: Union[str, None, object] = "gesture+material"
+
+@dataclass
+class Mutate:
+    enabled: bool = False
+    strength: Union[int, None, object, str] = ""
+    drift: Union[str, None, object] = ""
+    velocity: Union[str, None, object] = ""
+    scope: Union[str, None, object] = ""
+    mode: Union[str, None, object] = ""
+    anchor: Union[str, None, object] = "gesture"
+    decay: Union[str, None, object] = "erode"
+    bifurcation: Union[str, None, object] = ""
+
+@dataclass
+class Form:
+    mode: str = "FULL"
+    subject: str = ""
+    style_tokens: str = ""
+    notes: str = ""
+
+    vibe_description: str = ""
+    vibe_image_list: str = ""
+
+    hallucination: Union[int, None, object, str] = "72"
+    temporal: Union[int, None, object, str] = ""
+    material: Union[int, None, object, str] = ""
+    space: Union[int, None, object, str] = ""
+    symbol: Union[int, None, object, str] = ""
+    agency: Union[int, None, object, str] = ""
+    saturation: Union[str, None, object] = ""
+    motion: Union[str, None, object] = ""
+    form: Union[str, None, object] = ""
+    media: Union[str, None, object] = ""
+    palette: Union[str, None, object] = ""
+    surface: Union[str, None, object] = ""
+    coherence: Union[int, None, object, str] = ""
+    recursion: Union[int, None, object, str] = ""
+    grain: Union[int, None, object, str] = ""
+    line_wobble: Union[int, None, object, str] = ""
+    erasure: Union[int, None, object, str] = ""
+    annotation: Union[int, None, object, str] = ""
+
+    state_geometry: Union[str, None, object] = ""
+    transition_mode: Union[str, None, object] = ""
+    state_name_override: Union[str, None, object] = ""
+
+    comp_mode: Union[str, None, object] = "auto"
+    composition: Union[str, None, object] = ""
+    tension: Union[str, None, object] = ""
+    flow: Union[str, None, object] = ""
+    framing: Union[str, None, object] = ""
+    horizon: Union[str, None, object] = ""
+    scale_logic: Union[str, None, object] = ""
+
+    gesture_mode: Union[str, None, object] = "auto"
+    pressure: Union[str, None, object] = ""
+    tempo: Union[str, None, object] = ""
+    jitter: Union[str, None, object] = ""
+    stroke_memory: Union[str, None, object] = ""
+    interruption: Union[str, None, object] = ""
+    hatch_density: Union[str, None, object] = ""
+
+    arcane_enabled: bool = True
+    arcane_mode: Union[str, None, object] = "occult, mythological, symbolic, new weird system"
+
+    sleep_enabled: bool = True
+    neuro_state: Union[str, None, object] = "cataplexy + sleep paralysis + hypnagogia"
+    motor: Union[int, None, object, str] = ""
+    presence: Union[int, None, object, str] = ""
+    visual_drift: Union[int, None, object, str] = ""
+    auditory: Union[str, None, object] = ""
+    affect: Union[str, None, object] = ""
+
+    color_enabled: bool = True
+    color_mode: Union[str, None, object] = "adaptive"
+    color_evolution: Union[str, None, object] = ""
+    palette_lock: Union[str, None, object] = ""
+    contrast: Union[str, None, object] = ""
+    whiteness: Union[str, None, object] = ""
+
+    print_enabled: bool = False
+    plates_enabled: bool = False
+    print_mode: Union[str, None, object] = ""
+    registration: Union[str, None, object] = ""
+    texture: Union[str, None, object] = ""
+    plate_count: Union[int, None, object, str] = ""
+    plate_logic: Union[str, None, object] = ""
+    registration_map: Union[str, None, object] = ""
+    overprint: Union[str, None, object] = ""
+    plate_map: str = ""
+
+    evolve: Evolve = field(default_factory=Evolve)
+    mutate: Mutate = field(default_factory=Mutate)
+    humanizer: Humanizer = field(default_factory=Humanizer)
+    painting: Painting = field(default_factory=Painting)
+
+    inject_symbols: bool = False
+    symbols_per_state: int = 3
+    symbols_weighted: bool = False
+    symbols_no_repeat: bool = False
+    seed: Optional[int] = None  # None = unseeded (global random module)
+
+
+_NESTED = {"evolve": Evolve, "mutate": Mutate, "humanizer": Humanizer, "painting": Painting}
+
+# fields whose annotation admits the SKIP object (Union[..., object, ...]);
+# plain str fields such as subject or notes keep "skip" as text
+_SKIPPABLE = {
+    cls: frozenset(f.name for f in fields(cls) if "object" in str(f.type))
+    for cls in (Form, Evolve, Mutate, Humanizer, Painting)
+}
+
+def _from_json_value(v: Any) -> Any:
+    # JSON has no SKIP sentinel: "SKIP"/"__SKIP__" map back onto the SKIP object
+    if isinstance(v, str) and v.strip().upper() in ("SKIP", SKIP):
+        return SKIP
+    return v
+
+_FIELD_TYPES = {cls: {f.name: str(f.type) for f in fields(cls)} for cls in _SKIPPABLE}
+
+def _is_int(v: Any) -> bool:
+    return isinstance(v, int) and not isinstance(v, bool)
+
+def check_field(obj: Any, name: str, v: Any, where: str) -> Any:
+    """`v` if it fits field `name` of `obj`, else ValueError naming `where + name`.
+
+    Text fields take str, flags bool; int cells take an int, a string of
+    digits or "" (auto), and like the other cells NONE/SKIP where allowed.
+    """
+    t = _FIELD_TYPES[type(obj)][name]
+    if t == "str":
+        ok = isinstance(v, str)
+    elif v is None:
+        ok = "None" in t or t.startswith("Optional")
+    elif v is SKIP:
+        ok = "object" in t
+    elif t == "bool":
+        ok = isinstance(v, bool)
+    elif t in ("int", "Optional[int]"):
+        ok = _is_int(v)
+    elif t.startswith("Union[int"):
+        ok = _is_int(v) or (isinstance(v, str) and (not v.strip() or v.strip().lstrip("+-").isdigit()))
+    else:  # str cells
+        ok = isinstance(v, str)
+    if not ok:
+        raise ValueError(f"field {where + name!r} does not accept {v!r}")
+    return v
+
+def _fill(obj: Any, data: Dict[str, Any], where: str) -> None:
+    names = {f.name for f in fields(obj)}
+    skippable = _SKIPPABLE[type(obj)]
+    for k, v in data.items():
+        if k not in names:
+            raise ValueError(f"unknown field {where + k!r}")
+        if k in _NESTED:
+            if not isinstance(v, dict):
+                raise ValueError(f"field {where + k!r} must be an object")
+            _fill(getattr(obj, k), v, f"{where}{k}.")
+        elif k == "qualities":
+            if not isinstance(v, dict):
+                raise ValueError(f"field {where + k!r} must be an object")
+            if not all(isinstance(on, bool) for on in v.values()):
+                raise ValueError(f"field {where + k!r} must map qualities to true/false")
+            obj.qualities.update(v)
+        else:
+            setattr(obj, k, check_field(obj, k, _from_json_value(v) if k in skippable else v, where))
+
+def form_from_dict(data: Dict[str, Any]) -> Form:
+    """Build a Form from a JSON object; missing keys keep the GUI defaults.
+
+    null means NONE and "SKIP" means SKIP in fields that accept it, mirroring
+    the GUI's input conventions; plain text fields keep the string as typed.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("form must be a JSON object")
+    f = Form()
+    _fill(f, data, "")
+    return f
+
+def form_to_dict(form: Form) -> Dict[str, Any]:
+    return asdict(form)
+
+
+# -----------------------------
+# Engine
+# -----------------------------
+def _base_h(form: Form) -> int:
+    base_h_user = form.hallucination
+    if isinstance(base_h_user, int):
+        return base_h_user
+    if isinstance(base_h_user, str) and base_h_user.strip().isdigit():
+        return int(base_h_user.strip())
+    return 70
+
+def _curve_params(form: Form, n: int) -> Optional[Tuple[int, int, str]]:
+    # (start_h, end_h, curve) when the series evolves, else None
+    base_h = _base_h(form)
+    sh = resolve(form.evolve.start_h, clamp(base_h - 20))
+    eh = resolve(form.evolve.end_h, clamp(base_h + 20))
+    cv = resolve(form.evolve.curve, "s-curve")
+    if form.evolve.enabled and isinstance(sh, int) and isinstance(eh, int) and n > 1:
+        return sh, eh, str(cv)
+    return None
+
+def iter_hallucination(form: Form, n: int, chunk: int = 256) -> Iterator[int]:
+    """Effective hallucination for each state of an n-step series, evaluated
+    `chunk` steps at a time so long series never hold the whole schedule."""
+    params = _curve_params(form, n)
+    if params is None:
+        yield from itertools.repeat(clamp(_base_h(form)), n)
+        return
+    sh, eh, cv = params
+    d = max(1, n - 1)
+    for start in range(0, n, chunk):
+        ts = [i / d for i in range(start, min(n, start + chunk))]
+        for tt in curve_values(cv, ts, use_numpy=False):
+            yield clamp(int(sh + (eh - sh) * tt))
+
+def hallucination_schedule(form: Form, n: int) -> List[int]:
+    """Effective hallucination for every state of an n-step series."""
+    return list(iter_hallucination(form, n))
+
+def compute_state(
+    form: Form,
+    i: int,
+    n: int,
+    lex: Mapping[str, Any],
+    h: Optional[int] = None,
+    used_symbols: Optional[Set[str]] = None,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """Resolve state i of n. `h` skips the hallucination curve when the caller
+    already has it from `hallucination_schedule`; `used_symbols` carries the
+    symbols drawn earlier in the series when `symbols_no_repeat` is set;
+    `rng` drives symbol sampling (see `state_rng`)."""
+    if h is None:
+        params = _curve_params(form, n)
+        if params is None:
+            h = clamp(_base_h(form))
+        else:
+            sh, eh, cv = params
+            h = clamp(int(sh + (eh - sh) * curve_value(cv, i / max(1, n - 1))))
+
+    dh = default_from_h(h)
+    sd = state_defaults(i, n)
+
+    state_name = sd["label"]
+    if not is_omitted(form.state_name_override) and str(form.state_name_override).strip():
+        state_name = str(form.state_name_override).strip()
+
+    style_expanded = expand_style_tokens(form.style_tokens)
+
+    injected = []
+    if form.inject_symbols and lex:
+        injected = sample_symbols(
+            lex,
+            k=max(0, int(form.symbols_per_state)),
+            weighted=form.symbols_weighted,
+            exclude=used_symbols if form.symbols_no_repeat else None,
+            rng=rng,
+        )
+
+    hum_level = resolve(form.humanizer.level, clamp(int(25 + 0.60*h)))
+    paint_infl = resolve(form.painting.influence, "NONE")
+    paint_strength = resolve(form.painting.strength, clamp(int(15 + 0.40*h))) if paint_infl != "NONE" else None
+
+    include_subject = form.mode not in ("STYLE","GESTURE","PRINT") and bool(form.subject.strip())
+
+    mutate_enabled = form.mutate.enabled or (form.mode == "LIVE")
+    mutate_strength_default = clamp(int(20 + 0.70*h + 10*(i/max(1,n-1))))
+    mutate_strength = resolve(form.mutate.strength, mutate_strength_default)
+
+    return dict(
+        index=i+1,
+        mode=form.mode,
+        include_subject=include_subject,
+        subject=form.subject.strip(),
+        style_expanded=style_expanded,
+        injected_symbols=injected,
+        vibe_description=form.vibe_description.strip(),
+        vibe_images=form.vibe_image_list.strip(),
+
+        hallucination=resolve(form.hallucination, h),
+        temporal=resolve(form.temporal, dh["temporal"]),
+        material=resolve(form.material, dh["material"]),
+        space=resolve(form.space, dh["space"]),
+        symbol=resolve(form.symbol, dh["symbol"]),
+        agency=resolve(form.agency, dh["agency"]),
+        saturation=resolve(form.saturation, dh["saturation"]),
+        motion=resolve(form.motion, dh["motion"]),
+        form=resolve(form.form, dh["form"]),
+        media=resolve(form.media, dh["media"]),
+        palette=resolve(form.palette, dh["palette"]),
+        surface=resolve(form.surface, dh["surface"]),
+        coherence=resolve(form.coherence, dh["coherence"]),
+        recursion=resolve(form.recursion, dh["recursion"]),
+        grain=resolve(form.grain, dh["grain"]),
+        line_wobble=resolve(form.line_wobble, dh["line_wobble"]),
+        erasure=resolve(form.erasure, dh["erasure"]),
+        annotation=resolve(form.annotation, dh["annotation"]),
+        auto_color=dh["palette_desc"],
+        contrast=resolve(form.contrast, dh["contrast"]),
+        whiteness=resolve(form.whiteness, dh["whiteness"]),
+
+        state_name=state_name,
+        state_geometry=resolve(form.state_geometry, "spiral" if n > 1 else "linear"),
+        transition_mode=resolve(form.transition_mode, "drift" if n > 1 else "continuous"),
+
+        comp_mode=resolve(form.comp_mode, "auto"),
+        composition=resolve(form.composition, sd["comp"]),
+        tension=resolve(form.tension, "high" if h >= 55 else "medium"),
+        flow=resolve(form.flow, sd["flow"]),
+        framing=resolve(form.framing, "tight" if sd["label"] in ("WATCHER","COLLAPSE") else "open"),
+        horizon=resolve(form.horizon, "tilted" if sd["label"] in ("COLLAPSE","BLOOM") else "stable"),
+        scale_logic=resolve(form.scale_logic, "nested" if h >= 60 else "single-plane"),
+
+        gesture_mode=resolve(form.gesture_mode, "auto"),
+        pressure=resolve(form.pressure, "spike" if sd["label"] in ("COLLAPSE","BLOOM") else "pulse"),
+        tempo=resolve(form.tempo, "erratic" if h >= 70 else "moderate"),
+        jitter=resolve(form.jitter, "micro" if h < 60 else "high"),
+        stroke_memory=resolve(form.stroke_memory, "echo" if h >= 55 else "light"),
+        interruption=resolve(form.interruption, "stutter" if sd["label"] in ("WATCHER","COLLAPSE") else "soft"),
+        hatch_density=resolve(form.hatch_density, "dense" if h >= 55 else "balanced"),
+
+        arcane_enabled=form.arcane_enabled,
+        arcane_mode=resolve(form.arcane_mode, "occult, mythological, symbolic, new weird system"),
+
+        sleep_enabled=form.sleep_enabled,
+        neuro_state=resolve(form.neuro_state, "cataplexy + sleep paralysis + hypnagogia"),
+        motor=resolve(form.motor, clamp(int(20 + 0.55*h))),
+        presence=resolve(form.presence, clamp(int(12 + 0.70*h))),
+        visual_drift=resolve(form.visual_drift, clamp(int(15 + 0.60*h))),
+        auditory=resolve(form.auditory, "low hum" if h < 70 else "intrusive signal"),
+        affect=resolve(form.affect, "uncanny" if h < 55 else "dread"),
+
+        color_enabled=form.color_enabled,
+        color_mode=resolve(form.color_mode, "adaptive"),
+        color_evolution=resolve(form.color_evolution, "deepening" if n > 1 else "phase"),
+        palette_lock=resolve(form.palette_lock, ""),
+
+        print_enabled=form.print_enabled or (form.mode == "PRINT"),
+        plates_enabled=form.plates_enabled or (form.mode == "PRINT"),
+        print_mode=resolve(form.print_mode, "riso" if h >= 50 else "hybrid-print"),
+        registration=resolve(form.registration, "loose" if h >= 55 else "slight"),
+        texture=resolve(form.texture, "paper tooth"),
+        plate_count=resolve(form.plate_count, 3 if dh["plate_palette"] in ("duotone","tritone") else 4),
+        plate_logic=resolve(form.plate_logic, "structural" if h < 60 else "symbolic"),
+        registration_map=resolve(form.registration_map, "progressive-drift"),
+        overprint=resolve(form.overprint, "unstable"),
+        plate_map=form.plate_map.strip(),
+
+        evolve_enabled=form.evolve.enabled,
+        evolve_steps=resolve(form.evolve.steps, 6 if form.mode == "LIVE" else 1),
+        evolve_path=resolve(form.evolve.path, "collapse" if form.mode == "LIVE" else "spiral"),
+
+        mutate_enabled=mutate_enabled,
+        mutate_strength=mutate_strength,
+        mutate_drift=resolve(form.mutate.drift, "high" if h >= 55 else "medium"),
+        mutate_velocity=resolve(form.mutate.velocity, "erratic" if h >= 70 else "moderate"),
+        mutate_scope=resolve(form.mutate.scope, "total" if h >= 60 else "spatial"),
+        mutate_mode=resolve(form.mutate.mode, "recursive" if h >= 70 else "organic"),
+        mutate_anchor=resolve(form.mutate.anchor, "gesture"),
+        mutate_decay=resolve(form.mutate.decay, "erode"),
+        mutate_bifurcation=resolve(form.mutate.bifurcation, "bifurcate" if h >= 65 else "minor"),
+
+        humanizer_level=hum_level,
+        humanizer_qualities=form.humanizer.qualities,
+        humanizer_notes=resolve(form.humanizer.notes, ""),
+
+        painting_influence=paint_infl,
+        painting_strength=paint_strength,
+        painting_notes=resolve(form.painting.notes, ""),
+
+        notes=form.notes.strip(),
+    )
+
+def compile_prompt(st: Dict[str, Any]) -> str:
+    out: List[str] = []
+    out.append("HANDRAW-HUMAN")
+
+    if st.get("include_subject"):
+        out.append(f"subject: {st['subject']}")
+
+    if st.get("style_expanded"):
+        out.append(f"style: {st['style_expanded']}")
+
+    vibe_lines: List[Optional[str]] = []
+    if st.get("vibe_description"):
+        vibe_lines.append(f"vibe-description: {st['vibe_description']}")
+    if st.get("vibe_images"):
+        vibe_lines.append("vibe-images-to-attach: " + st["vibe_images"])
+    if vibe_lines:
+        vibe_lines.append("rule: use vibe images for texture/mark/palette/atmosphere only — do not copy composition, figures, or layout.")
+        out.append(block("VIBE-REFERENCE", vibe_lines))
+
+    if st.get("injected_symbols"):
+        out.append("symbol-lexicon-injection: " + ", ".join(st["injected_symbols"]))
+
+    out.append(block("HYPNA-MATRIX", [
+        kv("hallucination", st["hallucination"]),
+        kv("temporal", st["temporal"]),
+        kv("material", st["material"]),
+        kv("space", st["space"]),
+        kv("symbol", st["symbol"]),
+        kv("agency", st["agency"]),
+        kv("saturation", st["saturation"]),
+        kv("motion", st["motion"]),
+        kv("form", st["form"]),
+        kv("media", st["media"]),
+        kv("palette", st["palette"]),
+        kv("surface", st["surface"]),
+        kv("coherence", st["coherence"]),
+        kv("recursion", st["recursion"]),
+        kv("grain", st["grain"]),
+        kv("line-wobble", st["line_wobble"]),
+        kv("erasure", st["erasure"]),
+        kv("annotation", st["annotation"]),
+        kv("auto-color", st["auto_color"]),
+    ]))
+
+    out.append(block("STATE-MAP", [
+        kv("state-name", st["state_name"]),
+        kv("state-geometry", st["state_geometry"]),
+        kv("transition-mode", st["transition_mode"]),
+    ]))
+
+    out.append(block("COMPOSITION", [
+        kv("comp-mode", st["comp_mode"]),
+        kv("composition", st["composition"]),
+        kv("tension", st["tension"]),
+        kv("flow", st["flow"]),
+        kv("framing", st["framing"]),
+        kv("horizon", st["horizon"]),
+        kv("scale-logic", st["scale_logic"]),
+    ]))
+
+    out.append(block("GESTURE", [
+        kv("gesture-mode", st["gesture_mode"]),
+        kv("pressure", st["pressure"]),
+        kv("tempo", st["tempo"]),
+        kv("jitter", st["jitter"]),
+        kv("stroke-memory", st["stroke_memory"]),
+        kv("interruption", st["interruption"]),
+        kv("hatch-density", st["hatch_density"]),
+    ]))
+
+    if st.get("arcane_enabled"):
+        out.append(block("ARCANE-LAYER", [
+            kv("arcane-mode", st["arcane_mode"]),
+        ]))
+
+    if st.get("sleep_enabled"):
+        out.append(block("SLEEP-STATE", [
+            kv("neuro-state", st["neuro_state"]),
+            kv("motor", st["motor"]),
+            kv("presence", st["presence"]),
+            kv("visual-drift", st["visual_drift"]),
+            kv("auditory", st["auditory"]),
+            kv("affect", st["affect"]),
+        ]))
+
+    if st.get("color_enabled"):
+        out.append(block("AUTO-COLOR", [
+            kv("mode", st["color_mode"]),
+            kv("evolution", st["color_evolution"]),
+            kv("palette-lock", st["palette_lock"]),
+            kv("contrast", st["contrast"]),
+            kv("whiteness", st["whiteness"]),
+        ]))
+
+    q_on = [label for key, label in HUMANIZER_QUALITIES if st["humanizer_qualities"].get(key)]
+    out.append(block("HUMANIZER", [
+        kv("humanizer-level(0-100)", st["humanizer_level"]),
+        ("qualities: " + ", ".join(q_on)) if q_on else None,
+        kv("humanizer-notes", st["humanizer_notes"]),
+    ]))
+
+    if st.get("painting_influence") and st["painting_influence"] != "NONE":
+        out.append(block("PAINTING-INFLUENCE", [
+            kv("influence", st["painting_influence"]),
+            kv("strength(0-100)", st["painting_strength"]),
+            kv("notes", st["painting_notes"]),
+            "rule: influence is about mark-energy + material behavior, not copying any single painting.",
+        ]))
+
+    if st.get("evolve_enabled"):
+        out.append(block("AUTO-EVOLVE", [
+            kv("steps", st["evolve_steps"]),
+            kv("path", st["evolve_path"]),
+        ]))
+
+    if st.get("mutate_enabled"):
+        out.append(block("AUTO-MUTATE", [
+            kv("strength(0-100)", st["mutate_strength"]),
+            kv("drift", st["mutate_drift"]),
+            kv("velocity", st["mutate_velocity"]),
+            kv("scope", st["mutate_scope"]),
+            kv("mode", st["mutate_mode"]),
+        ]))
+
+    if st.get("print_enabled"):
+        out.append(block("PRINT-LAYER", [
+            kv("print-mode", st["print_mode"]),
+            kv("registration", st["registration"]),
+            kv("texture", st["texture"]),
+        ]))
+
+    if st.get("plates_enabled"):
+        plate_lines = [
+            kv("plate-count", st["plate_count"]),
+            kv("plate-logic", st["plate_logic"]),
+            kv("registration-map", st["registration_map"]),
+            kv("overprint", st["overprint"]),
+        ]
+        pm = st.get("plate_map", "")
+        if pm:
+            plate_lines.append("plate-map:")
+            for ln in str(pm).splitlines():
+                if ln.strip():
+                    plate_lines.append("  " + ln.strip())
+        out.append(block("PLATE-GEN", plate_lines))
+
+    if st.get("notes"):
+        out.append("notes: " + st["notes"])
+
+    return "\n\n".join([x for x in out if x and str(x).strip()])
+
+
+# -----------------------------
+# Precompiled prompt templates
+# -----------------------------
+# compile_prompt above is the reference renderer. render_prompt produces the
+# same bytes, but resolves block layout and key names once per prompt "shape"
+# (which optional blocks/lines are on) and then fills values in one pass.
+_TEXT, _FIELD, _JOINED, _BLOCK = range(4)
+_KV, _LINE, _QUALITIES, _PLATE_MAP = range(4)
+
+def _kvs(*pairs: str) -> List[Tuple[int, str, str]]:
+    # ("line-key", "state_key") pairs -> KV ops with the "key: " prefix baked in
+    return [(_KV, f"{pairs[j]}: ", pairs[j + 1]) for j in range(0, len(pairs), 2)]
+
+def prompt_shape(st: Dict[str, Any]) -> Tuple[bool, ...]:
+    """The state flags that decide which blocks compile_prompt emits."""
+    return (
+        bool(st.get("include_subject")),
+        bool(st.get("style_expanded")),
+        bool(st.get("vibe_description")),
+        bool(st.get("vibe_images")),
+        bool(st.get("injected_symbols")),
+        bool(st.get("arcane_enabled")),
+        bool(st.get("sleep_enabled")),
+        bool(st.get("color_enabled")),
+        bool(st.get("painting_influence") and st["painting_influence"] != "NONE"),
+        bool(st.get("evolve_enabled")),
+        bool(st.get("mutate_enabled")),
+        bool(st.get("print_enabled")),
+        bool(st.get("plates_enabled")),
+        bool(st.get("notes")),
+    )
+
+@lru_cache(maxsize=1024)
+def prompt_template(shape: Tuple[bool, ...]) -> Tuple[Tuple[int, str, Any], ...]:
+    (subject, style, vibe_desc, vibe_imgs, symbols, arcane, sleep, color,
+     painting, evolve, mutate, print_, plates, notes) = shape
+    t: List[Tuple[int, str, Any]] = [(_TEXT, "HANDRAW-HUMAN", None)]
+    if subject:
+        t.append((_FIELD, "subject: ", "subject"))
+    if style:
+        t.append((_FIELD, "style: ", "style_expanded"))
+    if vibe_desc or vibe_imgs:
+        ops: List[Tuple[int, str, str]] = []
+        if vibe_desc:
+            ops += _kvs("vibe-description", "vibe_description")
+        if vibe_imgs:
+            ops += _kvs("vibe-images-to-attach", "vibe_images")
+        ops.append((_LINE, "rule: use vibe images for texture/mark/palette/atmosphere only — do not copy composition, figures, or layout.", ""))
+        t.append((_BLOCK, "VIBE-REFERENCE", tuple(ops)))
+    if symbols:
+        t.append((_JOINED, "symbol-lexicon-injection: ", "injected_symbols"))
+    t.append((_BLOCK, "HYPNA-MATRIX", tuple(_kvs(
+        "hallucination", "hallucination", "temporal", "temporal", "material", "material",
+        "space", "space", "symbol", "symbol", "agency", "agency", "saturation", "saturation",
+        "motion", "motion", "form", "form", "media", "media", "palette", "palette",
+        "surface", "surface", "coherence", "coherence", "recursion", "recursion",
+        "grain", "grain", "line-wobble", "line_wobble", "erasure", "erasure",
+        "annotation", "annotation", "auto-color", "auto_color",
+    ))))
+    t.append((_BLOCK, "STATE-MAP", tuple(_kvs(
+        "state-name", "state_name", "state-geometry", "state_geometry", "transition-mode", "transition_mode",
+    ))))
+    t.append((_BLOCK, "COMPOSITION", tuple(_kvs(
+        "comp-mode", "comp_mode", "composition", "composition", "tension", "tension", "flow", "flow",
+        "framing", "framing", "horizon", "horizon", "scale-logic", "scale_logic",
+    ))))
+    t.append((_BLOCK, "GESTURE", tuple(_kvs(
+        "gesture-mode", "gesture_mode", "pressure", "pressure", "tempo", "tempo", "jitter", "jitter",
+        "stroke-memory", "stroke_memory", "interruption", "interruption", "hatch-density", "hatch_density",
+    ))))
+    if arcane:
+        t.append((_BLOCK, "ARCANE-LAYER", tuple(_kvs("arcane-mode", "arcane_mode"))))
+    if sleep:
+        t.append((_BLOCK, "SLEEP-STATE", tuple(_kvs(
+            "neuro-state", "neuro_state", "motor", "motor", "presence", "presence",
+            "visual-drift", "visual_drift", "auditory", "auditory", "affect", "affect",
+        ))))
+    if color:
+        t.append((_BLOCK, "AUTO-COLOR", tuple(_kvs(
+            "mode", "color_mode", "evolution", "color_evolution", "palette-lock", "palette_lock",
+            "contrast", "contrast", "whiteness", "whiteness",
+        ))))
+    t.append((_BLOCK, "HUMANIZER", tuple(
+        _kvs("humanizer-level(0-100)", "humanizer_level")
+        + [(_QUALITIES, "qualities: ", "humanizer_qualities")]
+        + _kvs("humanizer-notes", "humanizer_notes")
+    )))
+    if painting:
+        t.append((_BLOCK, "PAINTING-INFLUENCE", tuple(
+            _kvs("influence", "painting_influence", "strength(0-100)", "painting_strength", "notes", "painting_notes")
+            + [(_LINE, "rule: influence is about mark-energy + material behavior, not copying any single painting.", "")]
+        )))
+    if evolve:
+        t.append((_BLOCK, "AUTO-EVOLVE", tuple(_kvs("steps", "evolve_steps", "path", "evolve_path"))))
+    if mutate:
+        t.append((_BLOCK, "AUTO-MUTATE", tuple(_kvs(
+            "strength(0-100)", "mutate_strength", "drift", "mutate_drift", "velocity", "mutate_velocity",
+            "scope", "mutate_scope", "mode", "mutate_mode",
+        ))))
+    if print_:
+        t.append((_BLOCK, "PRINT-LAYER", tuple(_kvs(
+            "print-mode", "print_mode", "registration", "registration", "texture", "texture",
+        ))))
+    if plates:
+        t.append((_BLOCK, "PLATE-GEN", tuple(
+            _kvs("plate-count", "plate_count", "plate-logic", "plate_logic",
+                 "registration-map", "registration_map", "overprint", "overprint")
+            + [(_PLATE_MAP, "plate-map:", "plate_map")]
+        )))
+    if notes:
+        t.append((_FIELD, "notes: ", "notes"))
+    return tuple(t)
+
+def render_op(op: Tuple[int, str, Any], st: Dict[str, Any]) -> Optional[str]:
+    """Text of one template op (a block or top-level line) for st; None if it renders empty."""
+    kind, a, b = op
+    if kind == _BLOCK:
+        lines = [a]
+        for o, p, k in b:
+            if o == _KV:
+                v = st[k]
+                if v is None or v is SKIP or v == "":
+                    continue
+                lines.append(f"{p}{v}")
+            elif o == _LINE:
+                lines.append(p)
+            elif o == _QUALITIES:
+                q = st[k]
+                q_on = [label for key, label in HUMANIZER_QUALITIES if q.get(key)]
+                if q_on:
+                    lines.append(p + ", ".join(q_on))
+            else:  # _PLATE_MAP
+                pm = st.get(k, "")
+                if pm:
+                    lines.append(p)
+                    lines.extend("  " + ln.strip() for ln in str(pm).splitlines() if ln.strip())
+        return "\n".join(lines) if len(lines) > 1 else None
+    if kind == _FIELD:
+        return f"{a}{st[b]}"
+    if kind == _JOINED:
+        return a + ", ".join(st[b])
+    return a
+
+def op_name(op: Tuple[int, str, Any]) -> str:
+    """Stable name of a template op: the block title, or the state key of a top-level line."""
+    kind, a, b = op
+    return b if kind in (_FIELD, _JOINED) else a
+
+def op_keys(op: Tuple[int, str, Any]) -> Tuple[str, ...]:
+    """State keys an op reads."""
+    kind, a, b = op
+    if kind == _BLOCK:
+        return tuple(k for o, p, k in b if o != _LINE)
+    if kind in (_FIELD, _JOINED):
+        return (b,)
+    return ()
+
+def render_prompt(st: Dict[str, Any]) -> str:
+    """Byte-identical to compile_prompt(st), via the cached template for st's shape."""
+    out: List[str] = []
+    for op in prompt_template(prompt_shape(st)):
+        text = render_op(op, st)
+        if text is not None:
+            out.append(text)
+    return "\n\n".join(out)
+
+MAX_STEPS = 20
+LIVE_MAX_STEPS = 5000
+
+def series_length(form: Form, max_steps: int = MAX_STEPS) -> int:
+    if not form.evolve.enabled:
+        return 1
+    sv = form.evolve.steps
+    if sv in (None, SKIP, ""):
+        return 6 if form.mode == "LIVE" else 1
+    return max(1, min(max_steps, int(sv)))
+
+def derive_seed(seed: int, index: int) -> int:
+    """Stable 64-bit seed for substream `index` of `seed`."""
+    digest = hashlib.blake2b(f"{seed}:{index}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def state_rng(seed: int, i: int) -> random.Random:
+    """Independent RNG for state i of a series seeded with `seed`."""
+    return random.Random(derive_seed(seed, i))
+
+def _effective_seed(form: Form, seed: Optional[int]) -> Optional[int]:
+    return seed if seed is not None else form.seed
+
+def iter_series(
+    form: Form,
+    lex: Mapping[str, Any],
+    max_steps: int = MAX_STEPS,
+    seed: Optional[int] = None,
+    compact: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Yield compiled states one at a time; memory stays flat however long the series.
+
+    With a seed (argument, else `form.seed`) every state samples from its own
+    substream, so any frame can be rebuilt alone with `series_state`.
+    `compact=True` yields slotted `State` records instead of dicts, for
+    callers that keep long series around.
+    """
+    steps = series_length(form, max_steps)
+    s = _effective_seed(form, seed)
+    lex = indexed_lexicon(lex)
+    used: Set[str] = set()
+    for i, h in enumerate(iter_hallucination(form, steps)):
+        rng = state_rng(s, i) if s is not None else None
+        st = compute_state(form, i, steps, lex, h=h, used_symbols=used, rng=rng)
+        st["prompt"] = render_prompt(st)
+        yield State(st) if compact else st
+
+def generate_series(
+    form: Form,
+    lex: Mapping[str, Any],
+    max_steps: int = MAX_STEPS,
+    seed: Optional[int] = None,
+    compact: bool = False,
+) -> List[Dict[str, Any]]:
+    return list(iter_series(form, lex, max_steps, seed, compact))
+
+def series_state(
+    form: Form,
+    i: int,
+    lex: Mapping[str, Any],
+    max_steps: int = MAX_STEPS,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """State i (0-based) of the seeded series, without computing earlier frames.
+
+    Matches `iter_series` exactly unless `symbols_no_repeat` is on, which
+    depends on the symbols drawn by the frames before it.
+    """
+    steps = series_length(form, max_steps)
+    if not 0 <= i < steps:
+        raise IndexError(f"state {i} out of range for a {steps}-step series")
+    s = _effective_seed(form, seed)
+    rng = state_rng(s, i) if s is not None else None
+    st = compute_state(form, i, steps, lex, rng=rng)
+    st["prompt"] = render_prompt(st)
+    return st
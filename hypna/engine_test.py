@@ -0,0 +1,162 @@
+import sys
+
+from hypna.engine import (
+    SKIP, Evolve, Form, compile_prompt, compute_state, form_from_dict, form_to_dict, format_cell, generate_series,
+    parse_cell, parse_int_cell,
+)
+
+
+def test_engine_import_does_not_pull_in_tk():
+    assert "tkinter" not in sys.modules
+
+
+def test_form_from_dict_maps_sentinels_and_nested_fields():
+    f = form_from_dict({
+        "temporal": "SKIP",
+        "motion": None,
+        "evolve": {"steps": 3, "curve": "linear"},
+        "humanizer": {"qualities": {"smudge": True}},
+    })
+    assert f.temporal is SKIP
+    assert f.motion is None
+    assert f.evolve.steps == 3 and f.evolve.curve == "linear"
+    assert f.humanizer.qualities["smudge"] is True
+    assert f.humanizer.qualities["redraws"] is False
+
+
+def test_form_from_dict_keeps_skip_text_in_plain_str_fields():
+    f = form_from_dict({"subject": "skip", "notes": "SKIP", "mode": "FULL", "temporal": "Skip"})
+    assert f.subject == "skip" and f.notes == "SKIP" and f.temporal is SKIP
+    prompt = generate_series(f, {})[0]["prompt"]
+    assert "subject: skip" in prompt.lower() and SKIP not in prompt
+
+
+def test_form_from_dict_rejects_unknown_fields():
+    try:
+        form_from_dict({"evolve": {"stepz": 2}})
+    except ValueError as e:
+        assert "evolve.stepz" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_form_from_dict_rejects_values_of_the_wrong_type():
+    bad = [("subject", {"subject": None}), ("notes", {"notes": 5}), ("evolve.steps", {"evolve": {"steps": [2]}}),
+           ("evolve.steps", {"evolve": {"steps": "six"}}), ("inject_symbols", {"inject_symbols": "yes"}),
+           ("symbols_per_state", {"symbols_per_state": None}),
+           ("humanizer.qualities", {"humanizer": {"qualities": {"smudge": 1}}})]
+    for name, data in bad:
+        try:
+            form_from_dict(data)
+        except ValueError as e:
+            assert repr(name) in str(e), e
+        else:
+            raise AssertionError(f"expected ValueError for {data}")
+    f = form_from_dict({"evolve": {"steps": " 4 "}, "hallucination": "", "seed": None, "motor": 30})
+    assert f.evolve.steps == " 4 " and f.hallucination == "" and f.motor == 30
+
+
+def test_form_dict_round_trip():
+    f = form_from_dict({"space": "SKIP", "painting": {"influence": None}})
+    assert form_from_dict(form_to_dict(f)) == f
+
+
+def test_format_cell_inverts_parse_cell():
+    for v in ("", SKIP, None, "riso"):
+        assert parse_cell(format_cell(v)) == v
+    assert parse_int_cell(format_cell(72)) == 72
+    assert parse_cell(format_cell(SKIP)) is SKIP and parse_cell(format_cell(None)) is None
+
+
+def test_skip_omits_line_and_default_series_length():
+    f = Form(temporal=SKIP)
+    series = generate_series(f, {})
+    assert len(series) == 6
+    assert "temporal:" not in series[0]["prompt"]
+    assert series[0]["prompt"] == compile_prompt(compute_state(f, 0, 6, {}))
+
+
+def test_default_tables_match_direct_computation():
+    from hypna.engine import auto_color_map, default_from_h, state_defaults, use_default_tables
+
+    tabled = [(auto_color_map(h), dict(default_from_h(h))) for h in range(101)]
+    tabled_sd = [dict(state_defaults(i, n)) for n in range(1, 25) for i in range(n)]
+    prev = use_default_tables(False)
+    try:
+        assert prev is True
+        assert tabled == [(auto_color_map(h), default_from_h(h)) for h in range(101)]
+        assert tabled_sd == [state_defaults(i, n) for n in range(1, 25) for i in range(n)]
+    finally:
+        use_default_tables(prev)
+
+
+def test_default_tables_are_read_only():
+    from hypna.engine import default_from_h
+
+    try:
+        default_from_h(50)["temporal"] = 0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("table entries must be immutable")
+
+
+def test_curve_values_matches_scalar_curve_value():
+    from hypna.engine import CURVES, curve_value, curve_values
+
+    ts = [-0.5] + [i / 37 for i in range(38)] + [1.5]
+    for c in CURVES + ["SIGMOID ", "bogus", ""]:
+        assert curve_values(c, ts, use_numpy=False) == [curve_value(c, t) for t in ts]
+
+
+def test_hallucination_schedule_matches_per_state_resolution():
+    from hypna.engine import CURVES, hallucination_schedule
+
+    for c in CURVES:
+        f = Form(hallucination="", evolve=Evolve(curve=c, start_h=5, end_h=95))
+        sched = hallucination_schedule(f, 13)
+        assert sched == [compute_state(f, i, 13, {})["hallucination"] for i in range(13)]
+        assert [compute_state(f, i, 13, {}, h=h) for i, h in enumerate(sched)] == [
+            compute_state(f, i, 13, {}) for i in range(13)
+        ]
+
+
+def test_iter_series_lifts_cap_and_matches_generate_series():
+    from hypna.engine import MAX_STEPS, iter_series
+
+    f = Form(evolve=Evolve(steps=3000))
+    assert len(generate_series(f, {})) == MAX_STEPS
+    n = 0
+    last = None
+    for st in iter_series(f, {}, max_steps=5000):
+        n += 1
+        last = st
+    assert n == 3000 and last["index"] == 3000
+    f.evolve.steps = 9
+    assert list(iter_series(f, {}, max_steps=100)) == generate_series(f, {})
+
+
+def test_seeded_series_is_reproducible_and_frames_rebuild_alone():
+    from hypna.engine import series_state
+    from hypna.lexicon import SymbolLexicon
+
+    lex = SymbolLexicon({f"s{i}": f"m{i}" for i in range(200)})
+    f = Form(inject_symbols=True, evolve=Evolve(steps=12))
+    a = generate_series(f, lex, seed=11)
+    assert a == generate_series(f, lex, seed=11)
+    assert a != generate_series(f, lex, seed=12)
+    assert series_state(f, 7, lex, seed=11) == a[7]
+    f.seed = 11
+    assert generate_series(f, lex) == a
+
+
+def test_seeded_sampling_leaves_global_random_alone():
+    import random
+
+    from hypna.lexicon import SymbolLexicon
+
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    generate_series(Form(inject_symbols=True), SymbolLexicon({"a": "b", "c": "d"}), seed=1)
+    assert random.random() == expected
@@ -0,0 +1,132 @@
+"""
+Prompt sheet writers shared by the GUI's Save/Export buttons and the CLI.
+
+Writers consume states lazily (a list or `iter_series`), so a series is
+written as it is compiled and never joined into one big string.
+`open_export` is the sink they write into: buffered, optionally gzip/bz2/xz
+compressed (picked from the file suffix by default) and atomic, so the
+target path only ever holds a complete file.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import itertools
+import lzma
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, Optional
+
+from .engine import BOOTLOADER_TEXT, SYSTEM_FILE_TEXT
+
+STATE_HEADER = "=== STATE {index} ===\n"
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# compression name -> (wrap a binary file for writing, file suffixes)
+COMPRESSIONS: Dict[str, Any] = {
+    "gzip": (lambda f: gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0), (".gz", ".gzip")),
+    "bz2": (lambda f: bz2.BZ2File(f, "wb"), (".bz2",)),
+    "xz": (lambda f: lzma.LZMAFile(f, "wb", preset=6), (".xz", ".lzma")),
+}
+_OPENERS: Dict[str, Callable[..., IO[str]]] = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+def compression_for(path: str) -> Optional[str]:
+    """Compression implied by `path`'s suffix, or None."""
+    lower = path.lower()
+    for name, (_, suffixes) in COMPRESSIONS.items():
+        if lower.endswith(suffixes):
+            return name
+    return None
+
+
+@contextmanager
+def open_export(
+    path: str,
+    compression: Optional[str] = "auto",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    fsync: bool = True,
+) -> Iterator[IO[str]]:
+    """Text sink for an export at `path`.
+
+    Writes go through a `buffer_size` buffer (and the compressor, if any) into
+    a temp file next to `path`; on a clean exit it is flushed, fsynced and
+    renamed over `path`. If the block raises, the temp file is removed and
+    `path` is left as it was. `compression` is "auto" (from the suffix),
+    None, or a key of COMPRESSIONS.
+    """
+    if compression == "auto":
+        compression = compression_for(path)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"unknown compression {compression!r} (expected one of {', '.join(COMPRESSIONS)})")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    raw = open(tmp, "xb", buffering=buffer_size)
+    text: Optional[io.TextIOWrapper] = None
+    try:
+        if compression is None:
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        else:
+            comp = COMPRESSIONS[compression][0](raw)
+            text = io.TextIOWrapper(io.BufferedWriter(comp, buffer_size), encoding="utf-8", newline="")
+        yield text
+        if compression is None:
+            text.flush()
+            text.detach()
+        else:
+            text.close()  # flushes the compressor and writes its trailer; `raw` stays open
+        text = None  # detached or closed: nothing left for the cleanup below
+        raw.flush()
+        if fsync:
+            os.fsync(raw.fileno())
+        raw.close()
+        os.replace(tmp, path)
+    except BaseException:
+        # best-effort cleanup; the caller gets the original error, not ours
+        for close in ((text.close,) if text is not None else ()) + (raw.close,):
+            try:
+                close()
+            except (OSError, ValueError):
+                pass
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def open_export_reader(path: str, compression: Optional[str] = "auto") -> IO[str]:
+    """Open an export written by `open_export` for reading as text."""
+    if compression == "auto":
+        compression = compression_for(path)
+    if compression is None:
+        return open(path, "r", encoding="utf-8", newline="")
+    return _OPENERS[compression](path, "rt", encoding="utf-8", newline="")
+
+
+def write_prompts(f: IO[str], states: Iterable[Dict[str, Any]]) -> int:
+    """Write a prompt sheet; returns the number of states written.
+
+    A single-state series is written as the bare prompt, longer ones as
+    `=== STATE n ===` sections.
+    """
+    it = iter(states)
+    head = list(itertools.islice(it, 2))
+    if len(head) == 1:
+        f.write(head[0]["prompt"])
+        return 1
+    n = 0
+    for st in itertools.chain(head, it):
+        f.write(STATE_HEADER.format(index=st["index"]))
+        f.write(st["prompt"])
+        f.write("\n\n")
+        n += 1
+    return n
+
+
+def write_full_doc(f: IO[str], states: Iterable[Dict[str, Any]]) -> int:
+    """Bootloader + system file followed by the prompt sheet."""
+    f.write(BOOTLOADER_TEXT + "\n\n" + SYSTEM_FILE_TEXT + "\n\n")
+    return write_prompts(f, states)
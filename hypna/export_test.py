@@ -0,0 +1,69 @@
+import gzip
+import io
+import os
+
+import pytest
+
+from hypna.engine import BOOTLOADER_TEXT, Evolve, Form, generate_series, iter_series
+from hypna.export import open_export, open_export_reader, write_full_doc, write_prompts
+
+
+def test_single_state_is_bare_prompt():
+    series = generate_series(Form(evolve=Evolve(enabled=False)), {})
+    buf = io.StringIO()
+    assert write_prompts(buf, series) == 1
+    assert buf.getvalue() == series[0]["prompt"]
+
+
+def test_streams_generator_with_state_headers():
+    f = Form(evolve=Evolve(steps=3))
+    buf = io.StringIO()
+    assert write_full_doc(buf, iter_series(f, {})) == 3
+    text = buf.getvalue()
+    assert text.startswith(BOOTLOADER_TEXT)
+    expected = "".join(f"=== STATE {st['index']} ===\n{st['prompt']}\n\n" for st in generate_series(f, {}))
+    assert text.endswith(expected)
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".txt.gz", ".txt.bz2", ".txt.xz"])
+def test_open_export_round_trips_compressed(tmp_path, suffix):
+    series = generate_series(Form(evolve=Evolve(steps=4)), {})
+    path = str(tmp_path / ("sheet" + suffix))
+    with open_export(path, buffer_size=64) as f:
+        write_prompts(f, series)
+    with open_export_reader(path) as f:
+        text = f.read()
+    buf = io.StringIO()
+    write_prompts(buf, series)
+    assert text == buf.getvalue()
+    assert os.listdir(tmp_path) == ["sheet" + suffix]
+
+
+def test_failed_export_leaves_previous_file(tmp_path):
+    path = tmp_path / "sheet.txt.gz"
+    with open_export(str(path)) as f:
+        f.write("old")
+    with pytest.raises(RuntimeError):
+        with open_export(str(path)) as f:
+            f.write("new, half written")
+            raise RuntimeError("died")
+    assert os.listdir(tmp_path) == ["sheet.txt.gz"]
+    assert gzip.decompress(path.read_bytes()) == b"old"
+    with pytest.raises(ValueError):
+        with open_export(str(path), compression="zip"):
+            pass
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".txt.gz"])
+def test_failed_fsync_removes_temp_file_and_keeps_error(tmp_path, monkeypatch, suffix):
+    import errno
+
+    def no_space(fd):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "fsync", no_space)
+    with pytest.raises(OSError) as e:
+        with open_export(str(tmp_path / ("sheet" + suffix))) as f:
+            f.write("data")
+    assert e.value.errno == errno.ENOSPC
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,283 @@
+"""
+Incremental series compilation for interactive editing.
+
+`FIELD_STATE_KEYS` records which state keys each Form field feeds, and the
+prompt template says which state keys each block reads, so an edit to a
+"local" field re-renders only the blocks it touches and splices them between
+the cached text of the others. Fields that move the hallucination schedule,
+the series length or symbol sampling (`GLOBAL_FIELDS`) recompile everything.
+"""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .engine import (
+    MAX_STEPS,
+    Form,
+    compute_state,
+    expand_style_tokens,
+    iter_hallucination,
+    op_keys,
+    op_name,
+    prompt_shape,
+    prompt_template,
+    render_op,
+    resolve,
+    series_length,
+    state_rng,
+)
+from .lexicon import indexed_lexicon
+
+# Form fields whose change can move every state (h, n, symbols, seed)
+GLOBAL_FIELDS: FrozenSet[str] = frozenset({
+    "mode", "hallucination",
+    "evolve.enabled", "evolve.steps", "evolve.curve", "evolve.start_h", "evolve.end_h",
+    "inject_symbols", "symbols_per_state", "symbols_weighted", "symbols_no_repeat", "seed",
+})
+
+# Form field -> state keys it feeds, where the names differ (or fan out);
+# any other field feeds the state key of the same name
+_FIELD_STATE_OVERRIDES: Dict[str, Tuple[str, ...]] = {
+    "subject": ("subject", "include_subject"),
+    "style_tokens": ("style_expanded",),
+    "vibe_image_list": ("vibe_images",),
+    "state_name_override": ("state_name",),
+    "evolve.path": ("evolve_path",),
+    "mutate.enabled": ("mutate_enabled",),
+    "mutate.strength": ("mutate_strength",),
+    "mutate.drift": ("mutate_drift",),
+    "mutate.velocity": ("mutate_velocity",),
+    "mutate.scope": ("mutate_scope",),
+    "mutate.mode": ("mutate_mode",),
+    "mutate.anchor": ("mutate_anchor",),
+    "mutate.decay": ("mutate_decay",),
+    "mutate.bifurcation": ("mutate_bifurcation",),
+    "humanizer.level": ("humanizer_level",),
+    "humanizer.qualities": ("humanizer_qualities",),
+    "humanizer.notes": ("humanizer_notes",),
+    "painting.influence": ("painting_influence", "painting_strength"),
+    "painting.strength": ("painting_strength",),
+    "painting.notes": ("painting_notes",),
+    # carried on the Form but not read by the engine
+    "evolve.output": (),
+    "evolve.focus": (),
+    "evolve.lock_anchor": (),
+}
+
+
+def _field_paths() -> List[str]:
+    out: List[str] = []
+    for f in fields(Form):
+        nested = f.default_factory() if callable(f.default_factory) else None  # type: ignore[misc]
+        if nested is not None and hasattr(nested, "__dataclass_fields__"):
+            out.extend(f"{f.name}.{g.name}" for g in fields(nested))
+        else:
+            out.append(f.name)
+    return out
+
+
+FIELD_STATE_KEYS: Dict[str, Tuple[str, ...]] = {
+    path: _FIELD_STATE_OVERRIDES.get(path, (path,))
+    for path in _field_paths()
+    if path not in GLOBAL_FIELDS
+}
+
+
+# Fields whose state value is resolve(field, default) with a default that only
+# depends on h, i and n: an edit is patched in without recomputing the state
+RESOLVED_FIELDS: FrozenSet[str] = frozenset(
+    p for p, keys in FIELD_STATE_KEYS.items()
+    if keys and p not in {
+        "subject", "style_tokens", "notes", "vibe_description", "vibe_image_list", "plate_map",
+        "state_name_override", "arcane_enabled", "sleep_enabled", "color_enabled",
+        "print_enabled", "plates_enabled", "mutate.enabled", "humanizer.qualities",
+        "painting.influence", "painting.strength",
+    }
+)
+
+# Fields whose state values are the same plain function of the Form for every state
+_DIRECT: Dict[str, Callable[[Form], Dict[str, Any]]] = {
+    "subject": lambda f: dict(
+        subject=f.subject.strip(),
+        include_subject=f.mode not in ("STYLE", "GESTURE", "PRINT") and bool(f.subject.strip()),
+    ),
+    "style_tokens": lambda f: dict(style_expanded=expand_style_tokens(f.style_tokens)),
+    "notes": lambda f: dict(notes=f.notes.strip()),
+    "vibe_description": lambda f: dict(vibe_description=f.vibe_description.strip()),
+    "vibe_image_list": lambda f: dict(vibe_images=f.vibe_image_list.strip()),
+    "plate_map": lambda f: dict(plate_map=f.plate_map.strip()),
+    "arcane_enabled": lambda f: dict(arcane_enabled=f.arcane_enabled),
+    "sleep_enabled": lambda f: dict(sleep_enabled=f.sleep_enabled),
+    "color_enabled": lambda f: dict(color_enabled=f.color_enabled),
+    "print_enabled": lambda f: dict(print_enabled=f.print_enabled or f.mode == "PRINT"),
+    "plates_enabled": lambda f: dict(plates_enabled=f.plates_enabled or f.mode == "PRINT"),
+    "mutate.enabled": lambda f: dict(mutate_enabled=f.mutate.enabled or f.mode == "LIVE"),
+    "humanizer.qualities": lambda f: dict(humanizer_qualities=f.humanizer.qualities),
+}
+
+
+def _get_path(form: Form, path: str) -> Any:
+    obj: Any = form
+    for p in path.split("."):
+        obj = getattr(obj, p)
+    return obj
+
+
+def _blank_resolved(form: Form) -> Form:
+    # every resolved field left to its default
+    blank = copy.deepcopy(form)
+    for path in RESOLVED_FIELDS:
+        *parents, last = path.split(".")
+        obj: Any = blank
+        for p in parents:
+            obj = getattr(obj, p)
+        setattr(obj, last, "")
+    return blank
+
+
+def state_keys_for_fields(paths: Iterable[str]) -> Optional[Set[str]]:
+    """State keys fed by `paths`, or None if any of them is global."""
+    keys: Set[str] = set()
+    for p in paths:
+        if p in GLOBAL_FIELDS or p not in FIELD_STATE_KEYS:
+            return None
+        keys.update(FIELD_STATE_KEYS[p])
+    return keys
+
+
+_PATHS: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple((p, tuple(p.split("."))) for p in _field_paths())
+
+def _snapshot(form: Form) -> Dict[str, Any]:
+    # flat {dotted path: value}; dict values are copied so later in-place edits show up
+    out: Dict[str, Any] = {}
+    for path, parts in _PATHS:
+        v: Any = form
+        for p in parts:
+            v = getattr(v, p)
+        out[path] = dict(v) if isinstance(v, dict) else v
+    return out
+
+
+@lru_cache(maxsize=1024)
+def _plan(shape: Tuple[bool, ...]) -> Tuple[Tuple[Tuple[int, str, Any], str, FrozenSet[str]], ...]:
+    # (op, name, state keys read) for each op of the shape's template
+    return tuple((op, op_name(op), frozenset(op_keys(op))) for op in prompt_template(shape))
+
+
+class IncrementalSeries:
+    """Recompiles a series after Form edits, re-rendering only touched blocks.
+
+    Output matches `generate_series(form, lex, max_steps, seed)`. Unseeded
+    symbol draws are kept across local edits, so the injected symbols don't
+    reshuffle while unrelated fields change.
+    """
+
+    def __init__(self, lex: Optional[Mapping[str, Any]] = None, max_steps: int = MAX_STEPS,
+                 seed: Optional[int] = None):
+        self.lex = indexed_lexicon(lex) if lex is not None else {}
+        self.max_steps = max_steps
+        self.seed = seed
+        self._fields: Optional[Dict[str, Any]] = None
+        self._hs: List[int] = []
+        self._states: List[Dict[str, Any]] = []
+        self._blocks: List[Dict[str, str]] = []
+        # per state: the default each resolved field falls back to (built lazily)
+        self._defaults: Optional[List[Dict[str, Any]]] = None
+        self.blocks_rendered = 0
+        self.blocks_reused = 0
+
+    def invalidate(self) -> None:
+        """Forget the cached series (e.g. after swapping the lexicon)."""
+        self._fields = None
+
+    def update(self, form: Form) -> List[Dict[str, Any]]:
+        """The compiled series for `form`, reusing whatever the last edit didn't touch."""
+        flat = _snapshot(form)
+        keys: Optional[Set[str]] = None
+        changed: List[str] = []
+        if self._fields is not None:
+            changed = [k for k in flat.keys() | self._fields.keys() if flat.get(k) != self._fields.get(k)]
+            keys = state_keys_for_fields(changed)
+        if keys is None:
+            self._full(form)
+        elif keys:
+            self._partial(form, changed, keys)
+        self._fields = flat
+        return self._states
+
+    def _render(self, st: Dict[str, Any], keys: Optional[Set[str]], old: Mapping[str, str]) -> Dict[str, str]:
+        blocks: Dict[str, str] = {}
+        parts: List[str] = []
+        for op, name, reads in _plan(prompt_shape(st)):
+            if keys is not None and name in old and keys.isdisjoint(reads):
+                text: Optional[str] = old[name]
+                self.blocks_reused += 1
+            else:
+                text = render_op(op, st) or ""
+                self.blocks_rendered += 1
+            blocks[name] = text or ""
+            if text:
+                parts.append(text)
+        st["prompt"] = "\n\n".join(parts)
+        return blocks
+
+    def _full(self, form: Form) -> None:
+        # mirrors iter_series
+        n = series_length(form, self.max_steps)
+        s = self.seed if self.seed is not None else form.seed
+        used: Set[str] = set()
+        hs: List[int] = []
+        states: List[Dict[str, Any]] = []
+        blocks: List[Dict[str, str]] = []
+        for i, h in enumerate(iter_hallucination(form, n)):
+            rng = state_rng(s, i) if s is not None else None
+            st = compute_state(form, i, n, self.lex, h=h, used_symbols=used, rng=rng)
+            blocks.append(self._render(st, None, {}))
+            hs.append(h)
+            states.append(st)
+        self._hs, self._states, self._blocks = hs, states, blocks
+        self._defaults = None
+
+    def _state_defaults(self, form: Form) -> List[Dict[str, Any]]:
+        if self._defaults is None:
+            blank = _blank_resolved(form)
+            n = len(self._states)
+            self._defaults = [
+                {k: st[k] for p in RESOLVED_FIELDS for k in FIELD_STATE_KEYS[p]}
+                for st in (compute_state(blank, i, n, {}, h=h) for i, h in enumerate(self._hs))
+            ]
+        return self._defaults
+
+    def _partial(self, form: Form, changed: List[str], keys: Set[str]) -> None:
+        n = len(self._states)
+        patchable = all(p in RESOLVED_FIELDS or p in _DIRECT or not FIELD_STATE_KEYS[p] for p in changed)
+        direct: Dict[str, Any] = {}
+        resolved: List[Tuple[str, Any]] = []
+        defaults: List[Dict[str, Any]] = []
+        if patchable:
+            for p in changed:
+                if p in _DIRECT:
+                    direct.update(_DIRECT[p](form))
+                elif p in RESOLVED_FIELDS:
+                    resolved.append((FIELD_STATE_KEYS[p][0], _get_path(form, p)))
+            if resolved:
+                defaults = self._state_defaults(form)
+        states: List[Dict[str, Any]] = []
+        blocks: List[Dict[str, str]] = []
+        for i, (h, prev, old) in enumerate(zip(self._hs, self._states, self._blocks)):
+            if patchable:
+                st = dict(prev)
+                st.update(direct)
+                for k, v in resolved:
+                    st[k] = resolve(v, defaults[i][k])
+            else:
+                st = compute_state(form, i, n, {}, h=h)
+                # symbol fields are global, so the previous draw still stands
+                st["injected_symbols"] = prev["injected_symbols"]
+            blocks.append(self._render(st, keys, old))
+            states.append(st)
+        self._states, self._blocks = states, blocks
@@ -0,0 +1,85 @@
+import copy
+
+from hypna.engine import SKIP, Form, compute_state, form_from_dict, generate_series
+from hypna.incremental import FIELD_STATE_KEYS, IncrementalSeries
+from hypna.sweep import _set_path
+
+LEX = {f"sym{i}": f"meaning {i}" for i in range(40)}
+
+
+def _edited(form, path, value):
+    f = copy.deepcopy(form)
+    _set_path(f, path, value)
+    return f
+
+
+def _bump(v):
+    if isinstance(v, bool):
+        return not v
+    if isinstance(v, dict):
+        return {"smudge": True, "ghosting": True}
+    return "7"
+
+
+def test_field_map_covers_every_state_change():
+    base = form_from_dict({"print_enabled": True, "plates_enabled": True, "mutate": {"enabled": True}})
+    for path, keys in FIELD_STATE_KEYS.items():
+        obj = base
+        for p in path.split(".")[:-1]:
+            obj = getattr(obj, p)
+        for value in (_bump(getattr(obj, path.split(".")[-1])), SKIP):
+            edited = _edited(base, path, value)
+            for i in (0, 3):
+                a, b = compute_state(base, i, 6, {}), compute_state(edited, i, 6, {})
+                moved = {k for k in a if a[k] != b[k]}
+                assert moved <= set(keys), (path, moved - set(keys))
+
+
+def test_edits_match_full_recompile():
+    inc = IncrementalSeries(LEX, seed=5)
+    form = form_from_dict({"inject_symbols": True, "evolve": {"steps": 8}})
+    edits = [
+        ("subject", "tide clock"),
+        ("temporal", 40),
+        ("painting.influence", "Rothko-like fields (not imitation)"),
+        ("color_enabled", False),
+        ("hallucination", 30),  # global: full recompile
+        ("plate_map", "K: key"),
+        ("plates_enabled", True),
+        ("humanizer.qualities", {"smudge": True}),
+        ("notes", SKIP),
+    ]
+    for path, value in edits:
+        form = _edited(form, path, value)
+        got = inc.update(form)
+        want = generate_series(form, LEX, seed=5)
+        assert got == want, path
+
+
+def test_every_local_field_patches_like_a_full_recompile():
+    base = form_from_dict({"print_enabled": True, "plates_enabled": True, "evolve": {"steps": 5}})
+    for path in FIELD_STATE_KEYS:
+        inc = IncrementalSeries()
+        inc.update(base)
+        obj = base
+        for p in path.split(".")[:-1]:
+            obj = getattr(obj, p)
+        form = base
+        current = getattr(obj, path.split(".")[-1])
+        for value in (_bump(current),) if isinstance(current, dict) else (_bump(current), SKIP, ""):
+            form = _edited(form, path, value)
+            assert inc.update(form) == generate_series(form, {}), (path, value)
+
+
+def test_local_edit_rerenders_only_touched_blocks():
+    inc = IncrementalSeries()
+    form = Form(subject="moth archive")
+    form.evolve.steps = 20
+    inc.update(form)
+    inc.blocks_rendered = inc.blocks_reused = 0
+    inc.update(_edited(form, "subject", "salt archive"))
+    assert inc.blocks_rendered == 20  # the subject line of each state
+    assert inc.blocks_reused > 0
+    inc.blocks_rendered = 0
+    inc.update(_edited(form, "subject", "salt archive"))
+    assert inc.blocks_rendered == 0  # no change, nothing to do
@@ -0,0 +1,128 @@
+"""
+Background jobs for the GUI.
+
+Work runs on a worker thread; progress and results come back through a queue
+that the UI thread drains with `JobRunner.poll()` (the GUI calls it from
+`root.after`). Jobs of the same kind supersede each other: submitting a new
+one cancels the one in flight and its late results are dropped.
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class Cancelled(Exception):
+    """Raised inside a job by `Job.check()` once it has been cancelled."""
+
+
+class Job:
+    def __init__(self, runner: "JobRunner", job_id: int, kind: str):
+        self.id = job_id
+        self.kind = kind
+        self._runner = runner
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def progress(self, done: int, total: Optional[int] = None) -> None:
+        self._runner._post(self, "progress", (done, total))
+
+
+class JobRunner:
+    def __init__(self, workers: int = 1):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hypna-job")
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._current: Dict[str, Job] = {}
+        self._callbacks: Dict[int, Dict[str, Optional[Callable[..., Any]]]] = {}
+
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[[Job], Any],
+        on_done: Callable[[Any], Any],
+        on_error: Optional[Callable[[BaseException], Any]] = None,
+        on_progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+    ) -> Job:
+        """Run fn(job) in the background; callbacks fire on the polling thread."""
+        prev = self._current.get(kind)
+        if prev is not None:
+            prev.cancel()
+        job = Job(self, next(self._ids), kind)
+        self._current[kind] = job
+        self._callbacks[job.id] = dict(done=on_done, error=on_error, progress=on_progress)
+        self._pool.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        try:
+            job.check()
+            result = fn(job)
+            job.check()
+        except Cancelled:
+            self._post(job, "cancelled", None)
+        except BaseException as e:  # surfaced to the UI, not swallowed
+            self._post(job, "error", e)
+        else:
+            self._post(job, "done", result)
+
+    def _post(self, job: Job, what: str, payload: Any) -> None:
+        self._queue.put((job, what, payload))
+
+    def cancel(self, kind: Optional[str] = None) -> bool:
+        """Cancel the current job of `kind` (or all); True if anything was running."""
+        jobs = list(self._current.values()) if kind is None else [self._current.get(kind)]
+        hit = False
+        for job in jobs:
+            if job is not None and not job.cancelled():
+                job.cancel()
+                hit = True
+        return hit
+
+    def busy(self) -> bool:
+        return any(not j.cancelled() for j in self._current.values())
+
+    def poll(self) -> int:
+        """Dispatch queued messages for live jobs; returns how many were handled."""
+        handled = 0
+        while True:
+            try:
+                job, what, payload = self._queue.get_nowait()
+            except queue.Empty:
+                return handled
+            live = self._current.get(job.kind) is job and not job.cancelled()
+            cbs = self._callbacks.get(job.id, {})
+            if what != "progress":
+                self._callbacks.pop(job.id, None)
+                if self._current.get(job.kind) is job:
+                    del self._current[job.kind]
+            if not live:
+                continue
+            handled += 1
+            if what == "progress":
+                cb = cbs.get("progress")
+                if cb:
+                    cb(*payload)
+            elif what == "done":
+                cbs["done"](payload)
+            elif what == "error":
+                cb = cbs.get("error")
+                if cb:
+                    cb(payload)
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from hypna.jobs import JobRunner
+
+
+def _wait(runner, cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        runner.poll()
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.005)
+
+
+def test_results_and_progress_are_delivered_by_poll():
+    runner = JobRunner()
+    seen, done = [], []
+
+    def work(job):
+        for i in range(3):
+            job.progress(i + 1, 3)
+        return "ok"
+
+    runner.submit("series", work, done.append, on_progress=lambda d, t: seen.append((d, t)))
+    assert done == []  # nothing fires until the UI thread polls
+    _wait(runner, lambda: done)
+    assert done == ["ok"] and seen == [(1, 3), (2, 3), (3, 3)]
+    assert not runner.busy()
+    runner.shutdown()
+
+
+def test_newer_job_supersedes_stale_one():
+    runner = JobRunner()
+    release = threading.Event()
+    done = []
+
+    def slow(job):
+        release.wait(5)
+        job.check()
+        return "stale"
+
+    first = runner.submit("series", slow, done.append)
+    runner.submit("series", lambda job: "fresh", done.append)
+    assert first.cancelled()
+    release.set()
+    _wait(runner, lambda: done)
+    time.sleep(0.05)
+    runner.poll()
+    assert done == ["fresh"]
+    runner.shutdown()
+
+
+def test_cancel_and_errors():
+    runner = JobRunner()
+    errors, done = [], []
+    runner.submit("lexicon", lambda job: {}["missing"], done.append, on_error=errors.append)
+    _wait(runner, lambda: errors)
+    assert isinstance(errors[0], KeyError) and done == []
+
+    started = threading.Event()
+
+    def spin(job):
+        started.set()
+        while True:
+            job.check()
+            time.sleep(0.001)
+
+    runner.submit("series", spin, done.append)
+    started.wait(5)
+    assert runner.cancel() and not runner.busy()
+    time.sleep(0.05)
+    runner.poll()
+    assert done == []
+    runner.shutdown()
@@ -0,0 +1,427 @@
+"""
+Symbol lexicons: loading and per-state sampling.
+
+A lexicon is a JSON object mapping symbol -> meaning. Entries whose value is
+an object may carry a numeric "weight" for weighted sampling, e.g.
+{"eye": "watcher", "moth": {"meaning": "threshold", "weight": 3}}.
+
+Large lexicons can be converted once to a compact, offset-indexed binary file
+(`python -m hypna.lexicon convert lex.json lex.hlex`). MappedLexicon memory-maps
+it and decodes only the entries that get sampled, so startup time and RSS stay
+flat whatever the lexicon size.
+
+Binary layout (little-endian):
+
+    header   magic b"HLEXv1\\0\\0", u64 count, u64 index_pos, u64 weights_pos, u64 data_pos
+    index    count + 1 u64 record offsets (last one is the end of data)
+    weights  count f64 cumulative weights
+    data     per entry, sorted by key bytes: u32 key length, key UTF-8, value JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from abc import abstractmethod
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+_WEIGHT_KEY = "weight"
+
+MAGIC = b"HLEXv1\0\0"
+_HEADER = struct.Struct("<8sQQQQ")
+_OFFSETS = struct.Struct("<QQ")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+
+
+def entry_weight(v: Any) -> float:
+    if isinstance(v, dict):
+        w = v.get(_WEIGHT_KEY)
+        if isinstance(w, (int, float)) and not isinstance(w, bool):
+            return max(0.0, float(w))
+    return 1.0
+
+
+def _fingerprint_items(items: Iterator[Tuple[str, Any]]) -> str:
+    # sha256 of the canonical JSON object, streamed; items must come in key order
+    h = hashlib.sha256(b"{")
+    for j, (k, v) in enumerate(items):
+        if j:
+            h.update(b",")
+        h.update(json.dumps(k, ensure_ascii=False).encode("utf-8"))
+        h.update(b":")
+        h.update(json.dumps(v, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    h.update(b"}")
+    return h.hexdigest()
+
+
+class _IndexedLexicon(Mapping[str, Any]):
+    """Sampling over entries addressed by position; subclasses provide
+    key_at / value_at / cum_weights."""
+
+    _fingerprint: Optional[str] = None
+
+    def fingerprint(self) -> str:
+        """Content hash, equal for the JSON and binary forms of one lexicon.
+
+        Entries are hashed in index order, which is also the order seeded
+        draws address them by, so an equal fingerprint means equal draws.
+        Computed once per object (a full pass over the entries).
+        """
+        if self._fingerprint is None:
+            self._fingerprint = _fingerprint_items((self.key_at(i), self.value_at(i)) for i in range(len(self)))
+        return self._fingerprint
+
+    @abstractmethod
+    def key_at(self, i: int) -> str: ...
+
+    @abstractmethod
+    def value_at(self, i: int) -> Any: ...
+
+    @abstractmethod
+    def cum_weights(self) -> Sequence[float]: ...
+
+    def _draw_index(self, rng: Any, weighted: bool) -> int:
+        n = len(self)
+        if weighted:
+            cum = self.cum_weights()
+            total = cum[-1]
+            if total > 0:
+                return min(n - 1, bisect_right(cum, rng.random() * total))
+        return rng.randrange(n)
+
+    def sample_indices(
+        self,
+        k: int,
+        rng: Any = random,
+        weighted: bool = False,
+        exclude: Optional[Set[str]] = None,
+    ) -> List[int]:
+        """Pick up to k distinct entries in O(k) (expected).
+
+        `exclude` holds keys already used (e.g. earlier in a series); picks are
+        added to it, and once every key has been used the cycle starts over.
+        """
+        n = len(self)
+        if n == 0 or k <= 0:
+            return []
+        k = min(k, n)
+        if exclude is not None and len(exclude) >= n:
+            exclude.clear()
+        picked = self._draw(min(k, n - len(exclude or ())), rng, weighted, set(exclude) if exclude else set())
+        if len(picked) < k:
+            # the cycle ran out mid-draw: start the next one, without
+            # repeating the keys just picked
+            if exclude is not None:
+                exclude.clear()
+            picked += self._draw(k - len(picked), rng, weighted, {self.key_at(i) for i in picked})
+        if exclude is not None:
+            exclude.update(self.key_at(i) for i in picked)
+        return picked
+
+    def _draw(self, k: int, rng: Any, weighted: bool, seen: Set[str]) -> List[int]:
+        # k distinct indices whose keys are not in `seen`; k <= n - len(seen)
+        n = len(self)
+        if not weighted and not seen:
+            return rng.sample(range(n), k)
+        picked: List[int] = []
+        if (n - len(seen)) * 4 < n:
+            # mostly exhausted: rejection would spin, so draw from what's left
+            pool = [i for i in range(n) if self.key_at(i) not in seen]
+            if weighted:
+                ws = [entry_weight(self.value_at(i)) for i in pool]
+                while len(picked) < k and any(ws):
+                    j = rng.choices(range(len(pool)), weights=ws)[0]
+                    picked.append(pool[j])
+                    ws[j] = 0.0
+            if len(picked) < k:
+                rest = [i for i in pool if i not in picked]
+                picked += rng.sample(rest, k - len(picked))
+            return picked
+        misses = 0
+        while len(picked) < k:
+            i = self._draw_index(rng, weighted and misses < 64 * k)
+            key = self.key_at(i)
+            if key in seen:
+                misses += 1
+                continue
+            seen.add(key)
+            picked.append(i)
+        return picked
+
+    def sample_keys(
+        self,
+        k: int,
+        rng: Any = random,
+        weighted: bool = False,
+        exclude: Optional[Set[str]] = None,
+    ) -> List[str]:
+        return [self.key_at(i) for i in self.sample_indices(k, rng, weighted, exclude)]
+
+
+class SymbolLexicon(_IndexedLexicon):
+    """Read-only in-memory lexicon with its key array indexed once, so
+    sampling k symbols costs O(k) instead of O(len(lexicon)).
+
+    Keys are indexed in UTF-8 byte order, the order of a .hlex file, so a
+    seeded draw picks the same symbols from either form of one lexicon.
+    """
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None):
+        self._data: Dict[str, Any] = dict(data or {})
+        self._keys: List[str] = sorted(self._data, key=lambda k: k.encode("utf-8"))
+        self._cum: Optional[List[float]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"SymbolLexicon({len(self)} entries)"
+
+    def key_at(self, i: int) -> str:
+        return self._keys[i]
+
+    def value_at(self, i: int) -> Any:
+        return self._data[self._keys[i]]
+
+    def cum_weights(self) -> List[float]:
+        # built on first weighted draw; unweighted users never pay for it
+        if self._cum is None:
+            self._cum = list(accumulate(entry_weight(self._data[k]) for k in self._keys))
+        return self._cum
+
+
+class _MappedFloats(Sequence[float]):
+    # f64 array view over the mmap, enough for bisect
+    def __init__(self, mm: mmap.mmap, pos: int, n: int):
+        self._mm, self._pos, self._n = mm, pos, n
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return _F64.unpack_from(self._mm, self._pos + 8 * i)[0]
+
+
+class MappedLexicon(_IndexedLexicon):
+    """Lexicon backed by a memory-mapped .hlex file (see module docstring).
+
+    Only the header is read on open; entries are decoded on access.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self._n, self._index_pos, weights_pos, self._data_pos = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"{path}: truncated lexicon header")
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path}: not a binary lexicon (bad magic)")
+        if self._index_pos + 8 * (self._n + 1) > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path}: truncated lexicon index")
+        self._cum = _MappedFloats(self._mm, weights_pos, self._n)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # worker processes reopen the file instead of pickling the mapping
+        return (MappedLexicon, (self.path,))
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "MappedLexicon":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __repr__(self) -> str:
+        return f"MappedLexicon({self.path!r}, {self._n} entries)"
+
+    def _record(self, i: int) -> Tuple[bytes, int, int]:
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        start, end = _OFFSETS.unpack_from(self._mm, self._index_pos + 8 * i)
+        klen = _U32.unpack_from(self._mm, start)[0]
+        kstart = start + 4
+        return self._mm[kstart:kstart + klen], kstart + klen, end
+
+    def key_at(self, i: int) -> str:
+        return self._record(i)[0].decode("utf-8")
+
+    def value_at(self, i: int) -> Any:
+        _, vstart, end = self._record(i)
+        return json.loads(self._mm[vstart:end])
+
+    def cum_weights(self) -> Sequence[float]:
+        return self._cum
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._n):
+            yield self.key_at(i)
+
+    def __getitem__(self, key: str) -> Any:
+        # keys are stored sorted by UTF-8 bytes: binary search
+        target = key.encode("utf-8")
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            kb, vstart, end = self._record(mid)
+            if kb == target:
+                return json.loads(self._mm[vstart:end])
+            if kb < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        raise KeyError(key)
+
+
+def convert_lexicon(src: str, dst: str) -> int:
+    """One-time conversion of a JSON dict lexicon to the binary format.
+
+    Writes to a temp file and renames it into place; returns the entry count.
+    """
+    with open(src, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{src}: lexicon must be a JSON object")
+
+    items = sorted(((k.encode("utf-8"), v) for k, v in data.items()), key=lambda kv: kv[0])
+    n = len(items)
+    index_pos = _HEADER.size
+    weights_pos = index_pos + 8 * (n + 1)
+    data_pos = weights_pos + 8 * n
+
+    tmp = dst + ".tmp"
+    offsets: List[int] = []
+    cum: List[float] = []
+    total = 0.0
+    try:
+        with open(tmp, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, n, index_pos, weights_pos, data_pos))
+            out.seek(data_pos)
+            pos = data_pos
+            for kb, v in items:
+                rec = _U32.pack(len(kb)) + kb + json.dumps(v, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                offsets.append(pos)
+                out.write(rec)
+                pos += len(rec)
+                total += entry_weight(v)
+                cum.append(total)
+            offsets.append(pos)
+            out.seek(index_pos)
+            out.write(struct.pack(f"<{n + 1}Q", *offsets))
+            out.write(struct.pack(f"<{n}d", *cum))
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return n
+
+
+def is_binary_lexicon(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def load_symbol_lexicon(path: str, strict: bool = False) -> _IndexedLexicon:
+    """Load a JSON or binary (.hlex) lexicon.
+
+    By default unreadable files give an empty lexicon, as the GUI always
+    did; `strict=True` raises OSError/ValueError instead.
+    """
+    try:
+        if is_binary_lexicon(path):
+            return MappedLexicon(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: lexicon must be a JSON object")
+        return SymbolLexicon(data)
+    except (OSError, ValueError):
+        if strict:
+            raise
+    return SymbolLexicon()
+
+
+def indexed_lexicon(lex: Mapping[str, Any]) -> Mapping[str, Any]:
+    """`lex` ready for sampling: plain dicts are wrapped in a SymbolLexicon.
+
+    Wrap once per series (or sweep) rather than letting `sample_symbols`
+    re-index a dict for every state.
+    """
+    if lex and not isinstance(lex, _IndexedLexicon):
+        return SymbolLexicon(lex)
+    return lex
+
+
+def sample_symbols(
+    lex: Mapping[str, Any],
+    k: int = 3,
+    weighted: bool = False,
+    exclude: Optional[Set[str]] = None,
+    rng: Any = None,
+) -> List[str]:
+    """Pick k symbols formatted for injection; `rng` defaults to the random module."""
+    if not lex:
+        return []
+    if not isinstance(lex, _IndexedLexicon):
+        lex = SymbolLexicon(lex)  # callers sampling repeatedly should pass indexed_lexicon(lex)
+    out = []
+    for i in lex.sample_indices(k, rng=rng or random, weighted=weighted, exclude=exclude):
+        p, v = lex.key_at(i), lex.value_at(i)
+        out.append(f"{p}={v}" if isinstance(v, str) else str(p))
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m hypna.lexicon", description="Symbol lexicon tools.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("convert", help="convert a JSON dict lexicon to the memory-mapped binary format")
+    c.add_argument("src")
+    c.add_argument("dst")
+    args = ap.parse_args(argv)
+    try:
+        n = convert_lexicon(args.src, args.dst)
+    except (OSError, ValueError) as e:
+        print(f"hypna.lexicon: {e}", file=sys.stderr)
+        return 1
+    print(f"wrote {n} entries to {args.dst}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
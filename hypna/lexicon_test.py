@@ -0,0 +1,145 @@
+import json
+import random
+
+from hypna.engine import Evolve, Form, generate_series, iter_series
+from hypna.lexicon import SymbolLexicon, load_symbol_lexicon, sample_symbols
+
+
+def test_load_indexes_keys_and_keeps_mapping_behaviour(tmp_path):
+    p = tmp_path / "lex.json"
+    p.write_text(json.dumps({"eye": "watcher", "moth": {"weight": 2}}), encoding="utf-8")
+    lex = load_symbol_lexicon(str(p))
+    assert isinstance(lex, SymbolLexicon)
+    assert len(lex) == 2 and lex["eye"] == "watcher" and list(lex) == ["eye", "moth"]
+    assert sorted(sample_symbols(lex, 5)) == ["eye=watcher", "moth"]
+
+
+def test_sample_is_distinct_and_seeded():
+    lex = SymbolLexicon({f"s{i}": str(i) for i in range(1000)})
+    a = lex.sample_keys(5, rng=random.Random(3))
+    assert len(set(a)) == 5
+    assert a == lex.sample_keys(5, rng=random.Random(3))
+
+
+def test_weighted_sampling_prefers_heavy_entries_and_skips_zero_weight():
+    lex = SymbolLexicon({"heavy": {"weight": 50}, "light": {"weight": 1}, "never": {"weight": 0}})
+    rng = random.Random(0)
+    firsts = [lex.sample_keys(1, rng=rng, weighted=True)[0] for _ in range(300)]
+    assert firsts.count("heavy") > 250
+    assert "never" not in firsts
+
+
+def test_no_repeat_cycles_through_whole_lexicon():
+    lex = SymbolLexicon({f"s{i}": "" for i in range(10)})
+    used = set()
+    rng = random.Random(1)
+    drawn = [key for _ in range(3) for key in lex.sample_keys(3, rng=rng, exclude=used)]
+    assert len(set(drawn)) == 9
+    last = (set(lex) - set(drawn)).pop()
+    for weighted in (False, True):
+        boundary = lex.sample_keys(3, rng=rng, weighted=weighted, exclude=set(drawn))
+        # the one key left, then two from the next cycle that don't repeat it
+        assert len(boundary) == 3 == len(set(boundary)) and last in boundary
+    boundary = lex.sample_keys(3, rng=rng, exclude=used)
+    assert len(boundary) == 3 and used == set(boundary)
+
+
+def test_plain_dict_is_indexed_once_per_series(monkeypatch):
+    import hypna.lexicon as lexicon
+
+    built = []
+    real = lexicon.SymbolLexicon.__init__
+
+    def counting_init(self, *a, **kw):
+        built.append(1)
+        real(self, *a, **kw)
+
+    monkeypatch.setattr(lexicon.SymbolLexicon, "__init__", counting_init)
+    f = Form(inject_symbols=True, evolve=Evolve(steps=10))
+    states = list(iter_series(f, {f"s{i}": f"m{i}" for i in range(50)}, seed=1))
+    assert len(states) == 10 and len(built) == 1
+
+
+def test_failed_conversion_leaves_no_temp_file(tmp_path, monkeypatch):
+    import os
+
+    import hypna.lexicon as lexicon
+
+    src = tmp_path / "lex.json"
+    src.write_text(json.dumps({"a": "x"}), encoding="utf-8")
+
+    def fail(*a):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(lexicon.os, "replace", fail)
+    try:
+        lexicon.convert_lexicon(str(src), str(tmp_path / "lex.hlex"))
+    except OSError as e:
+        assert "disk full" in str(e)
+    else:
+        raise AssertionError("expected OSError")
+    assert sorted(os.listdir(tmp_path)) == ["lex.json"]
+    try:
+        type("Partial", (lexicon._IndexedLexicon,), {"__len__": len, "__iter__": iter, "__getitem__": None})()
+    except TypeError as e:
+        assert "abstract" in str(e)
+    else:
+        raise AssertionError("expected TypeError")
+
+
+def test_series_no_repeat_option():
+    lex = SymbolLexicon({f"s{i}": f"m{i}" for i in range(40)})
+    f = Form(inject_symbols=True, symbols_per_state=3, symbols_no_repeat=True, evolve=Evolve(steps=10))
+    picked = [s for st in generate_series(f, lex) for s in st["injected_symbols"]]
+    assert len(picked) == 30 and len(set(picked)) == 30
+
+
+def test_binary_lexicon_round_trip(tmp_path):
+    from hypna.lexicon import MappedLexicon, convert_lexicon
+
+    data = {"ñandú": "bird", "eye": "watcher", "moth": {"meaning": "threshold", "weight": 3}, "": [1, 2]}
+    src, dst = tmp_path / "lex.json", tmp_path / "lex.hlex"
+    src.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    assert convert_lexicon(str(src), str(dst)) == 4
+
+    lex = load_symbol_lexicon(str(dst), strict=True)
+    assert isinstance(lex, MappedLexicon)
+    assert dict(lex.items()) == data
+    assert lex["moth"]["weight"] == 3 and "nope" not in lex
+    assert list(lex.cum_weights()) == [1.0, 2.0, 5.0, 6.0]
+    assert sorted(sample_symbols(lex, 10)) == sorted(["ñandú=bird", "eye=watcher", "moth", ""])
+    lex.close()
+
+
+def test_binary_and_json_lexicons_sample_alike(tmp_path):
+    from hypna.lexicon import convert_lexicon
+
+    # insertion order differs from the file's UTF-8 order on purpose
+    data = {f"{(i * 7919) % 1000}k": {"meaning": f"v{i}", "weight": 1 + i % 5} for i in range(500)}
+    data.update({"ñandú": "bird", "Zebra": "stripe", "éclair": "pastry"})
+    src, dst = tmp_path / "lex.json", tmp_path / "lex.hlex"
+    src.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    convert_lexicon(str(src), str(dst))
+    mem, mapped = load_symbol_lexicon(str(src)), load_symbol_lexicon(str(dst))
+    assert list(mem) == list(mapped)
+    for weighted in (False, True):
+        a = mem.sample_keys(4, rng=random.Random(9), weighted=weighted, exclude=set())
+        b = mapped.sample_keys(4, rng=random.Random(9), weighted=weighted, exclude=set())
+        assert a == b
+        a = sample_symbols(mem, 6, weighted=weighted, rng=random.Random(5))
+        b = sample_symbols(mapped, 6, weighted=weighted, rng=random.Random(5))
+        assert a == b
+    mapped.close()
+
+
+def test_strict_load_reports_errors(tmp_path):
+    bad = tmp_path / "bad.json"
+    bad.write_text("[1, 2]", encoding="utf-8")
+    assert len(load_symbol_lexicon(str(bad))) == 0
+    for path in (str(bad), str(tmp_path / "missing.json")):
+        try:
+            load_symbol_lexicon(path, strict=True)
+        except (OSError, ValueError):
+            pass
+        else:
+            raise AssertionError(path)
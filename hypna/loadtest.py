@@ -0,0 +1,129 @@
+"""
+Load-test client for `hypna.server`: `python -m hypna.loadtest [--spawn]`
+
+Opens N keep-alive connections to a local server and sends requests over
+them back to back, then prints throughput and latency percentiles as JSON.
+`--spawn` starts a server in a child process on a free port first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bench import FULL_FORM, REPO_ROOT
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str,
+                  method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+    """One request on an open keep-alive connection; returns (status, body)."""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    length = 0
+    for line in head[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _connection(host: str, port: int, path: str, body: bytes, count: int,
+                      latencies: List[float], statuses: Dict[int, int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            t = time.perf_counter()
+            status, _ = await request(reader, writer, host, "POST", path, body)
+            latencies.append(time.perf_counter() - t)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(host: str, port: int, path: str, payload: Dict[str, Any],
+              connections: int, requests: int) -> Dict[str, Any]:
+    body = json.dumps(payload).encode("utf-8")
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    per, extra = divmod(requests, connections)
+    t = time.perf_counter()
+    await asyncio.gather(*(
+        _connection(host, port, path, body, per + (i < extra), latencies, statuses)
+        for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - t
+    lat = sorted(latencies)
+    pct = lambda p: lat[min(len(lat) - 1, int(p * len(lat)))] * 1e3 if lat else 0.0
+    return {
+        "path": path,
+        "connections": connections,
+        "requests": len(lat),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "seconds": elapsed,
+        "rps": len(lat) / elapsed if elapsed else 0.0,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+        "max_ms": lat[-1] * 1e3 if lat else 0.0,
+    }
+
+
+def _spawn(workers: Optional[int]) -> Tuple[subprocess.Popen, int]:
+    cmd = [sys.executable, "-m", "hypna.server", "--port", "0"]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()  # type: ignore[union-attr]
+    if "listening on" not in line:
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line.strip()}")
+    return proc, int(line.rsplit(":", 1)[1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m hypna.loadtest", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--spawn", action="store_true", help="start a server on a free port for the run")
+    ap.add_argument("--workers", type=int, default=None, help="--spawn: server compile processes")
+    ap.add_argument("--endpoint", choices=("series", "prompt"), default="series")
+    ap.add_argument("--form", help="Form JSON to send (default: the benchmark FULL_FORM)")
+    ap.add_argument("--connections", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=1000)
+    args = ap.parse_args(argv)
+
+    form = json.loads(args.form) if args.form else FULL_FORM
+    payload: Dict[str, Any] = {"form": form, "seed": 1}
+    if args.endpoint == "series":
+        payload["prompts_only"] = True
+    proc = None
+    port = args.port
+    if args.spawn:
+        proc, port = _spawn(args.workers)
+    try:
+        result = asyncio.run(run(args.host, port, f"/{args.endpoint}", payload,
+                                 max(1, args.connections), args.requests))
+    except OSError as e:
+        print(f"hypna.loadtest: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if set(result["statuses"]) <= {"200"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
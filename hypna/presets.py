@@ -0,0 +1,274 @@
+"""
+Preset library: named Forms saved to a local SQLite file.
+
+A preset is stored in a compact, versioned JSON encoding that only records
+fields differing from `Form()` (nested Evolve/Mutate/Humanizer/Painting
+included), with SKIP written as {"$skip": true} so it stays distinct from
+None, "" and the literal string "SKIP". Next to it each row keeps what the
+library filters on, indexed: mode, style tokens, and the hallucination range
+the series sweeps. Listing and filtering never decode a Form.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .engine import MAX_STEPS, SKIP, Form, check_field, hallucination_schedule, series_length
+
+# bump when the encoding changes; older versions must keep loading
+PRESET_VERSION = 1
+
+_DEFAULTS = Form()
+_NESTED = ("evolve", "mutate", "humanizer", "painting")
+
+
+def default_presets_path() -> str:
+    base = os.environ.get("HYPNA_DATA_DIR") or os.path.join(
+        os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"), "hypna"
+    )
+    return os.path.join(base, "presets.sqlite")
+
+
+# -----------------------------
+# Encoding
+# -----------------------------
+def _encode_value(v: Any) -> Any:
+    if v is SKIP:
+        return {"$skip": True}
+    if isinstance(v, dict):
+        return dict(v)
+    return v
+
+def _decode_value(v: Any, where: str) -> Any:
+    if isinstance(v, dict):
+        if v == {"$skip": True}:
+            return SKIP
+        raise ValueError(f"field {where!r} has an unexpected object value")
+    return v
+
+def _diff(obj: Any, default: Any) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for f in fields(obj):
+        v, d = getattr(obj, f.name), getattr(default, f.name)
+        if f.name in _NESTED:
+            sub = _diff(v, d)
+            if sub:
+                out[f.name] = sub
+        elif f.name == "qualities":
+            on = {q: bool(x) for q, x in v.items() if bool(x) != d.get(q, False)}
+            if on:
+                out[f.name] = on
+        elif v is not d and (v is SKIP or d is SKIP or type(v) is not type(d) or v != d):
+            out[f.name] = _encode_value(v)
+    return out
+
+def _apply(obj: Any, data: Dict[str, Any], where: str) -> None:
+    names = {f.name for f in fields(obj)}
+    for k, v in data.items():
+        if k not in names:
+            raise ValueError(f"unknown field {where + k!r}")
+        if k in _NESTED or k == "qualities":
+            if not isinstance(v, dict):
+                raise ValueError(f"field {where + k!r} must be an object")
+            if k == "qualities":
+                if not all(isinstance(on, bool) for on in v.values()):
+                    raise ValueError(f"field {where + k!r} must map qualities to true/false")
+                obj.qualities.update(v)
+            else:
+                _apply(getattr(obj, k), v, f"{where}{k}.")
+        else:
+            setattr(obj, k, check_field(obj, k, _decode_value(v, where + k), where))
+
+def preset_to_dict(form: Form) -> Dict[str, Any]:
+    """Compact, versioned JSON-safe encoding of `form`."""
+    return {"v": PRESET_VERSION, "form": _diff(form, _DEFAULTS)}
+
+def preset_from_dict(data: Dict[str, Any]) -> Form:
+    if not isinstance(data, dict) or not isinstance(data.get("form"), dict):
+        raise ValueError("not a preset")
+    v = data.get("v")
+    if not isinstance(v, int) or not 1 <= v <= PRESET_VERSION:
+        raise ValueError(f"unsupported preset version {v!r}")
+    f = Form()
+    _apply(f, data["form"], "")
+    return f
+
+def dumps_preset(form: Form) -> str:
+    return json.dumps(preset_to_dict(form), ensure_ascii=False, separators=(",", ":"))
+
+def loads_preset(text: str) -> Form:
+    return preset_from_dict(json.loads(text))
+
+
+# -----------------------------
+# Index
+# -----------------------------
+@dataclass(frozen=True)
+class PresetInfo:
+    name: str
+    mode: str
+    tokens: Tuple[str, ...]
+    h_min: int
+    h_max: int
+    updated: float
+
+
+def style_tokens(form: Form) -> Tuple[str, ...]:
+    csv = form.style_tokens if isinstance(form.style_tokens, str) else ""
+    return tuple(dict.fromkeys(t.strip() for t in csv.split(",") if t.strip()))
+
+def hallucination_range(form: Form) -> Tuple[int, int]:
+    """Lowest and highest effective hallucination over the Form's series."""
+    try:
+        n = series_length(form, MAX_STEPS)
+    except (TypeError, ValueError):
+        n = 1
+    hs = hallucination_schedule(form, n)
+    return min(hs), max(hs)
+
+
+class PresetLibrary:
+    """Named Forms with an indexed listing.
+
+    Rows are (id, name, mode, tokens, h_min, h_max, updated, data); a side
+    table maps each style token to the ids of the presets using it.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_presets_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS presets ("
+            " id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, mode TEXT NOT NULL, tokens TEXT NOT NULL,"
+            " h_min INTEGER NOT NULL, h_max INTEGER NOT NULL, updated REAL NOT NULL, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS presets_mode ON presets(mode, name);"
+            "CREATE INDEX IF NOT EXISTS presets_h ON presets(h_min, h_max);"
+            "CREATE TABLE IF NOT EXISTS preset_tokens ("
+            " token TEXT NOT NULL, id INTEGER NOT NULL REFERENCES presets(id) ON DELETE CASCADE,"
+            " PRIMARY KEY (token, id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS preset_tokens_id ON preset_tokens(id);"
+        )
+
+    def _put(self, name: str, form: Form, now: float) -> PresetInfo:
+        tokens = style_tokens(form)
+        lo, hi = hallucination_range(form)
+        self._db.execute("DELETE FROM presets WHERE name = ?", (name,))
+        row = self._db.execute(
+            "INSERT INTO presets (name, mode, tokens, h_min, h_max, updated, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, str(form.mode), ", ".join(tokens), lo, hi, now, dumps_preset(form)),
+        ).lastrowid
+        self._db.executemany("INSERT INTO preset_tokens (token, id) VALUES (?, ?)", [(t, row) for t in tokens])
+        return PresetInfo(name, str(form.mode), tokens, lo, hi, now)
+
+    def save(self, name: str, form: Form) -> PresetInfo:
+        """Store `form` as `name`, replacing any preset of that name; returns its listing."""
+        return self._save([(name, form)])[0]
+
+    def save_many(self, items: Iterable[Tuple[str, Form]]) -> int:
+        """Store several presets in one transaction; returns how many."""
+        return len(self._save(items))
+
+    def _save(self, items: Iterable[Tuple[str, Form]]) -> List[PresetInfo]:
+        saved: List[PresetInfo] = []
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for name, form in items:
+                    name = name.strip()
+                    if not name:
+                        raise ValueError("preset name must not be empty")
+                    saved.append(self._put(name, form, now))
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return saved
+
+    def load(self, name: str) -> Form:
+        with self._lock:
+            row = self._db.execute("SELECT data FROM presets WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return loads_preset(row[0])
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            return self._db.execute("DELETE FROM presets WHERE name = ?", (name,)).rowcount > 0
+
+    def _where(self, mode: Optional[str], token: Optional[str], h_min: Optional[int], h_max: Optional[int],
+               text: Optional[str]) -> Tuple[str, List[Any]]:
+        # h_min/h_max select presets whose range overlaps [h_min, h_max]
+        clauses: List[str] = []
+        args: List[Any] = []
+        if mode:
+            clauses.append("mode = ?")
+            args.append(mode)
+        if token:
+            clauses.append("id IN (SELECT id FROM preset_tokens WHERE token = ?)")
+            args.append(token)
+        if h_min is not None:
+            clauses.append("h_max >= ?")
+            args.append(h_min)
+        if h_max is not None:
+            clauses.append("h_min <= ?")
+            args.append(h_max)
+        if text:
+            clauses.append("instr(lower(name), ?) > 0")
+            args.append(text.lower())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def list(self, mode: Optional[str] = None, token: Optional[str] = None, h_min: Optional[int] = None,
+             h_max: Optional[int] = None, text: Optional[str] = None, limit: Optional[int] = None) -> List[PresetInfo]:
+        """Presets matching every given filter, by name."""
+        where, args = self._where(mode, token, h_min, h_max, text)
+        sql = f"SELECT name, mode, tokens, h_min, h_max, updated FROM presets{where} ORDER BY name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [PresetInfo(name, mode_, tuple(t for t in tokens.split(", ") if t), lo, hi, updated)
+                for name, mode_, tokens, lo, hi, updated in rows]
+
+    def count(self, mode: Optional[str] = None, token: Optional[str] = None, h_min: Optional[int] = None,
+              h_max: Optional[int] = None, text: Optional[str] = None) -> int:
+        where, args = self._where(mode, token, h_min, h_max, text)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM presets{where}", args).fetchone()[0]
+
+    def modes(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT DISTINCT mode FROM presets ORDER BY mode")]
+
+    def tokens(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT DISTINCT token FROM preset_tokens ORDER BY token")]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM presets WHERE name = ?", (name,)).fetchone() is not None
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "PresetLibrary":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from hypna.cache import form_hash
+from hypna.engine import HUMANIZER_QUALITIES, SKIP, Evolve, Form, Humanizer, Mutate, Painting
+from hypna.presets import PRESET_VERSION, PresetLibrary, dumps_preset, loads_preset, preset_to_dict
+
+
+def _form(**kw):
+    qualities = {k: k == "smudge" for k, _ in HUMANIZER_QUALITIES}
+    return Form(
+        mode="LIVE", style_tokens="STYLE.OCCULT, STYLE.PRINT", temporal=SKIP, material=None, hallucination=40,
+        evolve=Evolve(steps=12, start_h=20, end_h=90, curve=SKIP), mutate=Mutate(enabled=True, drift=None),
+        humanizer=Humanizer(level=30, qualities=qualities), painting=Painting(influence=SKIP), **kw,
+    )
+
+
+def test_round_trip_keeps_sentinels_and_nesting():
+    f = _form(subject="SKIP", seed=9)
+    data = preset_to_dict(f)
+    assert data["v"] == PRESET_VERSION
+    assert "notes" not in data["form"] and "path" not in data["form"]["evolve"]  # defaults left out
+    back = loads_preset(dumps_preset(f))
+    assert back == f and form_hash(back) == form_hash(f)
+    assert back.temporal is SKIP and back.evolve.curve is SKIP and back.material is None
+    assert back.subject == "SKIP" and back.subject is not SKIP
+    assert loads_preset(dumps_preset(Form())) == Form()
+    with pytest.raises(ValueError):
+        loads_preset(json.dumps({"v": PRESET_VERSION + 1, "form": {}}))
+    with pytest.raises(ValueError):
+        loads_preset(json.dumps({"v": 1, "form": {"bogus": 1}}))
+    with pytest.raises(ValueError, match="evolve.steps"):
+        loads_preset(json.dumps({"v": 1, "form": {"evolve": {"steps": [2]}}}))
+
+
+def test_library_lists_and_filters_by_index(tmp_path):
+    path = str(tmp_path / "p.sqlite")
+    with PresetLibrary(path) as lib:
+        lib.save_many([
+            ("drift", _form()),
+            ("plain", Form(hallucination=10, evolve=Evolve(enabled=False))),
+            ("print", Form(mode="PRINT", style_tokens="STYLE.PRINT", hallucination=60, evolve=Evolve(enabled=False))),
+        ])
+        info = lib.save(" plain ", Form(hallucination=15, evolve=Evolve(enabled=False)))  # replaces
+        assert (info.name, info.h_min, info.h_max) == ("plain", 15, 15)
+    with PresetLibrary(path) as lib:
+        assert len(lib) == 3 and "drift" in lib
+        assert [p.name for p in lib.list()] == ["drift", "plain", "print"]
+        drift = lib.list(mode="LIVE")[0]
+        assert (drift.h_min, drift.h_max, drift.tokens) == (20, 90, ("STYLE.OCCULT", "STYLE.PRINT"))
+        assert [p.name for p in lib.list(token="STYLE.PRINT")] == ["drift", "print"]
+        assert [p.name for p in lib.list(h_min=50, h_max=70)] == ["drift", "print"]
+        assert [p.name for p in lib.list(h_max=15)] == ["plain"]
+        assert lib.count(token="STYLE.PRINT", mode="PRINT") == 1
+        assert lib.list(text="RIN", limit=1)[0].name == "print"
+        assert lib.tokens() == ["STYLE.OCCULT", "STYLE.PRINT"] and lib.modes() == ["FULL", "LIVE", "PRINT"]
+        assert lib.load("drift") == _form()
+        assert lib.delete("drift") and not lib.delete("drift")
+        assert lib.tokens() == ["STYLE.PRINT"]
+        with pytest.raises(KeyError):
+            lib.load("drift")
+        with pytest.raises(ValueError):
+            lib.save_many([("ok", Form()), (" ", Form())])
+        assert "ok" not in lib
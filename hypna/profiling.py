@@ -0,0 +1,176 @@
+"""
+Opt-in hot-path profiling for the engine.
+
+`enable()` swaps timing wrappers in for `compute_state`, `compile_prompt`,
+`render_prompt`, `sample_symbols`, `expand_style_tokens` and
+`generate_series` (and `render_op`, timed per prompt block) in every loaded
+hypna module that references them; `disable()` puts the originals back, so
+a disabled profiler costs nothing. Times are inclusive (compute_state
+includes its sample_symbols call) and only cover the current process:
+sweep workers are not instrumented.
+
+    from hypna import profiling
+    with profiling.profiled():
+        generate_series(form, lex)
+    profiling.dump("profile.json")
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, IO, Iterator, List, Tuple, Union
+
+from . import engine
+
+PROFILED = (
+    "compute_state",
+    "compile_prompt",
+    "render_prompt",
+    "sample_symbols",
+    "expand_style_tokens",
+    "generate_series",
+)
+
+# per-name latency samples kept for percentiles (reservoir beyond this)
+RESERVOIR_SIZE = 65536
+
+
+class _Stat:
+    __slots__ = ("count", "total", "samples", "_rng")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.samples: List[float] = []
+        self._rng = random.Random(0)
+
+    def add(self, dt: float) -> None:
+        self.count += 1
+        self.total += dt
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(dt)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < RESERVOIR_SIZE:
+                self.samples[j] = dt
+
+    def summary(self) -> Dict[str, float]:
+        s = sorted(self.samples)
+        pct = lambda p: s[min(len(s) - 1, int(p * len(s)))] * 1e6 if s else 0.0
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "p50_us": pct(0.50),
+            "p99_us": pct(0.99),
+        }
+
+
+_lock = threading.Lock()
+_stats: Dict[str, _Stat] = {}
+_patched: List[Tuple[Any, str, Any]] = []
+
+
+def _record(name: str, dt: float) -> None:
+    with _lock:
+        st = _stats.get(name)
+        if st is None:
+            st = _stats[name] = _Stat()
+        st.add(dt)
+
+
+def _timed(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        t = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - t)
+    return wrapper
+
+
+def _timed_block(fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(op: Any, st: Dict[str, Any]) -> Any:
+        t = time.perf_counter()
+        try:
+            return fn(op, st)
+        finally:
+            _record("block:" + engine.op_name(op), time.perf_counter() - t)
+    return wrapper
+
+
+def enabled() -> bool:
+    return bool(_patched)
+
+
+def enable() -> None:
+    """Install the timing wrappers (idempotent)."""
+    if _patched:
+        return
+    targets = {name: getattr(engine, name) for name in PROFILED}
+    wrappers = {name: _timed(name, fn) for name, fn in targets.items()}
+    targets["render_op"] = engine.render_op
+    wrappers["render_op"] = _timed_block(engine.render_op)
+    for modname, mod in list(sys.modules.items()):
+        if mod is None or not modname.startswith("hypna") or mod is sys.modules[__name__]:
+            continue
+        for name, fn in targets.items():
+            if getattr(mod, name, None) is fn:
+                setattr(mod, name, wrappers[name])
+                _patched.append((mod, name, fn))
+
+
+def disable() -> None:
+    """Restore the original functions; collected stats are kept."""
+    while _patched:
+        mod, name, fn = _patched.pop()
+        setattr(mod, name, fn)
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+@contextmanager
+def profiled(clear: bool = True) -> Iterator[None]:
+    if clear:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def stats() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """{"functions": {name: summary}, "blocks": {block title: summary}}."""
+    with _lock:
+        items = [(name, st.summary()) for name, st in _stats.items()]
+    out: Dict[str, Dict[str, Dict[str, float]]] = {"functions": {}, "blocks": {}}
+    for name, summary in sorted(items):
+        if name.startswith("block:"):
+            out["blocks"][name[len("block:"):]] = summary
+        else:
+            out["functions"][name] = summary
+    return out
+
+
+def dump(dest: Union[str, IO[str]]) -> None:
+    """Write `stats()` as JSON to a path ("-" = stderr) or an open file."""
+    data = json.dumps(stats(), indent=2) + "\n"
+    if not isinstance(dest, str):
+        dest.write(data)
+    elif dest == "-":
+        sys.stderr.write(data)
+    else:
+        with open(dest, "w", encoding="utf-8") as f:
+            f.write(data)
@@ -0,0 +1,34 @@
+import importlib
+import io
+import json
+
+from hypna import engine, profiling
+from hypna.engine import Form, generate_series
+from hypna.sweep import sweep
+
+sweep_mod = importlib.import_module("hypna.sweep")  # `hypna.sweep` is the function
+
+LEX = {f"sym{i}": f"meaning {i}" for i in range(100)}
+
+
+def test_profiled_run_counts_calls_and_blocks_then_unpatches():
+    originals = (engine.compute_state, engine.render_op, sweep_mod.generate_series)
+    form = Form(inject_symbols=True)
+    form.evolve.steps = 5
+    with profiling.profiled():
+        assert profiling.enabled()
+        generate_series(form, LEX, seed=1)
+        list(sweep([form], LEX, workers=1))
+    assert not profiling.enabled()
+    assert (engine.compute_state, engine.render_op, sweep_mod.generate_series) == originals
+
+    st = profiling.stats()
+    fns = st["functions"]
+    assert fns["generate_series"]["count"] == 2
+    assert fns["compute_state"]["count"] == fns["sample_symbols"]["count"] == 10
+    assert fns["render_prompt"]["p50_us"] <= fns["render_prompt"]["p99_us"]
+    assert st["blocks"]["HYPNA-MATRIX"]["count"] == 10
+
+    buf = io.StringIO()
+    profiling.dump(buf)
+    assert json.loads(buf.getvalue()) == json.loads(json.dumps(st))
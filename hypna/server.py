@@ -0,0 +1,376 @@
+"""
+Local prompt-compilation service: `python -m hypna.server [--port 8765]`
+
+A small stdlib asyncio HTTP/1.1 server, so render nodes can ask one warm
+process for series instead of importing the engine (or the GUI) per call.
+Connections are kept alive between requests; compilation runs in a process
+pool (or a thread with --workers 0) so the event loop only parses and
+routes. At most `max_concurrency` compilations run at once and at most
+`max_pending` more wait for a slot; beyond that requests get 503. Identical
+/series requests that arrive while one is compiling wait for its result
+instead of taking a slot (and with --coalesce-ttl, for a while after).
+
+    POST /series   {"form": {...}, "seed": 7, "max_steps": 20, "prompts_only": false}
+                   -> {"states": [...]} or {"prompts": [...]}
+    POST /prompt   {"state": {...}}                    -> {"prompt": "..."}  (compile_prompt)
+                   {"form": {...}, "index": 3, "seed": 7} -> {"prompt": "..."}  (series_state)
+    GET  /health   -> {"ok": true, ...counters}
+
+Forms use the CLI's JSON conventions ("SKIP", null). `python -m
+hypna.loadtest` drives a running server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .cache import form_hash, lexicon_fingerprint
+from .coalesce import AsyncSingleFlight
+from .engine import (
+    LIVE_MAX_STEPS,
+    MAX_STEPS,
+    SKIP,
+    Form,
+    compile_prompt,
+    form_from_dict,
+    generate_series,
+    load_symbol_lexicon,
+    series_state,
+)
+
+DEFAULT_PORT = 8765
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1 << 20
+IDLE_TIMEOUT = 15.0
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    501: "Not Implemented", 503: "Service Unavailable",
+}
+_ROUTES = {"/series": "POST", "/prompt": "POST", "/health": "GET"}
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class RequestError(Exception):
+    """A request the client got wrong; answered with `status`."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# -----------------------------
+# Workers (module level so they pickle into the process pool)
+# -----------------------------
+_worker_lex: Mapping[str, Any] = {}
+_worker_max_steps = LIVE_MAX_STEPS
+
+def _init_worker(lex: Mapping[str, Any], max_steps: int) -> None:
+    global _worker_lex, _worker_max_steps
+    _worker_lex = lex
+    _worker_max_steps = max_steps
+
+def _seed(req: Mapping[str, Any]) -> Optional[int]:
+    seed = req.get("seed")
+    if seed is not None and not isinstance(seed, int):
+        raise ValueError("seed must be an integer")
+    return seed
+
+def _series_args(req: Mapping[str, Any], cap: int) -> Tuple[Form, int, Optional[int]]:
+    form = form_from_dict(req.get("form"))
+    max_steps = req.get("max_steps", MAX_STEPS)
+    if not isinstance(max_steps, int) or max_steps < 1:
+        raise ValueError("max_steps must be a positive integer")
+    return form, min(max_steps, cap), _seed(req)
+
+def _series(req: Dict[str, Any]) -> bytes:
+    form, max_steps, seed = _series_args(req, _worker_max_steps)
+    series = generate_series(form, _worker_lex, max_steps, seed=seed)
+    if req.get("prompts_only"):
+        return _dumps({"prompts": [st["prompt"] for st in series]}).encode("utf-8")
+    return _dumps({"states": series}).encode("utf-8")
+
+def _prompt(req: Dict[str, Any]) -> bytes:
+    if "state" in req:
+        st = req["state"]
+        if not isinstance(st, dict):
+            raise ValueError("state must be a JSON object")
+        # JSON has no SKIP sentinel: restore it so those lines stay omitted
+        st = {k: SKIP if v == SKIP else v for k, v in st.items()}
+        try:
+            prompt = compile_prompt(st)
+        except KeyError as e:
+            raise ValueError(f"state is missing {e.args[0]!r}") from None
+    else:
+        index = req.get("index", 0)
+        if not isinstance(index, int):
+            raise ValueError("index must be an integer")
+        form = form_from_dict(req.get("form"))
+        try:
+            prompt = series_state(form, index, _worker_lex, _worker_max_steps, seed=_seed(req))["prompt"]
+        except IndexError as e:
+            raise ValueError(str(e)) from None
+    return _dumps({"prompt": prompt}).encode("utf-8")
+
+_HANDLERS = {"/series": _series, "/prompt": _prompt}
+
+
+# -----------------------------
+# HTTP
+# -----------------------------
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise RequestError(400, "malformed request line") from None
+    if not version.startswith("HTTP/1."):
+        raise RequestError(400, f"unsupported protocol {version!r}")
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise RequestError(400, "malformed header line")
+        headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _response(status: int, body: bytes, keep_alive: bool, extra: str = "") -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"{extra}\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _error_body(message: str) -> bytes:
+    return _dumps({"error": message}).encode("utf-8")
+
+
+class PromptServer:
+    """The service; `await start()` then `await serve_forever()` (or `close()`)."""
+
+    def __init__(
+        self,
+        lex: Optional[Mapping[str, Any]] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_steps: int = LIVE_MAX_STEPS,
+        coalesce_ttl: float = 0.0,
+    ):
+        self.lex = lex if lex is not None else {}
+        self.host, self.port = host, port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_concurrency = max_concurrency or max(1, self.workers) * 2
+        self.max_pending = self.max_concurrency * 4 if max_pending is None else max_pending
+        self.max_steps = max_steps
+        self.requests = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.pending = 0
+        self.flights: AsyncSingleFlight[bytes] = AsyncSingleFlight(coalesce_ttl)
+        self._lex_fp: Optional[str] = None
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> Tuple[str, int]:
+        """Bind and start accepting; returns the bound (host, port)."""
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.lex, self.max_steps))
+        else:
+            _init_worker(self.lex, self.max_steps)
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        # a full pass over the lexicon: do it once, before any connection
+        # waits on the loop, rather than inside every /series key
+        if self.lex:
+            self._lex_fp = lexicon_fingerprint(self.lex)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None, "call start() first"
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        flights = self.flights.stats()
+        return {"requests": self.requests, "rejected": self.rejected,
+                "in_flight": self.in_flight, "pending": self.pending,
+                "computed": flights["computed"], "coalesced": flights["coalesced"], "reused": flights["reused"]}
+
+    def _series_key(self, req: Mapping[str, Any]) -> Optional[str]:
+        """Coalescing key for a /series request, or None if it must run alone."""
+        try:
+            form, max_steps, seed = _series_args(req, self.max_steps)
+        except (ValueError, TypeError) as e:
+            raise RequestError(400, str(e)) from None
+        seed = seed if seed is not None else form.seed
+        if seed is None and form.inject_symbols and self.lex:
+            return None  # unseeded sampling: every request gets its own draw
+        key = form_hash(form, self.lex, seed, max_steps, lex_fingerprint=self._lex_fp)
+        return f"{key}:{bool(req.get('prompts_only'))}"
+
+    async def _compile(self, path: str, req: Dict[str, Any]) -> bytes:
+        key = self._series_key(req) if path == "/series" else None
+        if key is None:
+            return await self._run(path, req)
+        return await self.flights.do(key, lambda: self._run(path, req))
+
+    async def _run(self, path: str, req: Dict[str, Any]) -> bytes:
+        if self._slots.locked() and self.pending >= self.max_pending:  # type: ignore[union-attr]
+            self.rejected += 1
+            raise RequestError(503, "server busy")
+        self.pending += 1
+        try:
+            await self._slots.acquire()  # type: ignore[union-attr]
+        finally:
+            self.pending -= 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _HANDLERS[path], req)
+        except (ValueError, TypeError) as e:
+            raise RequestError(400, str(e)) from None
+        finally:
+            self.in_flight -= 1
+            self._slots.release()  # type: ignore[union-attr]
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> bytes:
+        path = target.split("?", 1)[0]
+        allowed = _ROUTES.get(path)
+        if allowed is None:
+            raise RequestError(404, f"no route {path!r}")
+        if method != allowed:
+            raise RequestError(405, f"{path} takes {allowed}")
+        if path == "/health":
+            return _dumps(dict(self.stats(), ok=True)).encode("utf-8")
+        try:
+            req = json.loads(body)
+        except ValueError:
+            raise RequestError(400, "body must be JSON") from None
+        if not isinstance(req, dict):
+            raise RequestError(400, "body must be a JSON object")
+        return await self._compile(path, req)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(431, _error_body("request head too large"), False))
+                    return
+                keep_alive = False
+                extra = ""
+                try:
+                    method, target, version, headers = _parse_head(head)
+                    conn = headers.get("connection", "").lower()
+                    keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+                    if "transfer-encoding" in headers:
+                        keep_alive = False
+                        raise RequestError(501, "chunked request bodies are not supported")
+                    # digits only: int() would also take "-5", "+5" or "1_000"
+                    raw_length = headers.get("content-length", "0").strip()
+                    if not (raw_length.isascii() and raw_length.isdigit()):
+                        keep_alive = False
+                        raise RequestError(400, "bad Content-Length")
+                    length = int(raw_length)
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise RequestError(413, f"body over {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    self.requests += 1
+                    status, payload = 200, await self._dispatch(method, target, body)
+                except RequestError as e:
+                    status, payload = e.status, _error_body(str(e))
+                    if e.status == 405:
+                        extra = f"Allow: {_ROUTES[target.split('?', 1)[0]]}\r\n"
+                    elif e.status == 503:
+                        extra = "Retry-After: 1\r\n"
+                except asyncio.IncompleteReadError:
+                    return
+                except Exception as e:  # keep serving other requests
+                    status, payload = 500, _error_body(f"{type(e).__name__}: {e}")
+                writer.write(_response(status, payload, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m hypna.server", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1", help="bind address (default 127.0.0.1)")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT}; 0 picks one)")
+    ap.add_argument("--lexicon", help="symbol lexicon (JSON or .hlex) for Forms that set inject_symbols")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="compile processes (default: CPU count; 0 compiles on one thread in-process)")
+    ap.add_argument("--max-concurrency", type=int, default=None,
+                    help="compilations running at once (default 2 x workers)")
+    ap.add_argument("--max-pending", type=int, default=None,
+                    help="requests queued for a slot before answering 503 (default 4 x max-concurrency)")
+    ap.add_argument("--max-steps", type=int, default=LIVE_MAX_STEPS,
+                    help=f"cap on max_steps a request may ask for (default {LIVE_MAX_STEPS})")
+    ap.add_argument("--coalesce-ttl", type=float, default=0.0, metavar="SECONDS",
+                    help="also answer identical /series requests from a result this recent (default 0)")
+    args = ap.parse_args(argv)
+    try:
+        lex = load_symbol_lexicon(args.lexicon, strict=True) if args.lexicon else {}
+    except (OSError, ValueError) as e:
+        print(f"hypna.server: {e}", file=sys.stderr)
+        return 1
+    server = PromptServer(lex, args.host, args.port, args.workers, args.max_concurrency,
+                          args.max_pending, args.max_steps, args.coalesce_ttl)
+
+    async def run() -> None:
+        host, port = await server.start()
+        print(f"hypna.server: listening on http://{host}:{port}", file=sys.stderr)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
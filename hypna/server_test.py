@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+from hypna.engine import SKIP, form_from_dict, generate_series
+from hypna.loadtest import request, run
+from hypna.server import PromptServer
+
+FORM = {"subject": "moth archive", "temporal": "SKIP", "evolve": {"steps": 3}}
+
+
+def _serve(test, **kwargs):
+    async def main():
+        server = PromptServer(workers=0, port=0, **kwargs)
+        host, port = await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                await test(server, lambda *a: request(reader, writer, host, *a), (host, port))
+            finally:
+                writer.close()
+        finally:
+            await server.close()
+    asyncio.run(main())
+
+
+def _post(body):
+    return json.dumps(body).encode("utf-8")
+
+
+def test_endpoints_share_one_keep_alive_connection():
+    async def test(server, req, addr):
+        want = generate_series(form_from_dict(FORM), {}, seed=4)
+        status, body = await req("POST", "/series", _post({"form": FORM, "seed": 4}))
+        assert status == 200
+        states = json.loads(body)["states"]
+        assert [st["prompt"] for st in states] == [st["prompt"] for st in want]
+        assert states[0]["temporal"] == SKIP
+
+        status, body = await req("POST", "/prompt", _post({"state": states[1]}))
+        assert status == 200 and json.loads(body)["prompt"] == want[1]["prompt"]
+        status, body = await req("POST", "/prompt", _post({"form": FORM, "index": 2, "seed": 4}))
+        assert json.loads(body)["prompt"] == want[2]["prompt"]
+
+        status, body = await req("GET", "/health")
+        assert status == 200 and json.loads(body)["requests"] == 4
+
+        result = await run(*addr, "/series", {"form": FORM, "prompts_only": True}, connections=3, requests=10)
+        assert result["requests"] == 10 and result["statuses"] == {"200": 10}
+    _serve(test)
+
+
+def test_errors_keep_the_connection_usable():
+    async def test(server, req, addr):
+        assert (await req("GET", "/nope"))[0] == 404
+        assert (await req("GET", "/series"))[0] == 405
+        assert (await req("POST", "/series", b"{not json"))[0] == 400
+        status, body = await req("POST", "/series", _post({"form": {"bogus": 1}}))
+        assert status == 400 and "bogus" in json.loads(body)["error"]
+        for form in ({"subject": None}, {"notes": 5}, {"evolve": {"steps": [2]}}):
+            assert (await req("POST", "/series", _post({"form": form})))[0] == 400, form
+        assert (await req("POST", "/prompt", _post({"state": {"index": 1}})))[0] == 400
+        assert (await req("POST", "/prompt", _post({"form": FORM, "index": 9})))[0] == 400
+        assert (await req("POST", "/prompt", _post({"form": FORM})))[0] == 200
+    _serve(test)
+
+
+def test_requests_over_the_limit_get_503():
+    async def test(server, req, addr):
+        await server._slots.acquire()  # the only slot is busy
+        status, _ = await req("POST", "/series", _post({"form": FORM}))
+        assert status == 503 and server.stats()["rejected"] == 1
+        server._slots.release()
+        assert (await req("POST", "/series", _post({"form": FORM})))[0] == 200
+    _serve(test, max_concurrency=1, max_pending=0)
+
+
+def test_identical_series_requests_are_coalesced():
+    async def test(server, req, addr):
+        body = {"form": FORM, "seed": 2, "prompts_only": True}
+        result = await run(*addr, "/series", body, connections=6, requests=6)
+        assert result["statuses"] == {"200": 6}
+        stats = server.stats()
+        assert stats["computed"] + stats["coalesced"] + stats["reused"] == 6 and stats["computed"] < 6
+        status, _ = await req("POST", "/series", _post(body))
+        assert status == 200 and server.stats()["reused"] == stats["reused"] + 1
+        await req("POST", "/series", _post(dict(body, prompts_only=False)))
+        assert server.stats()["computed"] == stats["computed"] + 1
+    _serve(test, coalesce_ttl=60.0)
+
+
+def test_bad_content_length_is_a_client_error():
+    async def test(server, req, addr):
+        for length in ("-5", "+5", "1_0", "ten"):
+            reader, writer = await asyncio.open_connection(*addr)
+            writer.write(f"POST /series HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            assert status_line.split()[1] == b"400", length
+    _serve(test)
+
+
+def test_lexicon_is_fingerprinted_once_not_per_request():
+    from hypna.lexicon import SymbolLexicon
+
+    class CountingLexicon(SymbolLexicon):
+        calls = 0
+
+        def fingerprint(self):
+            CountingLexicon.calls += 1
+            return super().fingerprint()
+
+    lex = CountingLexicon({f"s{i}": f"m{i}" for i in range(20)})
+    form = dict(FORM, inject_symbols=True)
+
+    async def test(server, req, addr):
+        for seed in (1, 2, 1):
+            assert (await req("POST", "/series", _post({"form": form, "seed": seed})))[0] == 200
+        assert CountingLexicon.calls == 1
+    _serve(test, lex=lex)
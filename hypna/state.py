@@ -0,0 +1,83 @@
+"""
+Compact state records.
+
+A compiled state is ~90 keys; as a dict each one carries its own hash table
+(~3.3 KB before the values). `State` stores the same values in `__slots__`
+(~0.7 KB) and reads like a dict (`st["prompt"]`, `.get`, `.items()`,
+`dict(st)`, `==` against a dict), so `compile_prompt`, the exporters and the
+GUI take either. `iter_series(..., compact=True)` yields them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+# every key compute_state returns, in its order, then the rendered prompt
+STATE_KEYS: Tuple[str, ...] = (
+    "index", "mode", "include_subject", "subject", "style_expanded", "injected_symbols",
+    "vibe_description", "vibe_images",
+    "hallucination", "temporal", "material", "space", "symbol", "agency", "saturation", "motion",
+    "form", "media", "palette", "surface", "coherence", "recursion", "grain", "line_wobble",
+    "erasure", "annotation", "auto_color", "contrast", "whiteness",
+    "state_name", "state_geometry", "transition_mode",
+    "comp_mode", "composition", "tension", "flow", "framing", "horizon", "scale_logic",
+    "gesture_mode", "pressure", "tempo", "jitter", "stroke_memory", "interruption", "hatch_density",
+    "arcane_enabled", "arcane_mode",
+    "sleep_enabled", "neuro_state", "motor", "presence", "visual_drift", "auditory", "affect",
+    "color_enabled", "color_mode", "color_evolution", "palette_lock",
+    "print_enabled", "plates_enabled", "print_mode", "registration", "texture", "plate_count",
+    "plate_logic", "registration_map", "overprint", "plate_map",
+    "evolve_enabled", "evolve_steps", "evolve_path",
+    "mutate_enabled", "mutate_strength", "mutate_drift", "mutate_velocity", "mutate_scope",
+    "mutate_mode", "mutate_anchor", "mutate_decay", "mutate_bifurcation",
+    "humanizer_level", "humanizer_qualities", "humanizer_notes",
+    "painting_influence", "painting_strength", "painting_notes",
+    "notes",
+    "prompt",
+)
+_KEYSET = frozenset(STATE_KEYS)
+
+
+class State(Mapping):
+    """A compiled state in slots; read-only as a mapping except for item assignment."""
+
+    __slots__ = STATE_KEYS
+
+    def __init__(self, data: Any = (), **kwargs: Any) -> None:
+        items = data.items() if isinstance(data, Mapping) else data
+        for k, v in items:
+            self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _KEYSET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _KEYSET:
+            raise KeyError(f"{key!r} is not a state key")
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        for k in STATE_KEYS:
+            if hasattr(self, k):
+                yield k
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"State({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict (e.g. for json.dumps)."""
+        return {k: getattr(self, k) for k in self}
+
+    def copy(self) -> "State":
+        return State(self)
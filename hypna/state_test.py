@@ -0,0 +1,37 @@
+import json
+import pickle
+
+import pytest
+
+from hypna.engine import Form, compile_prompt, compute_state, form_from_dict, generate_series
+from hypna.state import STATE_KEYS, State
+
+
+def test_keys_match_compute_state():
+    st = compute_state(Form(), 0, 1, {})
+    assert tuple(st) + ("prompt",) == STATE_KEYS
+
+
+def test_compact_series_reads_like_the_dict_series():
+    form = form_from_dict({"mode": "LIVE", "print_enabled": True, "evolve": {"steps": 12}})
+    dicts = generate_series(form, {}, seed=3)
+    states = generate_series(form, {}, seed=3, compact=True)
+    assert all(isinstance(st, State) for st in states)
+    assert states == dicts and dicts == states
+    assert [compile_prompt(st) for st in states] == [st["prompt"] for st in dicts]
+    assert json.dumps([st.to_dict() for st in states]) == json.dumps(dicts)
+    assert pickle.loads(pickle.dumps(states)) == dicts
+
+
+def test_mapping_behaviour():
+    st = State(index=1, mode="FULL")
+    assert len(st) == 2 and list(st) == ["index", "mode"] and "prompt" not in st
+    assert st.get("prompt") is None and dict(st) == {"index": 1, "mode": "FULL"}
+    st["prompt"] = "x"
+    assert st["prompt"] == "x" and len(st) == 3
+    for missing in ("nope", "copy", "to_dict"):
+        with pytest.raises(KeyError):
+            st[missing]
+    with pytest.raises(KeyError):
+        st["nope"] = 1
+    assert not hasattr(st, "__dict__")
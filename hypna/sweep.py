@@ -0,0 +1,173 @@
+"""
+Parameter sweeps: build Form grids and compile them across processes.
+
+Results always come back in input order, and every Form without its own
+`seed` is seeded from (sweep seed, grid index), so a sweep gives the same
+output whatever the worker count or chunk size.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .engine import MAX_STEPS, SKIP, STYLE_TOKENS, Form, derive_seed, generate_series, iter_series
+from .lexicon import indexed_lexicon
+from .presets import preset_from_dict, preset_to_dict
+
+if TYPE_CHECKING:
+    from .cache import SeriesCache
+
+
+def style_token_combinations(tokens: Optional[Sequence[str]] = None) -> List[str]:
+    """Every non-empty combination of style tokens, as the CSV the Form expects."""
+    toks = list(tokens if tokens is not None else STYLE_TOKENS.keys())
+    out: List[str] = []
+    for r in range(1, len(toks) + 1):
+        out.extend(", ".join(c) for c in itertools.combinations(toks, r))
+    return out
+
+
+def _set_path(form: Form, path: str, value: Any) -> None:
+    obj: Any = form
+    parts = path.split(".")
+    for p in parts[:-1]:
+        obj = getattr(obj, p)
+    if not hasattr(obj, parts[-1]):
+        raise ValueError(f"unknown field {path!r}")
+    setattr(obj, parts[-1], value)
+
+
+def form_grid(base: Form, axes: Dict[str, Sequence[Any]]) -> Iterator[Form]:
+    """Cartesian product of `axes` applied over `base`.
+
+    Keys are Form field names, dotted for nested models
+    (e.g. {"hallucination": range(101), "evolve.curve": CURVES}).
+    The last axis varies fastest.
+    """
+    names = list(axes.keys())
+    for combo in itertools.product(*(axes[k] for k in names)):
+        f = copy.deepcopy(base)
+        for k, v in zip(names, combo):
+            _set_path(f, k, v)
+        yield f
+
+
+def _item_seed(form: Form, seed: int, index: int) -> int:
+    # an explicit Form.seed wins; otherwise derive one from the grid position
+    return form.seed if form.seed is not None else derive_seed(seed, index)
+
+
+# -----------------------------
+# Workers
+# -----------------------------
+_worker_lex: Mapping[str, Any] = {}
+_worker_max_steps = MAX_STEPS
+
+def _init_worker(lex: Mapping[str, Any], max_steps: int) -> None:
+    global _worker_lex, _worker_max_steps
+    _worker_lex = indexed_lexicon(lex)
+    _worker_max_steps = max_steps
+
+def _run_chunk(jobs: List[Tuple[Dict[str, Any], int]]) -> List[List[Dict[str, Any]]]:
+    # Forms travel in the preset encoding: unpickled strings would lose SKIP's
+    # identity, and it keeps SKIP apart from text that merely reads "skip"
+    return [generate_series(preset_from_dict(d), _worker_lex, _worker_max_steps, seed=s) for d, s in jobs]
+
+def _restore_skip(series: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # pickled results come back with equal-but-distinct SKIP strings
+    for st in series:
+        for k, v in st.items():
+            if v == SKIP:
+                st[k] = SKIP
+    return series
+
+
+def _chunks(forms: Iterable[Form], size: int) -> Iterator[Tuple[int, List[Form]]]:
+    it = iter(forms)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def sweep(
+    forms: Iterable[Form],
+    lex: Optional[Mapping[str, Any]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    seed: int = 0,
+    max_steps: int = MAX_STEPS,
+    cache: Optional["SeriesCache"] = None,
+    lazy: bool = False,
+) -> Iterator[Iterable[Dict[str, Any]]]:
+    """Compile every Form's series, yielding them in input order.
+
+    `workers` defaults to the CPU count; 1 (or 0) runs in-process. Forms are
+    consumed lazily with a bounded number of chunks in flight, so arbitrarily
+    large grids don't sit in memory. With a `cache`, hits are served in the
+    parent and only misses are compiled.
+
+    `lazy=True` lets the in-process, uncached path yield each series as an
+    `iter_series` generator, so a long series is never held whole; consume
+    each one before advancing. Other paths still yield lists.
+    """
+    lex = lex or {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    fp = None
+    if cache is not None and lex:
+        from .cache import lexicon_fingerprint
+
+        fp = lexicon_fingerprint(lex)  # one pass over the lexicon per sweep, not one per cache key
+    if workers <= 1:
+        lex = indexed_lexicon(lex)
+        for i, f in enumerate(forms):
+            s = _item_seed(f, seed, i)
+            if cache is not None:
+                yield cache.get_or_compute(f, lex, s, max_steps, lex_fingerprint=fp)
+            elif lazy:
+                yield iter_series(f, lex, max_steps, seed=s)
+            else:
+                yield generate_series(f, lex, max_steps, seed=s)
+        return
+
+    chunk_size = max(1, chunk_size)
+    # each pending entry: (per-form results with None for misses, cache keys, future)
+    pending: Deque[Tuple[List[Any], List[Optional[str]], Optional[Future]]] = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(lex, max_steps)) as ex:
+
+        def drain() -> Iterator[List[Dict[str, Any]]]:
+            results, keys, fut = pending.popleft()
+            if fut is not None:
+                computed = iter(fut.result())
+                for j, r in enumerate(results):
+                    if r is None:
+                        results[j] = _restore_skip(next(computed))
+                        if cache is not None:
+                            cache.put(keys[j], results[j])
+            yield from results
+
+        for start, chunk in _chunks(forms, chunk_size):
+            results: List[Any] = [None] * len(chunk)
+            keys: List[Optional[str]] = [None] * len(chunk)
+            jobs = []
+            for j, f in enumerate(chunk):
+                s = _item_seed(f, seed, start + j)
+                if cache is not None:
+                    keys[j] = cache.key(f, lex, s, max_steps, lex_fingerprint=fp)
+                    results[j] = cache.get(keys[j])
+                if results[j] is None:
+                    jobs.append((preset_to_dict(f), s))
+            pending.append((results, keys, ex.submit(_run_chunk, jobs) if jobs else None))
+            if len(pending) >= workers * 2:
+                yield from drain()
+        while pending:
+            yield from drain()
@@ -0,0 +1,41 @@
+from hypna.engine import CURVES, SKIP, Evolve, Form, compile_prompt
+from hypna.sweep import form_grid, style_token_combinations, sweep
+
+LEX = {f"sym{i}": f"meaning {i}" for i in range(50)}
+
+
+def _grid():
+    base = Form(inject_symbols=True)
+    base.evolve.steps = 3
+    return list(form_grid(base, {"hallucination": [10, 55, 90], "evolve.curve": CURVES}))
+
+
+def test_form_grid_product_order_and_isolation():
+    grid = _grid()
+    assert len(grid) == 15
+    assert (grid[0].hallucination, grid[0].evolve.curve) == (10, "linear")
+    assert (grid[1].hallucination, grid[1].evolve.curve) == (10, "ease-in")
+    assert grid[0].evolve is not grid[1].evolve
+
+
+def test_style_token_combinations_counts_all_subsets():
+    assert len(style_token_combinations()) == 2 ** 6 - 1
+    assert style_token_combinations(["A", "B"]) == ["A", "B", "A, B"]
+
+
+def test_sweep_is_ordered_and_reproducible_across_worker_counts():
+    prompts = lambda runs: [[st["prompt"] for st in s] for s in runs]
+    serial = prompts(sweep(_grid(), LEX, workers=1, seed=7))
+    pooled = prompts(sweep(_grid(), LEX, workers=2, chunk_size=4, seed=7))
+    assert serial == pooled
+    assert serial[0] != prompts(sweep(_grid(), LEX, workers=1, seed=8))[0]
+
+
+def test_pooled_sweep_keeps_skip_and_skip_text_apart():
+    forms = [Form(subject="Skip", notes="skip", temporal=SKIP, evolve=Evolve(steps=2)), Form(material=SKIP)]
+    serial = list(sweep(forms, workers=1, seed=3))
+    pooled = list(sweep(forms, workers=2, chunk_size=1, seed=3))
+    assert pooled == serial
+    assert pooled[0][0]["temporal"] is SKIP and pooled[1][0]["material"] is SKIP
+    assert compile_prompt(pooled[0][0]) == serial[0][0]["prompt"]
+    assert "subject: Skip" in pooled[0][0]["prompt"] and SKIP not in pooled[0][0]["prompt"]
@@ -0,0 +1,45 @@
+import json
+import os
+
+from hypna.engine import (
+    SKIP,
+    compile_prompt,
+    compute_state,
+    form_from_dict,
+    generate_series,
+    prompt_shape,
+    prompt_template,
+    render_prompt,
+)
+from hypna.sweep import form_grid
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "testdata", "golden_prompts.json")
+
+
+def test_golden_prompts():
+    with open(GOLDEN, encoding="utf-8") as f:
+        cases = json.load(f)
+    for case in cases:
+        form = form_from_dict(case["form"])
+        assert [st["prompt"] for st in generate_series(form, {})] == case["prompts"], case["form"]
+
+
+def test_render_prompt_matches_compile_prompt_across_shapes():
+    base = form_from_dict({"notes": "n", "vibe_description": "v", "plate_map": "a\nb"})
+    grid = form_grid(base, {
+        "mode": ["FULL", "PRINT", "LIVE"],
+        "temporal": ["", SKIP, None, 3],
+        "arcane_enabled": [True, False],
+        "color_enabled": [True, False],
+        "painting.influence": ["NONE", SKIP, None, "Rothko-like fields (not imitation)"],
+        "humanizer.qualities": [{}, {"smudge": True, "ghosting": True}],
+    })
+    for form in grid:
+        for i in range(3):
+            st = compute_state(form, i, 3, {"glyph": "eye"})
+            assert render_prompt(st) == compile_prompt(st)
+
+
+def test_templates_are_cached_per_shape():
+    st = compute_state(form_from_dict({}), 0, 1, {})
+    assert prompt_template(prompt_shape(st)) is prompt_template(prompt_shape(st))
@@ -0,0 +1,82 @@
+"""
+Startup / phase timing.
+
+Phases are recorded on a monotonic clock (`time.perf_counter`) into the
+process-wide `TIMING` timeline. Recording is a few clock reads per phase, so
+it is always on; the report is opt-in: set HYPNA_TIMING=1 to print JSON to
+stderr on exit, or HYPNA_TIMING=path.json to write it to a file (the GUI also
+takes `--timing[=PATH]`).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+ENV_VAR = "HYPNA_TIMING"
+
+
+class Timeline:
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.dest: Optional[str] = None
+
+    def record(self, name: str, start: float, end: Optional[float] = None) -> None:
+        """Record a phase from perf_counter() readings; `end` defaults to now."""
+        end = time.perf_counter() if end is None else end
+        self.t0 = min(self.t0, start)
+        self.events.append({"name": name, "start": start, "end": end})
+
+    def mark(self, name: str) -> None:
+        """Record an instant (e.g. first paint)."""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def as_dict(self) -> Dict[str, Any]:
+        events = [
+            {
+                "name": e["name"],
+                "start_ms": round((e["start"] - self.t0) * 1e3, 3),
+                "ms": round((e["end"] - e["start"]) * 1e3, 3),
+            }
+            for e in sorted(self.events, key=lambda e: e["start"])
+        ]
+        end = max((e["end"] for e in self.events), default=self.t0)
+        return {"pid": os.getpid(), "total_ms": round((end - self.t0) * 1e3, 3), "events": events}
+
+    def enable(self, dest: str = "-") -> None:
+        """Dump the timeline on exit, to stderr ("-") or a JSON file."""
+        if self.dest is None:
+            atexit.register(self.dump)
+        self.dest = dest
+
+    def dump(self) -> None:
+        if self.dest is None:
+            return
+        data = json.dumps(self.as_dict(), indent=2)
+        if self.dest == "-":
+            sys.stderr.write(data + "\n")
+        else:
+            with open(self.dest, "w", encoding="utf-8") as f:
+                f.write(data + "\n")
+
+
+TIMING = Timeline()
+
+_env = os.environ.get(ENV_VAR, "")
+if _env and _env != "0":
+    TIMING.enable("-" if _env in ("1", "-", "stderr") else _env)
@@ -0,0 +1,25 @@
+import json
+import time
+
+from hypna.timing import Timeline
+
+
+def test_phases_are_reported_relative_to_the_earliest_start(tmp_path):
+    tl = Timeline()
+    origin = time.perf_counter() - 0.5  # e.g. taken before the imports
+    tl.record("import", origin, origin + 0.25)
+    with tl.phase("layout"):
+        pass
+    tl.mark("painted")
+    data = tl.as_dict()
+    assert [e["name"] for e in data["events"]] == ["import", "layout", "painted"]
+    assert data["events"][0] == {"name": "import", "start_ms": 0.0, "ms": 250.0}
+    assert data["events"][2]["ms"] == 0.0
+    assert data["total_ms"] >= 500.0
+
+    out = tmp_path / "timing.json"
+    tl.dump()  # not enabled: no output
+    assert not out.exists()
+    tl.enable(str(out))
+    tl.dump()
+    assert json.loads(out.read_text())["events"][1]["name"] == "layout"
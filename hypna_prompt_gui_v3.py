@@ -14,688 +14,77 @@ Modernized UI:
 
 from __future__ import annotations
 
-import json
-import math
-import random
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-SKIP = "__SKIP__"
-
-BOOTLOADER_TEXT = """===============================
-HYPNAGNOSIS SYSTEM — BOOTLOADER
-===============================
-HANDRAW-HUMAN is always enforced:
-- human-made drawing/print; pressure variation; wobble; redraws; imperfect edges; no sterile vector sheen.
-
-Input conventions:
-- blank = AUTOFILL
-- SKIP = omit that parameter line
-- NONE = neutralize / disable that module or parameter
-
-If user did not specify required minimums, ask for:
-1) MODE (FULL/STYLE/GESTURE/PRINT/LIVE)
-2) Subject (unless STYLE/GESTURE/PRINT only)
-3) Hallucination % (0–100)
-
-END BOOTLOADER
-"""
-
-SYSTEM_FILE_TEXT = """=========================================
-HYPNAGNOSIS SYSTEM FILE — v2
-=========================================
-MODES
-- [HYPNA/FULL]     Full stack
-- [HYPNA/STYLE]    Style-only
-- [HYPNA/GESTURE]  Gesture-only
-- [HYPNA/PRINT]    Print/plates-only
-- [HYPNA/LIVE]     Live evolving series
-
-VIBE REFERENCES
-- Provide a vibe description and optionally attached images.
-- Images are vibe-only; never copy composition or elements.
-
-HUMANIZER
-- Humanizer range controls how visibly human/physical the making is.
-- Qualities toggle specific human artifacts (smudge, redraws, hesitation, etc.)
-
-EXPORTS
-- Every module has Copy/Save exports (no export tab).
-
-END SYSTEM FILE
-"""
-
-STYLE_TOKENS: Dict[str, str] = {
-    "STYLE.HYPNAGOGIC": "porous perception, threshold drift, waking/dream seam, sensory instability",
-    "STYLE.OCCULT": "sigil-grammar, ritual diagram logic, correspondence pressure, symbolic recursion",
-    "STYLE.NEWWEIRD": "ontology fracture, non-human logic, liminal infrastructures, wrongness-without-reveal",
-    "STYLE.PRINT": "overprint thinking, misregistration drift, plate logic, physical ink behavior",
-    "STYLE.GRAPHIC_SCORE": "score-as-image, performable reading paths, time/intensity vectors, instructional ambiguity",
-    "STYLE.CONSPIRACY_DIAGRAM": "Lombardi-like map logic: arcs, nodes, annotations, evidence lines, ambiguity without resolution",
-}
-
-PAINTING_INFLUENCES = [
-    "NONE",
-    "Bacon-like corporeal pressure (not imitation)",
-    "Basquiat-like raw mark language (not imitation)",
-    "Brus-like gestural abrasion (not imitation)",
-    "De Kooning-like smears (not imitation)",
-    "Goya-like chiaroscuro dread (not imitation)",
-    "Turner-like atmospheric wash (not imitation)",
-    "Rothko-like fields (not imitation)",
-    "Abstract expressionist scrape (not imitation)",
-]
-
-HUMANIZER_QUALITIES = [
-    ("wobble_lines", "Wobble lines"),
-    ("hesitation", "Hesitation marks"),
-    ("redraws", "Visible redraws"),
-    ("smudge", "Smudge / rub"),
-    ("drybrush", "Drybrush / broken ink"),
-    ("misregistration", "Misregistration drift"),
-    ("paper_tooth", "Paper tooth / grain"),
-    ("ghosting", "Ghosting / plate memory"),
-    ("overpaint", "Overpaint / correction"),
-    ("tape_edges", "Tape edges / masking"),
-    ("stipple_noise", "Stipple / noise fill"),
-    ("bleed", "Ink bleed / feather"),
-]
-
-
-# -----------------------------
-# Helpers
-# -----------------------------
-def parse_cell(s: str) -> Union[str, None, object]:
-    s = (s or "").strip()
-    if s == "":
-        return ""  # autofill
-    sl = s.lower()
-    if sl == "skip":
-        return SKIP
-    if sl == "none":
-        return None
-    return s
-
-def parse_int_cell(s: str) -> Union[int, None, object, str]:
-    v = parse_cell(s)
-    if v in (SKIP, None):
-        return v
-    if v == "":
-        return ""
-    try:
-        return int(str(v))
-    except Exception:
-        return ""
-
-def clamp(n: int, lo: int = 0, hi: int = 100) -> int:
-    return max(lo, min(hi, n))
-
-def is_omitted(v: Any) -> bool:
-    return v is None or v is SKIP
-
-def kv(key: str, val: Any) -> Optional[str]:
-    if is_omitted(val) or val == "":
-        return None
-    return f"{key}: {val}"
-
-def block(title: str, lines: List[Optional[str]]) -> str:
-    clean = [ln for ln in lines if ln and str(ln).strip()]
-    if not clean:
-        return ""
-    return "\n".join([title] + clean)
-
-def expand_style_tokens(token_csv: str) -> str:
-    toks = [t.strip() for t in (token_csv or "").split(",") if t.strip()]
-    if not toks:
-        return ""
-    expanded = [STYLE_TOKENS.get(t, t) for t in toks]
-    return "; ".join(expanded)
-
-def auto_color_map(h: int) -> Tuple[str, str]:
-    if h < 25:
-        return ("monochrome graphite + faint wash", "mono")
-    if h < 50:
-        return ("limited 2–3 ink palette", "duotone")
-    if h < 75:
-        return ("riso overprint + visible misregistration", "tritone")
-    return ("unstable spectral overprint (still physical ink)", "quad")
-
-def curve_value(curve: str, t: float) -> float:
-    t = max(0.0, min(1.0, t))
-    c = (curve or "linear").lower().strip()
-    if c == "linear":
-        return t
-    if c == "ease-in":
-        return t * t
-    if c == "ease-out":
-        return 1 - (1 - t) * (1 - t)
-    if c in ("s-curve", "sigmoid"):
-        return t * t * (3 - 2 * t)
-    if c == "pulse":
-        return 0.5 - 0.5 * math.cos(2 * math.pi * t)
-    return t
-
-def default_from_h(h: int) -> Dict[str, Any]:
-    palette_desc, plate_palette = auto_color_map(h)
-    temporal = clamp(int(30 + 0.60 * h))
-    material = clamp(int(75 - 0.25 * h))
-    space = clamp(int(35 + 0.45 * h))
-    symbol = clamp(int(12 + 0.78 * h))
-    agency = clamp(int(65 - 0.30 * h))
-
-    saturation = "sparse" if h < 25 else "balanced" if h < 50 else "dense" if h < 75 else "overload"
-    motion = "still" if h < 20 else "flowing" if h < 45 else "kinetic" if h < 75 else "explosive"
-    form = "figurative" if h < 30 else "hybrid" if h < 70 else "field"
-    media = "graphite" if h < 25 else "ink" if h < 45 else "mixed" if h < 80 else "print"
-    palette = "mono" if h < 25 else "limited" if h < 50 else "riso" if h < 75 else "unstable"
-    surface = "clean" if h < 20 else "paper" if h < 55 else "aged" if h < 85 else "fractured"
-
-    coherence = clamp(int(90 - 0.70 * h))
-    recursion = clamp(int(5 + 0.85 * h))
-    grain = clamp(int(18 + 0.55 * h))
-    line_wobble = clamp(int(12 + 0.70 * h))
-    erasure = clamp(int(10 + 0.35 * h))
-    annotation = clamp(int(8 + 0.45 * h))
-    contrast = "high" if h >= 60 else "medium"
-    whiteness = "more white" if h < 70 else "white breaks"
-
-    return dict(
-        temporal=temporal, material=material, space=space, symbol=symbol, agency=agency,
-        saturation=saturation, motion=motion, form=form, media=media, palette=palette, surface=surface,
-        palette_desc=palette_desc, plate_palette=plate_palette,
-        coherence=coherence, recursion=recursion, grain=grain, line_wobble=line_wobble,
-        erasure=erasure, annotation=annotation, contrast=contrast, whiteness=whiteness,
-    )
-
-def state_defaults(i: int, n: int) -> Dict[str, Any]:
-    t = i / max(1, n - 1)
-    if t < 0.17:
-        return dict(label="ANCHOR", comp="centered", flow="stable horizon", transition="slip", time="normal")
-    if t < 0.33:
-        return dict(label="POROUS", comp="radial seep", flow="soft drift", transition="drift", time="slowed")
-    if t < 0.50:
-        return dict(label="WATCHER", comp="top-down pressure", flow="compression", transition="paralysis", time="stretched")
-    if t < 0.67:
-        return dict(label="COLLAPSE", comp="diagonal fall-lines", flow="gravity vectors", transition="collapse", time="fragmented")
-    if t < 0.84:
-        return dict(label="BLOOM", comp="spiral recursion", flow="nested rings", transition="loop", time="suspended")
-    return dict(label="RETURN", comp="evidence grid", flow="partial closure", transition="return", time="normal")
-
-def resolve(user_val: Any, default_val: Any) -> Any:
-    if user_val is SKIP:
-        return SKIP
-    if user_val is None:
-        return None
-    if user_val == "":
-        return default_val
-    return user_val
-
-def load_symbol_lexicon(path: str) -> Dict[str, Any]:
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            return data
-    except Exception:
-        pass
-    return {}
-
-def sample_symbols(lex: Dict[str, Any], k: int = 3) -> List[str]:
-    if not lex:
-        return []
-    keys = list(lex.keys())
-    random.shuffle(keys)
-    picked = keys[: max(0, min(k, len(keys)))]
-    out = []
-    for p in picked:
-        v = lex.get(p)
-        out.append(f"{p}={v}" if isinstance(v, str) else str(p))
-    return out
-
-
-# -----------------------------
-# Form Model
-# -----------------------------
-@dataclass
-class Humanizer:
-    level: Union[int, None, object, str] = ""
-    qualities: Dict[str, bool] = field(default_factory=lambda: {k: False for k, _ in HUMANIZER_QUALITIES})
-    notes: Union[str, None, object] = ""
-
-@dataclass
-class Painting:
-    influence: Union[str, None, object] = "NONE"
-    strength: Union[int, None, object, str] = ""
-    notes: Union[str, None, object] = ""
-
-@dataclass
-class Evolve:
-    enabled: bool = True
-    steps: Union[int, None, object, str] = "6"
-    path: Union[str, None, object] = ""
-    output: Union[str, None, object] = "staged"
-    focus: Union[str, None, object] = "total"
-    start_h: Union[int, None, object, str] = ""
-    end_h: Union[int, None, object, str] = ""
-    curve: Union[str, None, object] = "s-curve"
-    lock_anchor: Union[str, None, object] = "gesture+material"
-
-@dataclass
-class Mutate:
-    enabled: bool = False
-    strength: Union[int, None, object, str] = ""
-    drift: Union[str, None, object] = ""
-    velocity: Union[str, None, object] = ""
-    scope: Union[str, None, object] = ""
-    mode: Union[str, None, object] = ""
-    anchor: Union[str, None, object] = "gesture"
-    decay: Union[str, None, object] = "erode"
-    bifurcation: Union[str, None, object] = ""
-
-@dataclass
-class Form:
-    mode: str = "FULL"
-    subject: str = ""
-    style_tokens: str = ""
-    notes: str = ""
-
-    vibe_description: str = ""
-    vibe_image_list: str = ""
-
-    hallucination: Union[int, None, object, str] = "72"
-    temporal: Union[int, None, object, str] = ""
-    material: Union[int, None, object, str] = ""
-    space: Union[int, None, object, str] = ""
-    symbol: Union[int, None, object, str] = ""
-    agency: Union[int, None, object, str] = ""
-    saturation: Union[str, None, object] = ""
-    motion: Union[str, None, object] = ""
-    form: Union[str, None, object] = ""
-    media: Union[str, None, object] = ""
-    palette: Union[str, None, object] = ""
-    surface: Union[str, None, object] = ""
-    coherence: Union[int, None, object, str] = ""
-    recursion: Union[int, None, object, str] = ""
-    grain: Union[int, None, object, str] = ""
-    line_wobble: Union[int, None, object, str] = ""
-    erasure: Union[int, None, object, str] = ""
-    annotation: Union[int, None, object, str] = ""
-
-    state_geometry: Union[str, None, object] = ""
-    transition_mode: Union[str, None, object] = ""
-    state_name_override: Union[str, None, object] = ""
-
-    comp_mode: Union[str, None, object] = "auto"
-    composition: Union[str, None, object] = ""
-    tension: Union[str, None, object] = ""
-    flow: Union[str, None, object] = ""
-    framing: Union[str, None, object] = ""
-    horizon: Union[str, None, object] = ""
-    scale_logic: Union[str, None, object] = ""
-
-    gesture_mode: Union[str, None, object] = "auto"
-    pressure: Union[str, None, object] = ""
-    tempo: Union[str, None, object] = ""
-    jitter: Union[str, None, object] = ""
-    stroke_memory: Union[str, None, object] = ""
-    interruption: Union[str, None, object] = ""
-    hatch_density: Union[str, None, object] = ""
-
-    arcane_enabled: bool = True
-    arcane_mode: Union[str, None, object] = "occult, mythological, symbolic, new weird system"
-
-    sleep_enabled: bool = True
-    neuro_state: Union[str, None, object] = "cataplexy + sleep paralysis + hypnagogia"
-    motor: Union[int, None, object, str] = ""
-    presence: Union[int, None, object, str] = ""
-    visual_drift: Union[int, None, object, str] = ""
-    auditory: Union[str, None, object] = ""
-    affect: Union[str, None, object] = ""
-
-    color_enabled: bool = True
-    color_mode: Union[str, None, object] = "adaptive"
-    color_evolution: Union[str, None, object] = ""
-    palette_lock: Union[str, None, object] = ""
-    contrast: Union[str, None, object] = ""
-    whiteness: Union[str, None, object] = ""
-
-    print_enabled: bool = False
-    plates_enabled: bool = False
-    print_mode: Union[str, None, object] = ""
-    registration: Union[str, None, object] = ""
-    texture: Union[str, None, object] = ""
-    plate_count: Union[int, None, object, str] = ""
-    plate_logic: Union[str, None, object] = ""
-    registration_map: Union[str, None, object] = ""
-    overprint: Union[str, None, object] = ""
-    plate_map: str = ""
-
-    evolve: Evolve = field(default_factory=Evolve)
-    mutate: Mutate = field(default_factory=Mutate)
-    humanizer: Humanizer = field(default_factory=Humanizer)
-    painting: Painting = field(default_factory=Painting)
-
-    inject_symbols: bool = False
-    symbols_per_state: int = 3
-
-
-# -----------------------------
-# Engine
-# -----------------------------
-def compute_state(form: Form, i: int, n: int, lex: Dict[str, Any]) -> Dict[str, Any]:
-    base_h_user = form.hallucination
-    base_h = 70
-    if isinstance(base_h_user, int):
-        base_h = base_h_user
-    elif isinstance(base_h_user, str) and base_h_user.strip().isdigit():
-        base_h = int(base_h_user.strip())
-
-    sh = resolve(form.evolve.start_h, clamp(base_h - 20))
-    eh = resolve(form.evolve.end_h, clamp(base_h + 20))
-    cv = resolve(form.evolve.curve, "s-curve")
-
-    if form.evolve.enabled and isinstance(sh, int) and isinstance(eh, int) and n > 1:
-        tt = curve_value(str(cv), i / max(1, n - 1))
-        h = clamp(int(sh + (eh - sh) * tt))
-    else:
-        h = clamp(base_h)
-
-    dh = default_from_h(h)
-    sd = state_defaults(i, n)
-
-    state_name = sd["label"]
-    if not is_omitted(form.state_name_override) and str(form.state_name_override).strip():
-        state_name = str(form.state_name_override).strip()
-
-    style_expanded = expand_style_tokens(form.style_tokens)
-
-    injected = []
-    if form.inject_symbols and lex:
-        injected = sample_symbols(lex, k=max(0, int(form.symbols_per_state)))
-
-    hum_level = resolve(form.humanizer.level, clamp(int(25 + 0.60*h)))
-    paint_infl = resolve(form.painting.influence, "NONE")
-    paint_strength = resolve(form.painting.strength, clamp(int(15 + 0.40*h))) if paint_infl != "NONE" else None
-
-    include_subject = form.mode not in ("STYLE","GESTURE","PRINT") and bool(form.subject.strip())
-
-    mutate_enabled = form.mutate.enabled or (form.mode == "LIVE")
-    mutate_strength_default = clamp(int(20 + 0.70*h + 10*(i/max(1,n-1))))
-    mutate_strength = resolve(form.mutate.strength, mutate_strength_default)
-
-    return dict(
-        index=i+1,
-        mode=form.mode,
-        include_subject=include_subject,
-        subject=form.subject.strip(),
-        style_expanded=style_expanded,
-        injected_symbols=injected,
-        vibe_description=form.vibe_description.strip(),
-        vibe_images=form.vibe_image_list.strip(),
-
-        hallucination=resolve(form.hallucination, h),
-        temporal=resolve(form.temporal, dh["temporal"]),
-        material=resolve(form.material, dh["material"]),
-        space=resolve(form.space, dh["space"]),
-        symbol=resolve(form.symbol, dh["symbol"]),
-        agency=resolve(form.agency, dh["agency"]),
-        saturation=resolve(form.saturation, dh["saturation"]),
-        motion=resolve(form.motion, dh["motion"]),
-        form=resolve(form.form, dh["form"]),
-        media=resolve(form.media, dh["media"]),
-        palette=resolve(form.palette, dh["palette"]),
-        surface=resolve(form.surface, dh["surface"]),
-        coherence=resolve(form.coherence, dh["coherence"]),
-        recursion=resolve(form.recursion, dh["recursion"]),
-        grain=resolve(form.grain, dh["grain"]),
-        line_wobble=resolve(form.line_wobble, dh["line_wobble"]),
-        erasure=resolve(form.erasure, dh["erasure"]),
-        annotation=resolve(form.annotation, dh["annotation"]),
-        auto_color=dh["palette_desc"],
-        contrast=resolve(form.contrast, dh["contrast"]),
-        whiteness=resolve(form.whiteness, dh["whiteness"]),
-
-        state_name=state_name,
-        state_geometry=resolve(form.state_geometry, "spiral" if n > 1 else "linear"),
-        transition_mode=resolve(form.transition_mode, "drift" if n > 1 else "continuous"),
-
-        comp_mode=resolve(form.comp_mode, "auto"),
-        composition=resolve(form.composition, sd["comp"]),
-        tension=resolve(form.tension, "high" if h >= 55 else "medium"),
-        flow=resolve(form.flow, sd["flow"]),
-        framing=resolve(form.framing, "tight" if sd["label"] in ("WATCHER","COLLAPSE") else "open"),
-        horizon=resolve(form.horizon, "tilted" if sd["label"] in ("COLLAPSE","BLOOM") else "stable"),
-        scale_logic=resolve(form.scale_logic, "nested" if h >= 60 else "single-plane"),
-
-        gesture_mode=resolve(form.gesture_mode, "auto"),
-        pressure=resolve(form.pressure, "spike" if sd["label"] in ("COLLAPSE","BLOOM") else "pulse"),
-        tempo=resolve(form.tempo, "erratic" if h >= 70 else "moderate"),
-        jitter=resolve(form.jitter, "micro" if h < 60 else "high"),
-        stroke_memory=resolve(form.stroke_memory, "echo" if h >= 55 else "light"),
-        interruption=resolve(form.interruption, "stutter" if sd["label"] in ("WATCHER","COLLAPSE") else "soft"),
-        hatch_density=resolve(form.hatch_density, "dense" if h >= 55 else "balanced"),
-
-        arcane_enabled=form.arcane_enabled,
-        arcane_mode=resolve(form.arcane_mode, "occult, mythological, symbolic, new weird system"),
-
-        sleep_enabled=form.sleep_enabled,
-        neuro_state=resolve(form.neuro_state, "cataplexy + sleep paralysis + hypnagogia"),
-        motor=resolve(form.motor, clamp(int(20 + 0.55*h))),
-        presence=resolve(form.presence, clamp(int(12 + 0.70*h))),
-        visual_drift=resolve(form.visual_drift, clamp(int(15 + 0.60*h))),
-        auditory=resolve(form.auditory, "low hum" if h < 70 else "intrusive signal"),
-        affect=resolve(form.affect, "uncanny" if h < 55 else "dread"),
-
-        color_enabled=form.color_enabled,
-        color_mode=resolve(form.color_mode, "adaptive"),
-        color_evolution=resolve(form.color_evolution, "deepening" if n > 1 else "phase"),
-        palette_lock=resolve(form.palette_lock, ""),
-
-        print_enabled=form.print_enabled or (form.mode == "PRINT"),
-        plates_enabled=form.plates_enabled or (form.mode == "PRINT"),
-        print_mode=resolve(form.print_mode, "riso" if h >= 50 else "hybrid-print"),
-        registration=resolve(form.registration, "loose" if h >= 55 else "slight"),
-        texture=resolve(form.texture, "paper tooth"),
-        plate_count=resolve(form.plate_count, 3 if dh["plate_palette"] in ("duotone","tritone") else 4),
-        plate_logic=resolve(form.plate_logic, "structural" if h < 60 else "symbolic"),
-        registration_map=resolve(form.registration_map, "progressive-drift"),
-        overprint=resolve(form.overprint, "unstable"),
-        plate_map=form.plate_map.strip(),
-
-        evolve_enabled=form.evolve.enabled,
-        evolve_steps=resolve(form.evolve.steps, 6 if form.mode == "LIVE" else 1),
-        evolve_path=resolve(form.evolve.path, "collapse" if form.mode == "LIVE" else "spiral"),
-
-        mutate_enabled=mutate_enabled,
-        mutate_strength=mutate_strength,
-        mutate_drift=resolve(form.mutate.drift, "high" if h >= 55 else "medium"),
-        mutate_velocity=resolve(form.mutate.velocity, "erratic" if h >= 70 else "moderate"),
-        mutate_scope=resolve(form.mutate.scope, "total" if h >= 60 else "spatial"),
-        mutate_mode=resolve(form.mutate.mode, "recursive" if h >= 70 else "organic"),
-        mutate_anchor=resolve(form.mutate.anchor, "gesture"),
-        mutate_decay=resolve(form.mutate.decay, "erode"),
-        mutate_bifurcation=resolve(form.mutate.bifurcation, "bifurcate" if h >= 65 else "minor"),
-
-        humanizer_level=hum_level,
-        humanizer_qualities=form.humanizer.qualities,
-        humanizer_notes=resolve(form.humanizer.notes, ""),
-
-        painting_influence=paint_infl,
-        painting_strength=paint_strength,
-        painting_notes=resolve(form.painting.notes, ""),
-
-        notes=form.notes.strip(),
-    )
-
-def compile_prompt(st: Dict[str, Any]) -> str:
-    out: List[str] = []
-    out.append("HANDRAW-HUMAN")
-
-    if st.get("include_subject"):
-        out.append(f"subject: {st['subject']}")
-
-    if st.get("style_expanded"):
-        out.append(f"style: {st['style_expanded']}")
-
-    vibe_lines: List[Optional[str]] = []
-    if st.get("vibe_description"):
-        vibe_lines.append(f"vibe-description: {st['vibe_description']}")
-    if st.get("vibe_images"):
-        vibe_lines.append("vibe-images-to-attach: " + st["vibe_images"])
-    if vibe_lines:
-        vibe_lines.append("rule: use vibe images for texture/mark/palette/atmosphere only — do not copy composition, figures, or layout.")
-        out.append(block("VIBE-REFERENCE", vibe_lines))
-
-    if st.get("injected_symbols"):
-        out.append("symbol-lexicon-injection: " + ", ".join(st["injected_symbols"]))
-
-    out.append(block("HYPNA-MATRIX", [
-        kv("hallucination", st["hallucination"]),
-        kv("temporal", st["temporal"]),
-        kv("material", st["material"]),
-        kv("space", st["space"]),
-        kv("symbol", st["symbol"]),
-        kv("agency", st["agency"]),
-        kv("saturation", st["saturation"]),
-        kv("motion", st["motion"]),
-        kv("form", st["form"]),
-        kv("media", st["media"]),
-        kv("palette", st["palette"]),
-        kv("surface", st["surface"]),
-        kv("coherence", st["coherence"]),
-        kv("recursion", st["recursion"]),
-        kv("grain", st["grain"]),
-        kv("line-wobble", st["line_wobble"]),
-        kv("erasure", st["erasure"]),
-        kv("annotation", st["annotation"]),
-        kv("auto-color", st["auto_color"]),
-    ]))
-
-    out.append(block("STATE-MAP", [
-        kv("state-name", st["state_name"]),
-        kv("state-geometry", st["state_geometry"]),
-        kv("transition-mode", st["transition_mode"]),
-    ]))
-
-    out.append(block("COMPOSITION", [
-        kv("comp-mode", st["comp_mode"]),
-        kv("composition", st["composition"]),
-        kv("tension", st["tension"]),
-        kv("flow", st["flow"]),
-        kv("framing", st["framing"]),
-        kv("horizon", st["horizon"]),
-        kv("scale-logic", st["scale_logic"]),
-    ]))
-
-    out.append(block("GESTURE", [
-        kv("gesture-mode", st["gesture_mode"]),
-        kv("pressure", st["pressure"]),
-        kv("tempo", st["tempo"]),
-        kv("jitter", st["jitter"]),
-        kv("stroke-memory", st["stroke_memory"]),
-        kv("interruption", st["interruption"]),
-        kv("hatch-density", st["hatch_density"]),
-    ]))
-
-    if st.get("arcane_enabled"):
-        out.append(block("ARCANE-LAYER", [
-            kv("arcane-mode", st["arcane_mode"]),
-        ]))
-
-    if st.get("sleep_enabled"):
-        out.append(block("SLEEP-STATE", [
-            kv("neuro-state", st["neuro_state"]),
-            kv("motor", st["motor"]),
-            kv("presence", st["presence"]),
-            kv("visual-drift", st["visual_drift"]),
-            kv("auditory", st["auditory"]),
-            kv("affect", st["affect"]),
-        ]))
-
-    if st.get("color_enabled"):
-        out.append(block("AUTO-COLOR", [
-            kv("mode", st["color_mode"]),
-            kv("evolution", st["color_evolution"]),
-            kv("palette-lock", st["palette_lock"]),
-            kv("contrast", st["contrast"]),
-            kv("whiteness", st["whiteness"]),
-        ]))
-
-    q_on = [label for key, label in HUMANIZER_QUALITIES if st["humanizer_qualities"].get(key)]
-    out.append(block("HUMANIZER", [
-        kv("humanizer-level(0-100)", st["humanizer_level"]),
-        ("qualities: " + ", ".join(q_on)) if q_on else None,
-        kv("humanizer-notes", st["humanizer_notes"]),
-    ]))
-
-    if st.get("painting_influence") and st["painting_influence"] != "NONE":
-        out.append(block("PAINTING-INFLUENCE", [
-            kv("influence", st["painting_influence"]),
-            kv("strength(0-100)", st["painting_strength"]),
-            kv("notes", st["painting_notes"]),
-            "rule: influence is about mark-energy + material behavior, not copying any single painting.",
-        ]))
-
-    if st.get("evolve_enabled"):
-        out.append(block("AUTO-EVOLVE", [
-            kv("steps", st["evolve_steps"]),
-            kv("path", st["evolve_path"]),
-        ]))
-
-    if st.get("mutate_enabled"):
-        out.append(block("AUTO-MUTATE", [
-            kv("strength(0-100)", st["mutate_strength"]),
-            kv("drift", st["mutate_drift"]),
-            kv("velocity", st["mutate_velocity"]),
-            kv("scope", st["mutate_scope"]),
-            kv("mode", st["mutate_mode"]),
-        ]))
-
-    if st.get("print_enabled"):
-        out.append(block("PRINT-LAYER", [
-            kv("print-mode", st["print_mode"]),
-            kv("registration", st["registration"]),
-            kv("texture", st["texture"]),
-        ]))
-
-    if st.get("plates_enabled"):
-        plate_lines = [
-            kv("plate-count", st["plate_count"]),
-            kv("plate-logic", st["plate_logic"]),
-            kv("registration-map", st["registration_map"]),
-            kv("overprint", st["overprint"]),
-        ]
-        pm = st.get("plate_map", "")
-        if pm:
-            plate_lines.append("plate-map:")
-            for ln in str(pm).splitlines():
-                if ln.strip():
-                    plate_lines.append("  " + ln.strip())
-        out.append(block("PLATE-GEN", plate_lines))
-
-    if st.get("notes"):
-        out.append("notes: " + st["notes"])
-
-    return "\n\n".join([x for x in out if x and str(x).strip()])
-
-
-def generate_series(form: Form, lex: Dict[str, Any]) -> List[Dict[str, Any]]:
-    steps = 1
-    if form.evolve.enabled:
-        sv = form.evolve.steps
-        if sv in (None, SKIP, ""):
-            steps = 6 if form.mode == "LIVE" else 1
-        else:
-            steps = max(1, min(20, int(sv)))
-    states: List[Dict[str, Any]] = []
-    for i in range(steps):
-        st = compute_state(form, i, steps, lex)
-        st["prompt"] = compile_prompt(st)
-        states.append(st)
-    return states
+import time
+_t_start = time.perf_counter()  # startup timeline origin (see hypna.timing)
 
+import argparse
+import copy
+import io
+import sqlite3
+import tkinter as tk
+from contextlib import contextmanager
+from tkinter import ttk, filedialog, messagebox, simpledialog
+from typing import Any, Callable, Dict, List, Optional, Tuple
+_t_tk = time.perf_counter()
+
+from hypna.engine import (
+    SKIP,
+    BOOTLOADER_TEXT,
+    SYSTEM_FILE_TEXT,
+    STYLE_TOKENS,
+    PAINTING_INFLUENCES,
+    HUMANIZER_QUALITIES,
+    parse_cell,
+    parse_int_cell,
+    format_cell,
+    clamp,
+    is_omitted,
+    kv,
+    block,
+    expand_style_tokens,
+    auto_color_map,
+    curve_value,
+    default_from_h,
+    state_defaults,
+    resolve,
+    SymbolLexicon,
+    load_symbol_lexicon,
+    sample_symbols,
+    Humanizer,
+    Painting,
+    Evolve,
+    Mutate,
+    Form,
+    compute_state,
+    compile_prompt,
+    generate_series,
+    iter_series,
+    series_state,
+    series_length,
+    MAX_STEPS,
+    LIVE_MAX_STEPS,
+)
+from hypna.columnar import write_columnar
+from hypna.export import STATE_HEADER, open_export, write_full_doc, write_prompts
+from hypna.incremental import IncrementalSeries
+from hypna.jobs import JobRunner
+from hypna.presets import PresetInfo, PresetLibrary
+from hypna.timing import TIMING
+
+TIMING.record("import tkinter", _t_start, _t_tk)
+TIMING.record("import hypna", _t_tk)
+
+# output panel: states materialized per page, inserted a few at a time
+OUTPUT_PAGE_STATES = 25
+OUTPUT_CHUNK_STATES = 5
+# live preview waits this long after the last edit before recompiling
+LIVE_PREVIEW_DEBOUNCE_MS = 250
+# cards filled in before the first paint (roughly what fits on screen)
+STARTUP_CARDS = 3
+# Save/Export compress when the chosen name ends in .gz/.bz2/.xz
+EXPORT_FILETYPES = [("Text", "*.txt"), ("Compressed text", "*.txt.gz *.txt.bz2 *.txt.xz"), ("All", "*.*")]
+# preset browser rows; the count label still reports every match
+PRESET_LIST_LIMIT = 500
 
 # -----------------------------
 # Modern UI building blocks
@@ -704,7 +93,8 @@ class Scrollable(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.canvas = tk.Canvas(self, highlightthickness=0, bd=0)
-        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.on_scroll: Optional[Callable[[], None]] = None  # fired on user scrolling
         self.inner = ttk.Frame(self.canvas)
 
         self.inner.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
@@ -722,6 +112,15 @@ class Scrollable(ttk.Frame):
 
     def _on_mousewheel(self, e):
         self.canvas.yview_scroll(int(-1 * (e.delta / 120)), "units")
+        self._scrolled()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._scrolled()
+
+    def _scrolled(self):
+        if self.on_scroll:
+            self.on_scroll()
 
 
 class App:
@@ -731,12 +130,32 @@ class App:
         self.root.geometry("1400x900")
         self.root.minsize(1200, 760)
 
-        self.lexicon: Dict[str, Any] = {}
+        self.lexicon: SymbolLexicon = SymbolLexicon()
         self.series: List[Dict[str, Any]] = []
+        self._show_all = False
+        self._page = 0
+        self._render_token = 0
         self.dark = tk.BooleanVar(value=True)
-
-        self._style()
-        self._layout()
+        # engine + file work runs here; results come back via _poll_jobs
+        self.jobs = JobRunner()
+        self._polling = False
+        # live preview: edits set _dirty, a debounce timer recompiles
+        self.live_preview = tk.BooleanVar(value=False)
+        self._dirty = False
+        self._watched: List[tk.Variable] = []
+        self._preview_after = None
+        self._compiler = IncrementalSeries()
+        self._batching = False
+        # presets: library opened on first use; the last applied Form backs
+        # cards that weren't built yet and fields without a widget
+        self.presets: Optional[PresetLibrary] = None
+        self._preset_form: Optional[Form] = None
+
+        with TIMING.phase("_style"):
+            self._style()
+        with TIMING.phase("_layout"):
+            self._layout()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
     # ---------- style ----------
     def _style(self):
@@ -753,7 +172,8 @@ class App:
         self.font_title = ("Helvetica", 13, "bold")
         self.font_small = ("Helvetica", 10)
 
-        self._apply_theme()
+        with TIMING.phase("_apply_theme"):
+            self._apply_theme()
 
     def _apply_theme(self):
         dark = bool(self.dark.get())
@@ -836,6 +256,7 @@ class App:
         right.pack(side="right")
 
         ttk.Checkbutton(right, text="Dark", variable=self.dark, command=self._toggle_theme).pack(side="right", padx=(12, 0))
+        ttk.Checkbutton(right, text="Live", variable=self.live_preview, command=self._toggle_live).pack(side="right", padx=(12, 0))
         ttk.Button(right, text="Generate", style="Primary.TButton", command=self.generate).pack(side="right", padx=6)
         ttk.Button(right, text="Series", command=self.generate_series).pack(side="right", padx=6)
         ttk.Button(right, text="Copy", command=self.copy_output).pack(side="right", padx=6)
@@ -864,19 +285,32 @@ class App:
         out_panel.columnconfigure(0, weight=1)
 
         ttk.Label(out_panel, text="Output", style="Panel.TLabel", font=self.font_title).grid(row=0, column=0, sticky="w", pady=(0, 8))
+        nav = ttk.Frame(out_panel, style="Panel.TFrame")
+        nav.grid(row=0, column=1, sticky="e", pady=(0, 8))
+        self.page_label = tk.StringVar(value="")
+        ttk.Label(nav, textvariable=self.page_label, style="Panel.TLabel", foreground=self.colors["muted"]).pack(side="left", padx=(0, 8))
+        ttk.Button(nav, text="◀", width=3, command=lambda: self._turn_page(-1)).pack(side="left")
+        ttk.Button(nav, text="▶", width=3, command=lambda: self._turn_page(1)).pack(side="left", padx=(2, 8))
+        self.jump_entry = ttk.Entry(nav, width=6)
+        self.jump_entry.pack(side="left")
+        self.jump_entry.bind("<Return>", lambda e: self.jump_to_state())
+        ttk.Button(nav, text="Go", width=4, command=self.jump_to_state).pack(side="left", padx=(2, 0))
         self.output = tk.Text(out_panel, wrap="word", height=10, bd=0, highlightthickness=1)
-        self.output.grid(row=1, column=0, sticky="nsew")
+        self.output.grid(row=1, column=0, columnspan=2, sticky="nsew")
         self._style_text(self.output)
 
         # Status bar
         self.status = tk.StringVar(value="Ready.")
         statusbar = ttk.Frame(self.root, style="Panel.TFrame", padding=(12, 8))
         statusbar.pack(side="bottom", fill="x")
-        ttk.Label(statusbar, textvariable=self.status, style="Panel.TLabel", foreground=self.colors["muted"]).pack(anchor="w")
+        ttk.Label(statusbar, textvariable=self.status, style="Panel.TLabel", foreground=self.colors["muted"]).pack(side="left")
+        self.cancel_btn = ttk.Button(statusbar, text="Cancel", command=self.cancel_jobs)
+        self.progress = ttk.Progressbar(statusbar, length=180, mode="determinate")
 
         # Build content cards
         self.sections: Dict[str, ttk.Widget] = {}
-        self._build_cards(self.scroll.inner)
+        with TIMING.phase("_build_cards"):
+            self._build_cards(self.scroll.inner)
         self._build_sidebar()
 
     def _style_text(self, t: tk.Text):
@@ -913,20 +347,16 @@ class App:
         row = ttk.Frame(parent)
         row.pack(fill="x", pady=6)
         ttk.Label(row, text=label).pack(side="left")
-        e = ttk.Entry(row, width=width)
+        e = ttk.Entry(row, width=width, textvariable=self._watch(tk.StringVar(value=default)))
         e.pack(side="right", fill="x", expand=True)
-        if default:
-            e.insert(0, default)
         return e
 
     def row_combo(self, parent, label: str, values: List[str], width: int = 34, default: str = "") -> ttk.Combobox:
         row = ttk.Frame(parent)
         row.pack(fill="x", pady=6)
         ttk.Label(row, text=label).pack(side="left")
-        cb = ttk.Combobox(row, values=values, width=width)
+        cb = ttk.Combobox(row, values=values, width=width, textvariable=self._watch(tk.StringVar(value=default)))
         cb.pack(side="right", fill="x", expand=True)
-        if default:
-            cb.set(default)
         return cb
 
     def row_text(self, parent, label: str, height: int = 4) -> tk.Text:
@@ -934,6 +364,7 @@ class App:
         t = tk.Text(parent, height=height, wrap="word", bd=0, highlightthickness=1)
         t.pack(fill="x")
         self._style_text(t)
+        t.bind("<<Modified>>", lambda e: self._text_modified(t))
         return t
 
     def row_toggles(self, parent, title: str, pairs: List[Tuple[str, str]]) -> Dict[str, tk.BooleanVar]:
@@ -942,7 +373,7 @@ class App:
         grid.pack(fill="x")
         vars_: Dict[str, tk.BooleanVar] = {}
         for i, (k, lbl) in enumerate(pairs):
-            var = tk.BooleanVar(value=False)
+            var = self._watch(tk.BooleanVar(value=False))
             vars_[k] = var
             cb = ttk.Checkbutton(grid, text=lbl, variable=var)
             cb.grid(row=i // 2, column=i % 2, sticky="w", padx=6, pady=4)
@@ -956,33 +387,94 @@ class App:
 
         ttk.Separator(self.sidebar).pack(fill="x", pady=10)
         ttk.Button(self.sidebar, text="Load Lexicon", command=self.load_lexicon).pack(fill="x", pady=4)
+        ttk.Button(self.sidebar, text="Presets…", command=self.open_presets).pack(fill="x", pady=4)
+        ttk.Button(self.sidebar, text="Save Preset", command=self.save_preset).pack(fill="x", pady=4)
         ttk.Button(self.sidebar, text="Export Boot+System", command=self.export_full_doc).pack(fill="x", pady=4)
+        ttk.Button(self.sidebar, text="Export Columnar", command=self.export_columnar).pack(fill="x", pady=4)
 
     def _scroll_to(self, title: str):
         w = self.sections.get(title)
         if not w:
             return
+        # cards above the target decide its position, so build through it first
+        for t in self._card_builders:
+            self._ensure_card(t)
+            if t == title:
+                break
+        if self.scroll.on_scroll:
+            self.root.after(1, self._build_remaining_cards)
         self.scroll.update_idletasks()
         y = w.winfo_y()
         h = max(1, self.scroll.inner.winfo_height())
         self.scroll.canvas.yview_moveto(y / h)
 
     # ---------- Cards ----------
+    def _card_specs(self) -> List[Tuple[str, Callable[[ttk.Labelframe], None], Callable[[Form], None], Callable[[Form], None]]]:
+        # (title, build widgets into the card, copy the card's widgets onto a Form,
+        #  copy a Form onto the card's widgets)
+        return [
+            ("Core", self._build_core, self._collect_core, self._apply_core),
+            ("Vibe References", self._build_vibe, self._collect_vibe, self._apply_vibe),
+            ("Hypna Matrix", self._build_hypna, self._collect_hypna, self._apply_hypna),
+            ("Composition", self._build_composition, self._collect_composition, self._apply_composition),
+            ("Gesture", self._build_gesture, self._collect_gesture, self._apply_gesture),
+            ("Arcane / Sleep / Color", self._build_misc, self._collect_misc, self._apply_misc),
+            ("Humanizer", self._build_humanizer, self._collect_humanizer, self._apply_humanizer),
+            ("Painting Influence", self._build_painting, self._collect_painting, self._apply_painting),
+            ("Evolution / Mutation", self._build_evolve, self._collect_evolve, self._apply_evolve),
+            ("Print / Plates", self._build_print, self._collect_print, self._apply_print),
+        ]
+
     def _build_cards(self, parent):
-        # CORE
-        core = self.card(parent, "Core")
+        # every card gets its (empty) frame now so order and sidebar are fixed;
+        # contents are built for the first few and the rest on first scroll or
+        # sidebar jump, which keeps dozens of widgets off the first paint
+        self._card_builders: Dict[str, Callable[[ttk.Labelframe], None]] = {}
+        self._card_appliers: Dict[str, Callable[[Form], None]] = {}
+        self._cards_built: set = set()
+        for title, build, _, apply in self._card_specs():
+            self._card_builders[title] = build
+            self._card_appliers[title] = apply
+            self.card(parent, title)
+        self._build_symbols_row(parent)
+        for title in list(self._card_builders)[:STARTUP_CARDS]:
+            self._ensure_card(title)
+        self.scroll.on_scroll = self._build_remaining_cards
+
+    def _ensure_card(self, title: str):
+        if title in self._cards_built:
+            return
+        self._cards_built.add(title)
+        with TIMING.phase(f"card: {title}"):
+            self._card_builders[title](self.sections[title])
+        if self._preset_form is not None:
+            # built after a preset was applied: show its values; collect_form
+            # already reads them from the preset, so this is not an edit
+            dirty, self._batching = self._dirty, True
+            try:
+                self._card_appliers[title](self._preset_form)
+            finally:
+                self._dirty, self._batching = dirty, False
+
+    def _build_remaining_cards(self):
+        # one card per tick so a first scroll never stalls
+        self.scroll.on_scroll = None
+        pending = [t for t in self._card_builders if t not in self._cards_built]
+        if pending:
+            self._ensure_card(pending[0])
+            self.root.after(1, self._build_remaining_cards)
+
+    def _build_core(self, core: ttk.Labelframe):
         self.mode = self.row_combo(core, "MODE", ["FULL", "STYLE", "GESTURE", "PRINT", "LIVE"], default="FULL")
         self.subject = self.row_entry(core, "Subject", default="NEW ORIGINAL IMAGE — do not copy refs; follow system behavior.")
         self.style_tokens = self.row_entry(core, "Style Tokens (CSV)", default="STYLE.HYPNAGOGIC, STYLE.NEWWEIRD, STYLE.PRINT")
         self.notes = self.row_entry(core, "Notes", default="")
 
-        # VIBE
-        vibe = self.card(parent, "Vibe References")
+    def _build_vibe(self, vibe: ttk.Labelframe):
         self.vibe_desc = self.row_text(vibe, "Vibe description", height=4)
         self.vibe_imgs = self.row_entry(vibe, "Vibe image list (filenames/paths you’ll attach)", default="")
 
-        # HYPNA
-        hyp = self.card(parent, "Hypna Matrix")
+    def _build_hypna(self, hyp: ttk.Labelframe):
         self.h = self.row_entry(hyp, "Hallucination (0–100)", default="72")
         self.temporal = self.row_entry(hyp, "Temporal (0–100)", default="")
         self.material = self.row_entry(hyp, "Material (0–100)", default="")
@@ -997,8 +489,7 @@ class App:
         self.erasure = self.row_entry(hyp, "Erasure (0–100)", default="")
         self.annotation = self.row_entry(hyp, "Annotation (0–100)", default="")
 
-        # COMPOSITION
-        comp = self.card(parent, "Composition")
+    def _build_composition(self, comp: ttk.Labelframe):
         self.comp_mode = self.row_entry(comp, "Comp mode (auto/manual)", default="auto")
         self.composition = self.row_entry(comp, "Composition", default="")
         self.flow = self.row_entry(comp, "Flow", default="")
@@ -1006,8 +497,7 @@ class App:
         self.horizon = self.row_entry(comp, "Horizon", default="")
         self.scale_logic = self.row_entry(comp, "Scale logic", default="")
 
-        # GESTURE
-        gest = self.card(parent, "Gesture")
+    def _build_gesture(self, gest: ttk.Labelframe):
         self.gesture_mode = self.row_entry(gest, "Gesture mode (auto/manual)", default="auto")
         self.pressure = self.row_entry(gest, "Pressure", default="")
         self.tempo = self.row_entry(gest, "Tempo", default="")
@@ -1016,11 +506,10 @@ class App:
         self.interruption = self.row_entry(gest, "Interruption", default="")
         self.hatch_density = self.row_entry(gest, "Hatch density", default="")
 
-        # ARCANE + SLEEP + COLOR
-        misc = self.card(parent, "Arcane / Sleep / Color")
-        self.arcane_enabled = tk.BooleanVar(value=True)
-        self.sleep_enabled = tk.BooleanVar(value=True)
-        self.color_enabled = tk.BooleanVar(value=True)
+    def _build_misc(self, misc: ttk.Labelframe):
+        self.arcane_enabled = self._watch(tk.BooleanVar(value=True))
+        self.sleep_enabled = self._watch(tk.BooleanVar(value=True))
+        self.color_enabled = self._watch(tk.BooleanVar(value=True))
         togg = ttk.Frame(misc); togg.pack(fill="x", pady=6)
         ttk.Checkbutton(togg, text="Arcane layer", variable=self.arcane_enabled).pack(side="left", padx=6)
         ttk.Checkbutton(togg, text="Sleep layer", variable=self.sleep_enabled).pack(side="left", padx=6)
@@ -1031,26 +520,23 @@ class App:
         self.palette_lock = self.row_entry(misc, "Palette lock (optional)", default="")
         self.whiteness = self.row_entry(misc, "Whiteness (e.g., creep in more white)", default="")
 
-        # HUMANIZER
-        hum = self.card(parent, "Humanizer")
+    def _build_humanizer(self, hum: ttk.Labelframe):
         self.humanizer_level = self.row_entry(hum, "Humanizer level (0–100)", default="")
         self.humanizer_vars = self.row_toggles(hum, "Qualities", HUMANIZER_QUALITIES)
         self.humanizer_notes = self.row_entry(hum, "Notes", default="")
 
-        # PAINTING
-        paint = self.card(parent, "Painting Influence")
+    def _build_painting(self, paint: ttk.Labelframe):
         self.paint_influence = self.row_combo(paint, "Influence", PAINTING_INFLUENCES, default="NONE")
         self.paint_strength = self.row_entry(paint, "Strength (0–100)", default="")
         self.paint_notes = self.row_entry(paint, "Notes", default="")
 
-        # EVOLVE / MUTATE
-        evo = self.card(parent, "Evolution / Mutation")
-        self.evolve_enabled = tk.BooleanVar(value=True)
-        self.mutate_enabled = tk.BooleanVar(value=False)
+    def _build_evolve(self, evo: ttk.Labelframe):
+        self.evolve_enabled = self._watch(tk.BooleanVar(value=True))
+        self.mutate_enabled = self._watch(tk.BooleanVar(value=False))
         tog = ttk.Frame(evo); tog.pack(fill="x", pady=6)
         ttk.Checkbutton(tog, text="Evolution", variable=self.evolve_enabled).pack(side="left", padx=6)
         ttk.Checkbutton(tog, text="Mutation", variable=self.mutate_enabled).pack(side="left", padx=6)
-        self.steps = self.row_entry(evo, "Steps (1–20)", default="6")
+        self.steps = self.row_entry(evo, f"Steps (1–{MAX_STEPS}; LIVE up to {LIVE_MAX_STEPS})", default="6")
         self.curve = self.row_entry(evo, "Curve (linear/ease-in/ease-out/s-curve/pulse)", default="s-curve")
         self.start_h = self.row_entry(evo, "Start hallucination", default="")
         self.end_h = self.row_entry(evo, "End hallucination", default="")
@@ -1059,10 +545,9 @@ class App:
         self.mutate_scope = self.row_entry(evo, "Mutation scope", default="")
         self.mutate_mode = self.row_entry(evo, "Mutation mode", default="")
 
-        # PRINT / PLATES
-        pr = self.card(parent, "Print / Plates")
-        self.print_enabled = tk.BooleanVar(value=False)
-        self.plates_enabled = tk.BooleanVar(value=False)
+    def _build_print(self, pr: ttk.Labelframe):
+        self.print_enabled = self._watch(tk.BooleanVar(value=False))
+        self.plates_enabled = self._watch(tk.BooleanVar(value=False))
         tog2 = ttk.Frame(pr); tog2.pack(fill="x", pady=6)
         ttk.Checkbutton(tog2, text="Print layer", variable=self.print_enabled).pack(side="left", padx=6)
         ttk.Checkbutton(tog2, text="Plate gen", variable=self.plates_enabled).pack(side="left", padx=6)
@@ -1075,22 +560,31 @@ class App:
         self.overprint = self.row_entry(pr, "Overprint", default="")
         self.plate_map = self.row_text(pr, "Plate map (multi-line)", height=5)
 
-        self.inject_symbols = tk.BooleanVar(value=False)
+    def _build_symbols_row(self, parent):
+        self.inject_symbols = self._watch(tk.BooleanVar(value=False))
         row = ttk.Frame(parent); row.pack(fill="x", pady=10)
         ttk.Checkbutton(row, text="Inject symbol lexicon (if loaded)", variable=self.inject_symbols).pack(side="left", padx=6)
-        self.symbols_per_state = ttk.Entry(row, width=6); self.symbols_per_state.insert(0, "3"); self.symbols_per_state.pack(side="left", padx=6)
+        self.symbols_per_state = ttk.Entry(row, width=6, textvariable=self._watch(tk.StringVar(value="3"))); self.symbols_per_state.pack(side="left", padx=6)
         ttk.Label(row, text="symbols/state").pack(side="left")
+        self.symbols_weighted = self._watch(tk.BooleanVar(value=False))
+        self.symbols_no_repeat = self._watch(tk.BooleanVar(value=False))
+        ttk.Checkbutton(row, text="Weighted", variable=self.symbols_weighted).pack(side="left", padx=6)
+        ttk.Checkbutton(row, text="No repeats", variable=self.symbols_no_repeat).pack(side="left", padx=6)
+        self.seed = ttk.Entry(row, width=10, textvariable=self._watch(tk.StringVar())); self.seed.pack(side="right", padx=6)
+        ttk.Label(row, text="Seed (blank=random)").pack(side="right")
 
     # ---------- collect form ----------
-    def collect_form(self) -> Form:
-        f = Form()
+    def _collect_core(self, f: Form):
         f.mode = (self.mode.get() or "FULL").strip()
         f.subject = self.subject.get().strip()
         f.style_tokens = self.style_tokens.get().strip()
         f.notes = self.notes.get().strip()
+
+    def _collect_vibe(self, f: Form):
         f.vibe_description = self.vibe_desc.get("1.0", "end").strip()
         f.vibe_image_list = self.vibe_imgs.get().strip()
 
+    def _collect_hypna(self, f: Form):
         f.hallucination = parse_int_cell(self.h.get())
         f.temporal = parse_int_cell(self.temporal.get())
         f.material = parse_int_cell(self.material.get())
@@ -1105,6 +599,7 @@ class App:
         f.erasure = parse_int_cell(self.erasure.get())
         f.annotation = parse_int_cell(self.annotation.get())
 
+    def _collect_composition(self, f: Form):
         f.comp_mode = parse_cell(self.comp_mode.get())
         f.composition = parse_cell(self.composition.get())
         f.flow = parse_cell(self.flow.get())
@@ -1112,6 +607,7 @@ class App:
         f.horizon = parse_cell(self.horizon.get())
         f.scale_logic = parse_cell(self.scale_logic.get())
 
+    def _collect_gesture(self, f: Form):
         f.gesture_mode = parse_cell(self.gesture_mode.get())
         f.pressure = parse_cell(self.pressure.get())
         f.tempo = parse_cell(self.tempo.get())
@@ -1120,6 +616,7 @@ class App:
         f.interruption = parse_cell(self.interruption.get())
         f.hatch_density = parse_cell(self.hatch_density.get())
 
+    def _collect_misc(self, f: Form):
         f.arcane_enabled = bool(self.arcane_enabled.get())
         f.sleep_enabled = bool(self.sleep_enabled.get())
         f.color_enabled = bool(self.color_enabled.get())
@@ -1129,15 +626,18 @@ class App:
         f.palette_lock = parse_cell(self.palette_lock.get())
         f.whiteness = parse_cell(self.whiteness.get())
 
+    def _collect_humanizer(self, f: Form):
         f.humanizer.level = parse_int_cell(self.humanizer_level.get())
         for k in f.humanizer.qualities.keys():
             f.humanizer.qualities[k] = bool(self.humanizer_vars[k].get())
         f.humanizer.notes = parse_cell(self.humanizer_notes.get())
 
+    def _collect_painting(self, f: Form):
         f.painting.influence = parse_cell(self.paint_influence.get())
         f.painting.strength = parse_int_cell(self.paint_strength.get())
         f.painting.notes = parse_cell(self.paint_notes.get())
 
+    def _collect_evolve(self, f: Form):
         f.evolve.enabled = bool(self.evolve_enabled.get())
         f.evolve.steps = parse_int_cell(self.steps.get())
         f.evolve.curve = parse_cell(self.curve.get())
@@ -1149,6 +649,7 @@ class App:
         f.mutate.scope = parse_cell(self.mutate_scope.get())
         f.mutate.mode = parse_cell(self.mutate_mode.get())
 
+    def _collect_print(self, f: Form):
         f.print_enabled = bool(self.print_enabled.get())
         f.plates_enabled = bool(self.plates_enabled.get())
         f.print_mode = parse_cell(self.print_mode.get())
@@ -1160,35 +661,377 @@ class App:
         f.overprint = parse_cell(self.overprint.get())
         f.plate_map = self.plate_map.get("1.0", "end").strip()
 
+    def collect_form(self) -> Form:
+        # cards that were never opened keep the applied preset's values, else
+        # the Form defaults (same as their widgets')
+        f = copy.deepcopy(self._preset_form) if self._preset_form is not None else Form()
+        for title, _, collect, _ in self._card_specs():
+            if title in self._cards_built:
+                collect(f)
         f.inject_symbols = bool(self.inject_symbols.get())
         try:
             f.symbols_per_state = max(0, min(10, int(self.symbols_per_state.get().strip() or "3")))
         except Exception:
             f.symbols_per_state = 3
+        f.symbols_weighted = bool(self.symbols_weighted.get())
+        f.symbols_no_repeat = bool(self.symbols_no_repeat.get())
+        seed = parse_int_cell(self.seed.get())
+        f.seed = seed if isinstance(seed, int) else None
         return f
 
+    # ---------- apply form ----------
+    def _set(self, w, value: Any):
+        # Entry, Combobox or Text; the Text's modified flag is reset so the
+        # load doesn't arrive later as a separate edit
+        if isinstance(w, tk.Text):
+            w.delete("1.0", "end")
+            w.insert("1.0", format_cell(value))
+            w.edit_modified(False)
+        else:
+            w.delete(0, "end")
+            w.insert(0, format_cell(value))
+
+    def _apply_core(self, f: Form):
+        self._set(self.mode, f.mode)
+        self._set(self.subject, f.subject)
+        self._set(self.style_tokens, f.style_tokens)
+        self._set(self.notes, f.notes)
+
+    def _apply_vibe(self, f: Form):
+        self._set(self.vibe_desc, f.vibe_description)
+        self._set(self.vibe_imgs, f.vibe_image_list)
+
+    def _apply_hypna(self, f: Form):
+        self._set(self.h, f.hallucination)
+        self._set(self.temporal, f.temporal)
+        self._set(self.material, f.material)
+        self._set(self.space, f.space)
+        self._set(self.symbol, f.symbol)
+        self._set(self.agency, f.agency)
+
+        self._set(self.coherence, f.coherence)
+        self._set(self.recursion, f.recursion)
+        self._set(self.grain, f.grain)
+        self._set(self.line_wobble, f.line_wobble)
+        self._set(self.erasure, f.erasure)
+        self._set(self.annotation, f.annotation)
+
+    def _apply_composition(self, f: Form):
+        self._set(self.comp_mode, f.comp_mode)
+        self._set(self.composition, f.composition)
+        self._set(self.flow, f.flow)
+        self._set(self.framing, f.framing)
+        self._set(self.horizon, f.horizon)
+        self._set(self.scale_logic, f.scale_logic)
+
+    def _apply_gesture(self, f: Form):
+        self._set(self.gesture_mode, f.gesture_mode)
+        self._set(self.pressure, f.pressure)
+        self._set(self.tempo, f.tempo)
+        self._set(self.jitter, f.jitter)
+        self._set(self.stroke_memory, f.stroke_memory)
+        self._set(self.interruption, f.interruption)
+        self._set(self.hatch_density, f.hatch_density)
+
+    def _apply_misc(self, f: Form):
+        self.arcane_enabled.set(bool(f.arcane_enabled))
+        self.sleep_enabled.set(bool(f.sleep_enabled))
+        self.color_enabled.set(bool(f.color_enabled))
+        self._set(self.arcane_mode, f.arcane_mode)
+        self._set(self.neuro_state, f.neuro_state)
+        self._set(self.color_mode, f.color_mode)
+        self._set(self.palette_lock, f.palette_lock)
+        self._set(self.whiteness, f.whiteness)
+
+    def _apply_humanizer(self, f: Form):
+        self._set(self.humanizer_level, f.humanizer.level)
+        for k, var in self.humanizer_vars.items():
+            var.set(bool(f.humanizer.qualities.get(k, False)))
+        self._set(self.humanizer_notes, f.humanizer.notes)
+
+    def _apply_painting(self, f: Form):
+        self._set(self.paint_influence, f.painting.influence)
+        self._set(self.paint_strength, f.painting.strength)
+        self._set(self.paint_notes, f.painting.notes)
+
+    def _apply_evolve(self, f: Form):
+        self.evolve_enabled.set(bool(f.evolve.enabled))
+        self._set(self.steps, f.evolve.steps)
+        self._set(self.curve, f.evolve.curve)
+        self._set(self.start_h, f.evolve.start_h)
+        self._set(self.end_h, f.evolve.end_h)
+
+        self.mutate_enabled.set(bool(f.mutate.enabled))
+        self._set(self.mutate_strength, f.mutate.strength)
+        self._set(self.mutate_scope, f.mutate.scope)
+        self._set(self.mutate_mode, f.mutate.mode)
+
+    def _apply_print(self, f: Form):
+        self.print_enabled.set(bool(f.print_enabled))
+        self.plates_enabled.set(bool(f.plates_enabled))
+        self._set(self.print_mode, f.print_mode)
+        self._set(self.registration, f.registration)
+        self._set(self.texture, f.texture)
+        self._set(self.plate_count, f.plate_count)
+        self._set(self.plate_logic, f.plate_logic)
+        self._set(self.registration_map, f.registration_map)
+        self._set(self.overprint, f.overprint)
+        self._set(self.plate_map, f.plate_map)
+
+    def apply_form(self, form: Form):
+        """Show `form` in the widgets as one edit (a single live preview)."""
+        self._preset_form = copy.deepcopy(form)
+        with self._batched():
+            for title, _, _, apply in self._card_specs():
+                if title in self._cards_built:
+                    apply(form)
+            self.inject_symbols.set(bool(form.inject_symbols))
+            self._set(self.symbols_per_state, form.symbols_per_state)
+            self.symbols_weighted.set(bool(form.symbols_weighted))
+            self.symbols_no_repeat.set(bool(form.symbols_no_repeat))
+            self._set(self.seed, "" if form.seed is None else form.seed)
+
     # ---------- actions ----------
-    def generate(self):
-        form = self.collect_form()
-        self.series = generate_series(form, self.lexicon)
-        self._set_output(self.series[0]["prompt"])
-        self.status.set("Generated 1 prompt.")
+    def _max_steps(self, form: Form) -> int:
+        return LIVE_MAX_STEPS if form.mode == "LIVE" else MAX_STEPS
+
+    def generate(self, then=None):
+        self._start_series(show_all=False, then=then)
 
     def generate_series(self):
+        self._start_series(show_all=True)
+
+    def _start_series(self, show_all: bool, then=None):
+        # this series covers every edit so far: a pending or running preview
+        # landing after it would overwrite (or, for long series, wipe) it
+        if self._preview_after is not None:
+            self.root.after_cancel(self._preview_after)
+            self._preview_after = None
+        self.jobs.cancel("preview")
+        self._dirty = False
         form = self.collect_form()
-        self.series = generate_series(form, self.lexicon)
-        chunks = []
-        for st in self.series:
-            chunks.append(f"=== STATE {st['index']} ===\n{st['prompt']}\n")
-        self._set_output("\n".join(chunks))
-        self.status.set(f"Generated series: {len(self.series)} states.")
-
+        lex = self.lexicon
+        max_steps = self._max_steps(form)
+        total = series_length(form, max_steps)
+        every = max(1, total // 100)
+
+        def work(job):
+            out = []
+            for st in iter_series(form, lex, max_steps, compact=True):
+                job.check()
+                out.append(st)
+                if len(out) % every == 0:
+                    job.progress(len(out), total)
+            return out
+
+        def done(series):
+            self._show_series(series, show_all)
+            if show_all:
+                self.status.set(f"Generated series: {len(series)} states.")
+            else:
+                self.status.set("Generated 1 prompt.")
+            if then:
+                then()
+
+        self.status.set("Generating…")
+        self._submit("series", work, done, total=total)
+
+    # ---------- background jobs ----------
+    def _submit(self, kind: str, work, done, total: Optional[int] = None, on_error=None):
+        def failed(e: BaseException):
+            messagebox.showerror("HYPNAGNOSIS", str(e))
+            self.status.set("Failed.")
+
+        self.jobs.submit(kind, work, done, on_error=on_error or failed, on_progress=self._on_progress)
+        if total:
+            self.progress.stop()
+            self.progress.configure(mode="determinate", maximum=total, value=0)
+        else:
+            self.progress.configure(mode="indeterminate")
+            self.progress.start(12)
+        self.cancel_btn.pack(side="right")
+        self.progress.pack(side="right", padx=(0, 8))
+        self._ensure_polling()
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(30, self._poll_jobs)
+
+    def _on_progress(self, done: int, total: Optional[int]):
+        if total:
+            self.progress.configure(mode="determinate", maximum=total, value=done)
+            self.status.set(f"Generating… {done}/{total}")
+
+    def _poll_jobs(self):
+        self.jobs.poll()
+        if self.jobs.busy():
+            self.root.after(30, self._poll_jobs)
+            return
+        self._polling = False
+        self.progress.stop()
+        self.progress.pack_forget()
+        self.cancel_btn.pack_forget()
+
+    def cancel_jobs(self):
+        if self.jobs.cancel():
+            self.status.set("Cancelled.")
+
+    def _on_close(self):
+        self.jobs.shutdown()
+        if self.presets is not None:
+            self.presets.close()
+        self.root.destroy()
+
+    # ---------- live preview ----------
+    def _watch(self, var: tk.Variable) -> tk.Variable:
+        # keep a reference: Tk drops the variable when the Python object dies
+        self._watched.append(var)
+        var.trace_add("write", lambda *_: self._mark_dirty())
+        return var
+
+    def _text_modified(self, t: tk.Text):
+        # resetting the flag fires <<Modified>> again; only react to real edits
+        if t.edit_modified():
+            t.edit_modified(False)
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        # runs on every keystroke: keep it to a flag + timer reset (which
+        # blocks to recompile is IncrementalSeries' job, not the widgets')
+        self._dirty = True
+        if self._batching or not self.live_preview.get():
+            return
+        if self._preview_after is not None:
+            self.root.after_cancel(self._preview_after)
+        self._preview_after = self.root.after(LIVE_PREVIEW_DEBOUNCE_MS, self._preview)
+
+    @contextmanager
+    def _batched(self):
+        # many widget writes, one edit: traces inside only set the flag
+        self._batching = True
+        try:
+            yield
+        finally:
+            self._batching = False
+        self._mark_dirty()
+
+    def _toggle_live(self):
+        if self.live_preview.get():
+            self._mark_dirty()
+        elif self._preview_after is not None:
+            self.root.after_cancel(self._preview_after)
+            self._preview_after = None
+
+    def _preview(self):
+        self._preview_after = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        form = self.collect_form()
+        lex = self.lexicon
+        max_steps = self._max_steps(form)
+        if series_length(form, max_steps) > MAX_STEPS:
+            # long LIVE series: preview state 1 only, Save regenerates the rest
+            work = lambda job: [series_state(form, 0, lex, max_steps)]
+            complete = False
+        else:
+            # short series: recompile incrementally (only the blocks the edit touched)
+            if self._compiler.lex is not lex or self._compiler.max_steps != max_steps:
+                self._compiler = IncrementalSeries(lex, max_steps)
+            compiler = self._compiler
+            work = lambda job: list(compiler.update(form))
+            complete = True
+
+        def done(series: List[Dict[str, Any]]):
+            self.series = series if complete else []
+            self._show_all = False
+            self.page_label.set("")
+            self._set_output(series[0]["prompt"])
+            self.status.set("Preview updated.")
+
+        def failed(e: BaseException):
+            self.status.set(f"Preview failed: {e}")
+
+        self.jobs.submit("preview", work, done, on_error=failed)
+        self._ensure_polling()
+
+    # ---------- output panel ----------
     def _set_output(self, txt: str):
+        self._render_token += 1
+        stale = [m for m in self.output.mark_names() if m.startswith("state")]
+        if stale:
+            self.output.mark_unset(*stale)
         self.output.delete("1.0", "end")
         self.output.insert("1.0", txt)
 
+    def _show_series(self, series: List[Dict[str, Any]], show_all: bool):
+        self.series = series
+        self._show_all = show_all
+        self._page = 0
+        self._render_page()
+
+    def _page_count(self) -> int:
+        return max(1, -(-len(self.series) // OUTPUT_PAGE_STATES))
+
+    def _render_page(self, then=None):
+        # only the current page lives in the Text widget; a newer render
+        # (page turn, new series) abandons any chunks still queued
+        if not self._show_all:
+            self._set_output(self.series[0]["prompt"] if self.series else "")
+            self.page_label.set("")
+            return
+        start = self._page * OUTPUT_PAGE_STATES
+        states = self.series[start:start + OUTPUT_PAGE_STATES]
+        self._set_output("")
+        self.page_label.set(f"States {start + 1}–{start + len(states)} of {len(self.series)}")
+        self._insert_chunk(self._render_token, states, 0, then)
+
+    def _insert_chunk(self, token: int, states: List[Dict[str, Any]], pos: int, then=None):
+        if token != self._render_token:
+            return
+        for st in states[pos:pos + OUTPUT_CHUNK_STATES]:
+            mark = f"state{st['index']}"
+            self.output.mark_set(mark, "end-1c")
+            self.output.mark_gravity(mark, "left")
+            self.output.insert("end", STATE_HEADER.format(index=st["index"]) + st["prompt"] + "\n\n")
+        pos += OUTPUT_CHUNK_STATES
+        if pos < len(states):
+            self.root.after(1, self._insert_chunk, token, states, pos, then)
+        elif then:
+            then()
+
+    def _turn_page(self, delta: int):
+        page = min(max(0, self._page + delta), self._page_count() - 1)
+        if self._show_all and page != self._page:
+            self._page = page
+            self._render_page()
+
+    def jump_to_state(self):
+        if not self._show_all or not self.series:
+            return
+        try:
+            n = int(self.jump_entry.get().strip())
+        except ValueError:
+            self.status.set("Enter a state number.")
+            return
+        n = min(max(1, n), len(self.series))
+        self._page = (n - 1) // OUTPUT_PAGE_STATES
+        self._render_page(then=lambda: self.output.see(f"state{n}"))
+        self.status.set(f"State {n}.")
+
+    def _output_text(self) -> str:
+        # the whole series, not just the page on screen
+        if not self.series:
+            return self.output.get("1.0", "end")
+        if not self._show_all:
+            return self.series[0]["prompt"]
+        buf = io.StringIO()
+        write_prompts(buf, self.series)
+        return buf.getvalue()
+
     def copy_output(self):
-        txt = self.output.get("1.0", "end").strip()
+        txt = self._output_text().strip()
         self.root.clipboard_clear()
         self.root.clipboard_append(txt)
         self.root.update()
@@ -1196,43 +1039,188 @@ class App:
 
     def save_prompts(self):
         if not self.series:
-            self.generate()
-        path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text","*.txt"), ("All","*.*")])
+            self.generate(then=self.save_prompts)
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=EXPORT_FILETYPES)
         if not path:
             return
-        with open(path, "w", encoding="utf-8") as f:
-            if len(self.series) == 1:
-                f.write(self.series[0]["prompt"])
-            else:
-                for st in self.series:
-                    f.write(f"=== STATE {st['index']} ===\n{st['prompt']}\n\n")
-        self.status.set(f"Saved to {path}")
+        self._export(path, write_prompts, f"Saved to {path}")
 
     def export_full_doc(self):
         if not self.series:
-            self.generate()
-        path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text","*.txt"), ("All","*.*")])
+            self.generate(then=self.export_full_doc)
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=EXPORT_FILETYPES)
+        if not path:
+            return
+        self._export(path, write_full_doc, "Exported boot+system+prompt(s).")
+
+    def _export(self, path: str, writer, message: str):
+        # compressed exports can take seconds: write off the UI thread
+        series = self.series
+
+        def states(job):
+            # a cancelled export raises out of open_export, which drops the temp file
+            for st in series:
+                job.check()
+                yield st
+
+        def work(job):
+            with open_export(path) as f:
+                writer(f, states(job))
+
+        self.status.set(f"Writing {path}…")
+        # one kind per file: exports to different paths must not cancel each other
+        self._submit(f"export:{path}", work, lambda _: self.status.set(message))
+
+    def export_columnar(self):
+        if not self.series:
+            self.generate(then=self.export_columnar)
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".hcol", filetypes=[("Columnar","*.hcol"), ("All","*.*")])
         if not path:
             return
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(BOOTLOADER_TEXT + "\n\n" + SYSTEM_FILE_TEXT + "\n\n")
-            if len(self.series) == 1:
-                f.write(self.series[0]["prompt"])
-            else:
-                for st in self.series:
-                    f.write(f"=== STATE {st['index']} ===\n{st['prompt']}\n\n")
-        self.status.set("Exported boot+system+prompt(s).")
+        # big series take a while to encode: write off the UI thread
+        series = self.series
+        self.status.set(f"Writing {path}…")
+        # one kind per file: exports to different paths must not cancel each other
+        self._submit(f"export:{path}", lambda job: write_columnar(path, [series]),
+                     lambda rows: self.status.set(f"Exported {rows} state(s) to {path}"))
 
     def load_lexicon(self):
-        path = filedialog.askopenfilename(filetypes=[("JSON","*.json"), ("All","*.*")])
+        path = filedialog.askopenfilename(filetypes=[("Lexicon", "*.json *.hlex"), ("JSON","*.json"), ("All","*.*")])
         if not path:
             return
-        self.lexicon = load_symbol_lexicon(path)
-        self.status.set(f"Loaded lexicon: {len(self.lexicon)} entries.")
 
+        def done(lex: SymbolLexicon):
+            self.lexicon = lex
+            self.status.set(f"Loaded lexicon: {len(lex)} entries.")
+
+        def failed(e: BaseException):
+            messagebox.showerror("Load Lexicon", str(e))
+            self.status.set("Lexicon not loaded.")
+
+        self.status.set("Loading lexicon…")
+        self._submit("lexicon", lambda job: load_symbol_lexicon(path, strict=True), done, on_error=failed)
+
+    # ---------- presets ----------
+    def _preset_library(self) -> Optional[PresetLibrary]:
+        # opened on first use so startup never touches the file
+        if self.presets is None:
+            try:
+                self.presets = PresetLibrary()
+            except (OSError, sqlite3.Error) as e:
+                messagebox.showerror("Presets", f"Cannot open the preset library: {e}")
+        return self.presets
+
+    def save_preset(self):
+        lib = self._preset_library()
+        if lib is None:
+            return
+        name = simpledialog.askstring("Save Preset", "Preset name:", parent=self.root)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if name in lib and not messagebox.askyesno("Save Preset", f"Replace preset {name!r}?"):
+            return
+        # one indexed insert: quick enough to do inline, and a second save
+        # can't cancel the first
+        try:
+            info = lib.save(name, self.collect_form())
+        except (sqlite3.Error, ValueError) as e:
+            messagebox.showerror("Save Preset", str(e))
+            return
+        self.status.set(f"Saved preset {info.name!r} ({info.mode}, h {info.h_min}–{info.h_max}).")
+
+    def open_presets(self):
+        lib = self._preset_library()
+        if lib is None:
+            return
+        win = tk.Toplevel(self.root)
+        win.title("Presets")
+        win.geometry("640x520")
+        win.configure(bg=self.colors["bg"])
+
+        text, mode, token, h_lo, h_hi = (tk.StringVar() for _ in range(5))
+        filters = ttk.Frame(win, padding=(12, 12, 12, 6)); filters.pack(fill="x")
+        filters.columnconfigure(1, weight=1)
+        ttk.Label(filters, text="Name").grid(row=0, column=0, sticky="w")
+        ttk.Entry(filters, textvariable=text).grid(row=0, column=1, columnspan=5, sticky="ew", padx=6, pady=4)
+        ttk.Label(filters, text="Mode").grid(row=1, column=0, sticky="w")
+        ttk.Combobox(filters, textvariable=mode, values=[""] + lib.modes(), width=10).grid(row=1, column=1, sticky="w", padx=6)
+        ttk.Label(filters, text="Token").grid(row=1, column=2, sticky="w")
+        ttk.Combobox(filters, textvariable=token, values=[""] + lib.tokens(), width=24).grid(row=1, column=3, sticky="w", padx=6)
+        ttk.Label(filters, text="Hallucination").grid(row=2, column=0, sticky="w")
+        hrow = ttk.Frame(filters); hrow.grid(row=2, column=1, columnspan=3, sticky="w", padx=6, pady=4)
+        ttk.Entry(hrow, textvariable=h_lo, width=5).pack(side="left")
+        ttk.Label(hrow, text="–").pack(side="left", padx=4)
+        ttk.Entry(hrow, textvariable=h_hi, width=5).pack(side="left")
+
+        lst = tk.Listbox(win, activestyle="none", bd=0, highlightthickness=1, background=self.text_bg,
+                         foreground=self.text_fg, selectbackground=self._tint(self.colors["accent"], 0.35),
+                         highlightbackground=self.colors["border"], font=self.font_base)
+        lst.pack(fill="both", expand=True, padx=12)
+        count = tk.StringVar()
+        ttk.Label(win, textvariable=count, style="Muted.TLabel").pack(anchor="w", padx=12, pady=(6, 0))
+        shown: List[PresetInfo] = []
+
+        def refresh(*_):
+            # indexed queries take milliseconds: run them inline on every keystroke
+            lo, hi = parse_int_cell(h_lo.get()), parse_int_cell(h_hi.get())
+            kw = dict(text=text.get().strip() or None, mode=mode.get().strip() or None,
+                      token=token.get().strip() or None,
+                      h_min=lo if isinstance(lo, int) else None, h_max=hi if isinstance(hi, int) else None)
+            shown[:] = lib.list(limit=PRESET_LIST_LIMIT, **kw)
+            total = lib.count(**kw) if len(shown) == PRESET_LIST_LIMIT else len(shown)
+            lst.delete(0, "end")
+            lst.insert("end", *(f"{p.name}    {p.mode} · h {p.h_min}–{p.h_max} · {', '.join(p.tokens)}"
+                                for p in shown))
+            count.set(f"{len(shown)} of {total} preset(s)")
+
+        def selected() -> Optional[PresetInfo]:
+            sel = lst.curselection()
+            return shown[sel[0]] if sel else None
+
+        def apply(*_):
+            info = selected()
+            if info is None:
+                return
+            try:
+                form = lib.load(info.name)
+            except (KeyError, ValueError) as e:
+                messagebox.showerror("Presets", f"Cannot load {info.name!r}: {e}", parent=win)
+                refresh()
+                return
+            self.apply_form(form)
+            self.status.set(f"Applied preset {info.name!r}.")
+
+        def delete():
+            info = selected()
+            if info is not None and messagebox.askyesno("Presets", f"Delete preset {info.name!r}?", parent=win):
+                lib.delete(info.name)
+                refresh()
+
+        btns = ttk.Frame(win, padding=12); btns.pack(fill="x")
+        ttk.Button(btns, text="Apply", style="Primary.TButton", command=apply).pack(side="left")
+        ttk.Button(btns, text="Delete", command=delete).pack(side="left", padx=8)
+        ttk.Button(btns, text="Close", command=win.destroy).pack(side="right")
+        lst.bind("<Double-1>", apply)
+        lst.bind("<Return>", apply)
+        for var in (text, mode, token, h_lo, h_hi):
+            var.trace_add("write", refresh)
+        refresh()
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    App(root)
+    ap = argparse.ArgumentParser(description="HYPNAGNOSIS prompt builder")
+    ap.add_argument("--timing", nargs="?", const="-", metavar="PATH",
+                    help="dump startup/phase timings as JSON on exit (stderr, or PATH)")
+    args = ap.parse_args()
+    if args.timing:
+        TIMING.enable(args.timing)
+    with TIMING.phase("tk.Tk()"):
+        root = tk.Tk()
+    with TIMING.phase("App()"):
+        App(root)
+    root.after_idle(lambda: root.after_idle(TIMING.mark, "first idle (painted)"))
     root.mainloop()
 